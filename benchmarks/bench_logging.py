@@ -0,0 +1,100 @@
+"""
+Logging overhead per request: the log calls a basic /api/run makes (node banners,
+span lines, get_llm debug line, library records through InterceptHandler), timed
+with the previous setup (frame-walking InterceptHandler, stdlib level 0, eager
+f-strings, synchronous sink) against the current one, with and without sampling.
+
+    python -m benchmarks.bench_logging --output logging.json
+"""
+import argparse
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from benchmarks.common import time_per_call, write_report
+from src.utils.logger import InterceptHandler, SamplingFilter
+
+NODES = ("guard", "memory", "agent")
+FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+library_logger = logging.getLogger("bench.library")
+
+
+class LegacyInterceptHandler(logging.Handler):
+    """
+    The InterceptHandler this repo used before: resolves the level by name and
+    walks the stack on every record.
+    """
+    def emit(self, record):
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+
+        frame, depth = logging.currentframe(), 2
+        while frame.f_code.co_filename == logging.__file__:
+            frame = frame.f_back
+            depth += 1
+
+        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
+
+def legacy_request() -> None:
+    for name in NODES:
+        logger.debug(f"--- {name.upper()} NODE ---")
+        logger.debug(f"Initializing LLM: {'fake'} | Temp: {0.0} | Async: True")
+        library_logger.debug("HTTP Request: POST http://fake/v1/chat/completions")
+        logger.info(f"span node={name} wall={0.1234:.3f}s llm={0.1:.3f}s tokens={120}+{30} cost=${0.0:.5f}")
+    library_logger.info("request finished")
+
+
+def current_request() -> None:
+    for name in NODES:
+        logger.debug("--- {} NODE ---", name.upper())
+        logger.debug("Initializing LLM: {} | Temp: {} | Async: True", "fake", 0.0)
+        library_logger.debug("HTTP Request: POST http://fake/v1/chat/completions")
+        logger.info(
+            "span node={} wall={:.3f}s llm={:.3f}s tokens={}+{} cost=${:.5f}",
+            name, 0.1234, 0.1, 120, 30, 0.0,
+        )
+    library_logger.info("request finished")
+
+
+def configure(variant: str, level: str, sink) -> Callable[[], None]:
+    logger.remove()
+    if variant == "legacy":
+        logger.add(sink, format=FORMAT, level=level)
+        logging.basicConfig(handlers=[LegacyInterceptHandler()], level=0, force=True)
+        return legacy_request
+
+    log_filter = SamplingFilter({"benchmarks": 0.1}) if variant == "sampled" else None
+    logger.add(sink, format=FORMAT, level=level, filter=log_filter, enqueue=True)
+    logging.basicConfig(handlers=[InterceptHandler()], level=logger.level(level).no, force=True)
+    return current_request
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Logging overhead per request")
+    parser.add_argument("--levels", type=lambda s: s.split(","), default=["INFO", "DEBUG"])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    results: List[Dict[str, Any]] = []
+    with open(os.devnull, "w") as sink:
+        for level in args.levels:
+            for variant in ("legacy", "current", "sampled"):
+                request = configure(variant, level, sink)
+                timing = time_per_call(request, repeat=args.repeat)
+                logger.complete()
+                results.append({"level": level, "variant": variant, "per_request": timing})
+    logger.remove()
+    write_report("bench_logging", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
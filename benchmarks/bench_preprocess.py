@@ -0,0 +1,97 @@
+"""
+Cleaning throughput (MB/s): the original five-pass preprocess.clean against the
+current clean, clean_stream and clean_many, on ASCII and mixed Unicode/HTML corpora.
+
+    python -m benchmarks.bench_preprocess --size-mb 20 --output preprocess.json
+"""
+import argparse
+import html
+import os
+import random
+import re
+import time
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.common import write_report
+from src.data.preprocess import clean, clean_many, clean_stream
+
+ASCII_WORDS = "the graph routes each request through planner judge and agent nodes".split()
+HTML_PIECES = ["<p>", "</p>", "<a href='https://example.com'>", "</a>", "&amp;", "&nbsp;", "&lt;", "\t", "\n\n", "\x0c"]
+UNICODE_WORDS = ["naïve", "café", "ﬁle", "ｆｕｌｌ", "①", "Straße", "東京", "　"]
+
+
+def legacy_clean(text: str) -> str:
+    """preprocess.clean before the single-pass rewrite"""
+    text = unicodedata.normalize("NFKC", text)
+    text = html.unescape(text)
+    text = re.sub(r"<[^>]+>", "", text)
+    text = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+def make_corpus(kind: str, size: int, doc_size: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    words = ASCII_WORDS if kind == "ascii" else ASCII_WORDS + UNICODE_WORDS
+    docs, total = [], 0
+    while total < size:
+        parts = []
+        length = 0
+        while length < doc_size:
+            piece = rng.choice(HTML_PIECES) if rng.random() < 0.15 else rng.choice(words)
+            parts.append(piece)
+            length += len(piece) + 1
+        doc = " ".join(parts)
+        docs.append(doc)
+        total += len(doc)
+    return docs
+
+
+def throughput(fn: Callable[[], Any], size_bytes: int, repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return {"seconds": best, "mb_per_s": size_bytes / best / 1e6}
+
+
+def stream(doc: str, chunk_size: int = 8192):
+    return [doc[i:i + chunk_size] for i in range(0, len(doc), chunk_size)]
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Text cleaning throughput")
+    parser.add_argument("--size-mb", type=float, default=10.0)
+    parser.add_argument("--doc-kb", type=float, default=8.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    results: List[Dict[str, Any]] = []
+    for kind in ("ascii", "unicode"):
+        docs = make_corpus(kind, int(args.size_mb * 1e6), int(args.doc_kb * 1000))
+        size = sum(len(doc.encode("utf-8")) for doc in docs)
+        joined = "\n".join(docs)
+        expected = [legacy_clean(doc) for doc in docs]
+        assert [clean(doc) for doc in docs] == expected
+        assert " ".join(clean_stream(stream(joined))) == legacy_clean(joined)
+
+        variants = {
+            "legacy": lambda: [legacy_clean(doc) for doc in docs],
+            "clean": lambda: [clean(doc) for doc in docs],
+            "clean_stream": lambda: list(clean_stream(stream(joined))),
+            f"clean_many_x{args.workers}": lambda: clean_many(docs, workers=args.workers),
+        }
+        for variant, fn in variants.items():
+            results.append({"corpus": kind, "variant": variant, "bytes": size, **throughput(fn, size, args.repeat)})
+    write_report("bench_preprocess", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
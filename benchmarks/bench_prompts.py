@@ -0,0 +1,74 @@
+"""
+Prompt formatting cost per call: LangChain ChatPromptTemplate.format_messages
+against the compiled registry path (src/llm/prompts.py) and the inline f-string
+plus HumanMessage that the workflow nodes used before.
+
+    python -m benchmarks.bench_prompts --output prompts.json
+"""
+import argparse
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import HumanMessage
+
+from benchmarks.common import time_per_call, write_report
+from src.llm.prompts import compile_prompt, get_compiled_prompt, get_prompt
+
+CONTEXT = "LangGraph compiles a StateGraph into a runnable. " * 20
+QUESTION = "How are nodes connected?"
+RESPONSE = "Nodes are connected with edges; conditional edges route on the state. " * 10
+
+
+def cases() -> Dict[str, Dict[str, Any]]:
+    """
+    name -> {variant: zero-argument callable}
+    """
+    qa_template = get_prompt("QA_PROMPT")
+    qa_compiled = get_compiled_prompt("QA_PROMPT")
+    conversation = get_prompt("CONVERSATION_PROMPT")
+    conversation_compiled = compile_prompt(conversation)
+    history = [HumanMessage(content=QUESTION)] * 6
+    evaluator = get_prompt("EVALUATOR_PROMPT")
+
+    return {
+        "qa": {
+            "langchain": lambda: qa_template.format_messages(context=CONTEXT, question=QUESTION),
+            "compiled": lambda: qa_compiled.format_messages(context=CONTEXT, question=QUESTION),
+        },
+        "conversation": {
+            "langchain": lambda: conversation.format_messages(
+                system_message="You are helpful.", chat_history=history, input=QUESTION
+            ),
+            "compiled": lambda: conversation_compiled.format_messages(
+                system_message="You are helpful.", chat_history=history, input=QUESTION
+            ),
+        },
+        "evaluator": {
+            "fstring": lambda: [HumanMessage(content=f"""
+    You are an Evaluator Agent.
+    Critique the following response for accuracy, safety, and completeness.
+
+    Response: {RESPONSE}
+    """)],
+            "compiled": lambda: evaluator.format_messages(response=RESPONSE),
+        },
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Prompt formatting cost per call")
+    parser.add_argument("--repeat", type=int, default=20000)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    results: List[Dict[str, Any]] = []
+    for name, variants in cases().items():
+        for variant, fn in variants.items():
+            results.append({"prompt": name, "variant": variant, "per_call": time_per_call(fn, repeat=args.repeat)})
+    write_report("bench_prompts", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
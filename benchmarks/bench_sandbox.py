@@ -0,0 +1,75 @@
+"""
+Per-call latency of the compute tools: python_repl through the pre-warmed sandbox
+pool vs a new in-process PythonREPLTool per call (the previous implementation),
+and the AST calculator vs eval with empty builtins.
+
+    python -m benchmarks.bench_sandbox --output sandbox.json
+"""
+import argparse
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import time_per_call, write_report
+
+SNIPPETS = {
+    "print": "print('hello')",
+    "math": "import math\nprint(sum(math.sqrt(i) for i in range(10000)))",
+    "error": "raise ValueError('boom')",
+}
+EXPRESSIONS = ["2 * (3 + 4) ** 2", "sqrt(2) / 3.5 + 10 % 4", "(1 + 2) * (3 + 4) * (5 + 6) / 7"]
+
+
+def bench_python_repl(repeat: int) -> Dict[str, Any]:
+    from src.agent.sandbox import SandboxPool
+
+    results: Dict[str, Any] = {}
+    pool = SandboxPool(size=2)
+    try:
+        results["sandbox_pool"] = {name: time_per_call(lambda: pool.run(code), repeat=repeat) for name, code in SNIPPETS.items()}
+    finally:
+        pool.close()
+
+    try:
+        from langchain_experimental.tools import PythonREPLTool
+    except ImportError:
+        results["in_process_repl"] = "langchain_experimental not installed"
+    else:
+        results["in_process_repl"] = {
+            name: time_per_call(lambda: PythonREPLTool().run(code), repeat=repeat)
+            for name, code in SNIPPETS.items()
+        }
+    return results
+
+
+def bench_calculator(repeat: int) -> Dict[str, Any]:
+    import math
+    from src.agent.calculator import evaluate
+
+    namespace = {"__builtins__": {}, "sqrt": math.sqrt}
+    return {
+        expr: {
+            "eval": time_per_call(lambda: eval(expr, namespace), repeat=repeat),
+            "ast_evaluator": time_per_call(lambda: evaluate(expr), repeat=repeat),
+        }
+        for expr in EXPRESSIONS
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compute tool latency")
+    parser.add_argument("--repeat", type=int, default=200, help="Calls per python_repl snippet")
+    parser.add_argument("--calc-repeat", type=int, default=5000)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    results: Dict[str, Any] = {
+        "python_repl": bench_python_repl(args.repeat),
+        "calculator": bench_calculator(args.calc_repeat),
+    }
+    write_report("bench_sandbox", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Size and encode time of final AgentStates: the previous jsonable_encoder path vs
+the compact encoding in src/components/serialization.py, plus checkpoint
+serialization with LangGraph's JsonPlusSerializer vs CompactSerializer.
+
+    python -m benchmarks.bench_serialization --messages 10,50,200 --output serialization.json
+"""
+import argparse
+import json
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import time_per_call, write_report
+
+
+def synthetic_state(num_messages: int) -> Dict[str, Any]:
+    """
+    A final state shaped like an advanced-workflow run with tool calls and usage metadata.
+    """
+    from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+    from src.components.budget import start_budget
+
+    messages = []
+    for i in range(num_messages):
+        if i % 3 == 0:
+            messages.append(HumanMessage(content=f"Question {i}: " + "lorem ipsum " * 20))
+        elif i % 3 == 1:
+            messages.append(AIMessage(
+                content="",
+                id=f"run-{i}",
+                tool_calls=[{"name": "calculator", "args": {"expression": f"{i} * 7"}, "id": f"call_{i}"}],
+                usage_metadata={"input_tokens": 120 + i, "output_tokens": 18, "total_tokens": 138 + i},
+                response_metadata={"model_name": "fake", "finish_reason": "tool_calls"},
+            ))
+        else:
+            messages.append(ToolMessage(content=str(i * 7), tool_call_id=f"call_{i - 1}"))
+    return {
+        "messages": messages,
+        "context": "retrieved context " * 30,
+        "safety_metadata": None,
+        "plan": [f"step {i}" for i in range(4)],
+        "plan_graph": [{"id": f"s{i}", "task": f"step {i}", "depends_on": []} for i in range(4)],
+        "step_results": {f"s{i}": "result " * 20 for i in range(4)},
+        "critique": "VERDICT: PASS",
+        "final_answer": None,
+        **start_budget(),
+    }
+
+
+def bench_response(state: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    from fastapi.encoders import jsonable_encoder
+    from src.components.serialization import encode_state
+
+    def baseline():
+        return json.dumps({"result": jsonable_encoder(state)}).encode("utf-8")
+
+    results = {}
+    for name, fn in {
+        "jsonable_encoder": baseline,
+        "compact_full": lambda: encode_state(state, "full"),
+        "compact_final": lambda: encode_state(state, "final"),
+    }.items():
+        results[name] = {"bytes": len(fn()), **time_per_call(fn, repeat=repeat)}
+    return results
+
+
+def bench_checkpoint(state: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from src.components.serialization import CompactSerializer
+
+    results = {}
+    for name, serde in {"jsonplus": JsonPlusSerializer(), "compact": CompactSerializer()}.items():
+        typed = serde.dumps_typed(state)
+        results[name] = {
+            "type": typed[0],
+            "bytes": len(typed[1]),
+            "dumps": time_per_call(lambda: serde.dumps_typed(state), repeat=repeat),
+            "loads": time_per_call(lambda: serde.loads_typed(typed), repeat=repeat),
+        }
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="AgentState serialization benchmark")
+    parser.add_argument("--messages", type=lambda s: [int(x) for x in s.split(",")], default=[10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    results = []
+    for num_messages in args.messages:
+        state = synthetic_state(num_messages)
+        results.append({
+            "messages": num_messages,
+            "response": bench_response(state, args.repeat),
+            "checkpoint": bench_checkpoint(state, args.repeat),
+        })
+    write_report("bench_serialization", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
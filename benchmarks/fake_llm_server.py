@@ -0,0 +1,262 @@
+"""
+Local stub of the OpenAI-compatible endpoints used by ChatOpenAI / OpenAIEmbeddings.
+
+Simulates provider latency (time to first token), generation speed and errors so
+the workflow can be benchmarked offline:
+
+    python -m benchmarks.fake_llm_server --port 8100 --latency-ms 200 --tokens-per-second 80
+    BASE_URL=http://127.0.0.1:8100/v1 BASE_API_KEY=fake MODEL_NAME=fake python -m src.api.main
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import struct
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class FakeLLMConfig:
+    latency_ms: float = 100.0        # time to first token
+    tokens_per_second: float = 200.0  # generation speed after the first token
+    completion_tokens: int = 64
+    jitter: float = 0.0               # +/- fraction applied to latency
+    error_rate: float = 0.0           # fraction of requests answered with HTTP 500
+    embedding_dim: int = 256
+    embedding_latency_ms: float = 20.0
+
+
+FILLER = (
+    "the quick brown fox jumps over the lazy dog while the model keeps "
+    "generating plausible tokens for the benchmark harness"
+).split()
+
+JSON_PLAN = {
+    "steps": [
+        {"id": "1", "task": "Gather the relevant facts", "depends_on": []},
+        {"id": "2", "task": "Consider alternative viewpoints", "depends_on": []},
+        {"id": "3", "task": "Write the answer", "depends_on": ["1", "2"]},
+    ]
+}
+
+
+def _count_tokens(messages: List[Dict[str, Any]]) -> int:
+    return sum(len(str(m.get("content", "")).split()) for m in messages)
+
+
+def _completion_text(body: Dict[str, Any], config: FakeLLMConfig) -> str:
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        return json.dumps(JSON_PLAN)
+    words = [FILLER[i % len(FILLER)] for i in range(config.completion_tokens)]
+    text = " ".join(words)
+    prompt = " ".join(str(m.get("content", "")) for m in body.get("messages", []))
+    if "VERDICT" in prompt:
+        text = "VERDICT: PASS\n" + text
+    return text
+
+
+def _tokens(text: str) -> List[str]:
+    words = text.split(" ")
+    return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+
+def _first_token_delay(config: FakeLLMConfig) -> float:
+    delay = config.latency_ms / 1000
+    if config.jitter:
+        delay *= 1 + random.uniform(-config.jitter, config.jitter)
+    return max(delay, 0.0)
+
+
+def _embed(text: str, dim: int) -> List[float]:
+    # Deterministic pseudo-embedding derived from the text hash
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    rng = random.Random(seed)
+    return [rng.uniform(-1, 1) for _ in range(dim)]
+
+
+async def _wait_or_disconnect(request: Request, seconds: float) -> bool:
+    """
+    Sleeps for `seconds`; returns False early if the client hung up (e.g. a
+    cancelled hedged request).
+    """
+    deadline = time.monotonic() + seconds
+    while (remaining := deadline - time.monotonic()) > 0:
+        if await request.is_disconnected():
+            return False
+        await asyncio.sleep(min(remaining, 0.05))
+    return True
+
+
+def create_app(config: FakeLLMConfig) -> FastAPI:
+    app = FastAPI(title="Fake LLM", version="0.1.0")
+    app.state.config = config
+    app.state.requests = 0
+    app.state.disconnected = 0
+
+    def error_response():
+        return JSONResponse(
+            status_code=500,
+            content={"error": {"message": "Injected failure", "type": "server_error"}},
+        )
+
+    @app.post("/chat/completions")
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        app.state.requests += 1
+        body = await request.json()
+        if config.error_rate and random.random() < config.error_rate:
+            return error_response()
+
+        model = body.get("model", "fake")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        text = _completion_text(body, config)
+        tokens = _tokens(text)
+        usage = {
+            "prompt_tokens": _count_tokens(body.get("messages", [])),
+            "completion_tokens": len(tokens),
+            "total_tokens": _count_tokens(body.get("messages", [])) + len(tokens),
+        }
+        per_token = 1 / config.tokens_per_second if config.tokens_per_second else 0.0
+
+        if not body.get("stream"):
+            if not await _wait_or_disconnect(request, _first_token_delay(config) + per_token * (len(tokens) - 1)):
+                app.state.disconnected += 1
+                return JSONResponse(status_code=499, content={})
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            }
+
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+        def chunk(delta: Dict[str, Any], finish_reason=None, **extra) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def stream():
+            await asyncio.sleep(_first_token_delay(config))
+            for i, token in enumerate(tokens):
+                if i:
+                    await asyncio.sleep(per_token)
+                delta = {"content": token}
+                if i == 0:
+                    delta["role"] = "assistant"
+                yield chunk(delta)
+            yield chunk({}, finish_reason="stop")
+            if include_usage:
+                payload = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": usage,
+                }
+                yield f"data: {json.dumps(payload)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.post("/embeddings")
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        app.state.requests += 1
+        body = await request.json()
+        if config.error_rate and random.random() < config.error_rate:
+            return error_response()
+
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        await asyncio.sleep(config.embedding_latency_ms / 1000)
+
+        data = []
+        for i, item in enumerate(inputs):
+            vector = _embed(str(item), config.embedding_dim)
+            if body.get("encoding_format") == "base64":
+                vector = base64.b64encode(struct.pack(f"<{len(vector)}f", *vector)).decode("ascii")
+            data.append({"object": "embedding", "index": i, "embedding": vector})
+
+        n_tokens = sum(len(str(item).split()) for item in inputs)
+        return {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "fake-embedding"),
+            "usage": {"prompt_tokens": n_tokens, "total_tokens": n_tokens},
+        }
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok", "requests": app.state.requests, "disconnected": app.state.disconnected}
+
+    return app
+
+
+def run_in_thread(config: FakeLLMConfig, host: str = "127.0.0.1", port: int = 0) -> Tuple[Any, str]:
+    """
+    Starts the stub server in a background thread.
+    Returns (server, base_url); call server.should_exit = True to stop it.
+    """
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(create_app(config), host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    bound_port = server.servers[0].sockets[0].getsockname()[1]
+    return server, f"http://{host}:{bound_port}/v1"
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--completion-tokens", type=int, default=64)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--embedding-dim", type=int, default=256)
+    args = parser.parse_args()
+
+    config = FakeLLMConfig(
+        latency_ms=args.latency_ms,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        embedding_dim=args.embedding_dim,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Offline benchmark harness.
+
+Starts the fake LLM server (benchmarks/fake_llm_server.py), points the app at it and
+drives /api/run and the data pipeline at fixed concurrency levels. Reports
+throughput, p50/p95/p99 latency and peak memory as JSON so runs can be compared
+across commits:
+
+    python -m benchmarks.run_benchmarks --concurrency 1,8,32 --output bench.json
+    python -m benchmarks.run_benchmarks --compare bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import latency_summary, peak_rss_mb, write_report
+from benchmarks.fake_llm_server import FakeLLMConfig, run_in_thread
+
+
+def configure_environment(llm_url: str) -> None:
+    """
+    Points Settings at the stub server. Must run before anything imports src.llm.config.
+    """
+    os.environ["BASE_URL"] = llm_url
+    os.environ["BASE_API_KEY"] = "fake-key"
+    os.environ["MODEL_NAME"] = "fake-model"
+    os.environ["EMBEDDING_MODEL"] = "fake-embedding"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+async def run_level(client, concurrency: int, total: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Sends `total` requests to /api/run with `concurrency` requests in flight.
+    """
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    remaining = total
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await client.post("/api/run", json=payload)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "seconds": elapsed,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "statuses": statuses,
+        **latency_summary(latencies),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+async def bench_api(args) -> List[Dict[str, Any]]:
+    import httpx
+
+    if args.target:
+        client = httpx.AsyncClient(base_url=args.target, timeout=None)
+    else:
+        from src.api.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None)
+
+    results = []
+    async with client:
+        for workflow_type in args.workflow:
+            payload = {"prompt": args.prompt, "workflow_type": workflow_type}
+            for concurrency in args.concurrency:
+                result = await run_level(client, concurrency, args.requests, payload)
+                result["workflow_type"] = workflow_type
+                results.append(result)
+                print(
+                    f"api {workflow_type:<8} c={concurrency:<4} "
+                    f"{result['throughput_rps']:8.2f} req/s  p50={result['p50_ms']:8.1f}ms  "
+                    f"p95={result['p95_ms']:8.1f}ms  p99={result['p99_ms']:8.1f}ms",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def synthetic_documents(count: int, size_kb: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    words = ["alpha", "beta", "gamma", "delta", "café", "naïve", "&amp;", "<b>bold</b>", "\t", "data"]
+    docs = []
+    for _ in range(count):
+        parts, length = [], 0
+        while length < size_kb * 1024:
+            paragraph = " ".join(rng.choice(words) for _ in range(rng.randint(20, 80)))
+            parts.append(f"<p>{paragraph}</p>")
+            length += len(paragraph) + 7
+        docs.append("\n\n".join(parts))
+    return docs
+
+
+async def bench_pipeline(args) -> Dict[str, Any]:
+    from src.data import preprocess, chunker
+    from src.llm.client import get_embeddings
+
+    docs = synthetic_documents(args.docs, args.doc_kb)
+    total_bytes = sum(len(d.encode("utf-8")) for d in docs)
+
+    started = time.perf_counter()
+    chunks = []
+    for doc in docs:
+        chunks.extend(chunker.paragraph_split(preprocess.clean(doc)))
+    elapsed = time.perf_counter() - started
+    results: Dict[str, Any] = {
+        "clean_and_chunk": {
+            "documents": len(docs),
+            "chunks": len(chunks),
+            "seconds": elapsed,
+            "docs_per_second": len(docs) / elapsed if elapsed else 0.0,
+            "mb_per_second": total_bytes / (1024 * 1024) / elapsed if elapsed else 0.0,
+            "peak_rss_mb": peak_rss_mb(),
+        },
+        "embed": [],
+    }
+    print(f"pipeline clean+chunk  {results['clean_and_chunk']['mb_per_second']:8.2f} MB/s  {len(chunks)} chunks", file=sys.stderr)
+
+    embeddings = get_embeddings()
+    batches = [chunks[i:i + args.embed_batch] for i in range(0, len(chunks), args.embed_batch)]
+    for concurrency in args.concurrency:
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies: List[float] = []
+
+        async def embed(batch):
+            async with semaphore:
+                start = time.perf_counter()
+                await embeddings.aembed_documents(batch)
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(embed(batch) for batch in batches))
+        elapsed = time.perf_counter() - started
+        result = {
+            "concurrency": concurrency,
+            "batches": len(batches),
+            "chunks_per_second": len(chunks) / elapsed if elapsed else 0.0,
+            **latency_summary(latencies),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        results["embed"].append(result)
+        print(f"pipeline embed c={concurrency:<4} {result['chunks_per_second']:8.1f} chunks/s  p95={result['p95_ms']:8.1f}ms", file=sys.stderr)
+    return results
+
+
+def compare(current: Dict[str, Any], baseline_path: str) -> None:
+    """
+    Prints the relative change of each API level against a previous report.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    def key(r):
+        return (r["workflow_type"], r["concurrency"])
+
+    previous = {key(r): r for r in baseline["results"].get("api", [])}
+    print(f"\nvs {baseline_path} (commit {baseline.get('commit')})", file=sys.stderr)
+    for result in current["results"].get("api", []):
+        old = previous.get(key(result))
+        if not old:
+            continue
+        deltas = []
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            if old[metric]:
+                deltas.append(f"{metric} {100 * (result[metric] - old[metric]) / old[metric]:+6.1f}%")
+        print(f"  {result['workflow_type']:<8} c={result['concurrency']:<4} " + "  ".join(deltas), file=sys.stderr)
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Offline throughput/latency benchmarks")
+    parser.add_argument("--concurrency", type=lambda s: [int(x) for x in s.split(",")], default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=50, help="Requests per concurrency level")
+    parser.add_argument("--workflow", type=lambda s: s.split(","), default=["basic"])
+    parser.add_argument("--prompt", default="Explain quantum computing simply.")
+    parser.add_argument("--target", help="Benchmark a running API instead of the in-process app")
+    parser.add_argument("--llm-url", help="Use an already running (fake) LLM endpoint")
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--completion-tokens", type=int, default=64)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--doc-kb", type=int, default=16)
+    parser.add_argument("--embed-batch", type=int, default=32)
+    parser.add_argument("--skip-api", action="store_true")
+    parser.add_argument("--skip-pipeline", action="store_true")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+
+    server = None
+    llm_url = args.llm_url
+    if not llm_url:
+        server, llm_url = run_in_thread(FakeLLMConfig(
+            latency_ms=args.latency_ms,
+            tokens_per_second=args.tokens_per_second,
+            completion_tokens=args.completion_tokens,
+            jitter=args.jitter,
+        ))
+    configure_environment(llm_url)
+
+    results: Dict[str, Any] = {"config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")}}
+    try:
+        if not args.skip_api:
+            results["api"] = asyncio.run(bench_api(args))
+        if not args.skip_pipeline:
+            results["pipeline"] = asyncio.run(bench_pipeline(args))
+    finally:
+        if server:
+            server.should_exit = True
+
+    report = write_report("run_benchmarks", results, args.output)
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Worker process for src/agent/sandbox.py (stdlib only, started with `python -I`).
+
+Protocol: one JSON request per line on stdin
+    {"code": "...", "cpu_seconds": 5, "memory_mb": 512, "max_output_chars": 20000}
+and one JSON reply per line on stdout
+    {"output": "..."}
+A {"ready": true} line is written once the worker has finished warming up.
+"""
+import contextlib
+import io
+import json
+import os
+import resource
+import sys
+import traceback
+
+# Pre-imported so user snippets don't pay for them on every call
+import collections, datetime, decimal, fractions, itertools, math, random, re, statistics, string  # noqa: E401,F401
+
+FILE_SIZE_LIMIT_BYTES = 10 * 1024 * 1024
+
+
+def set_limits(cpu_seconds: float, memory_mb: int) -> None:
+    """
+    RLIMIT_CPU counts the process lifetime, so the per-call budget is added on top
+    of the CPU time already used. Exceeding it delivers SIGXCPU and kills the worker.
+    """
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    cpu_limit = int(usage.ru_utime + usage.ru_stime + cpu_seconds) + 1
+    _, cpu_hard = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_hard))
+    if memory_mb:
+        _, as_hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_mb * 1024 * 1024, as_hard))
+
+
+def run(code: str, max_output_chars: int) -> str:
+    buffer = io.StringIO()
+    namespace = {"__name__": "__main__", "__builtins__": __builtins__}
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        try:
+            exec(compile(code, "<sandbox>", "exec"), namespace)
+        except MemoryError:
+            buffer.write("MemoryError: memory limit exceeded\n")
+        except BaseException:
+            # Skip this module's frame so the traceback starts in the snippet
+            error_type, error, tb = sys.exc_info()
+            buffer.write("".join(traceback.format_exception(error_type, error, tb.tb_next)))
+    output = buffer.getvalue()
+    if len(output) > max_output_chars:
+        output = output[:max_output_chars] + f"\n... [truncated {len(output) - max_output_chars} chars]"
+    return output
+
+
+def main() -> None:
+    # Keep the protocol on private descriptors; user code writing to fd 0/1/2 hits /dev/null
+    requests = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    replies = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    resource.setrlimit(resource.RLIMIT_FSIZE, (FILE_SIZE_LIMIT_BYTES, FILE_SIZE_LIMIT_BYTES))
+
+    replies.write(json.dumps({"ready": True}) + "\n")
+    replies.flush()
+    for line in requests:
+        request = json.loads(line)
+        set_limits(request["cpu_seconds"], request["memory_mb"])
+        output = run(request["code"], request["max_output_chars"])
+        replies.write(json.dumps({"output": output}) + "\n")
+        replies.flush()
+
+
+if __name__ == "__main__":
+    main()
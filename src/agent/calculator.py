@@ -0,0 +1,147 @@
+"""
+Arithmetic evaluator for the calculator tool.
+
+Expressions are parsed with `ast` and evaluated over a whitelist of operators,
+math functions and constants, so no code ever runs and no subprocess is needed.
+Integer results are bounded to keep inputs like 9**9**9 from stalling a worker.
+"""
+import ast
+import math
+import operator
+from functools import lru_cache
+from typing import Any, Callable, Dict, Union
+
+Number = Union[int, float, complex]
+
+MAX_EXPRESSION_CHARS = 1000
+MAX_INT_BITS = 100_000
+MAX_FACTORIAL = 1000
+
+
+class CalculatorError(ValueError):
+    pass
+
+
+BINARY_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+UNARY_OPERATORS: Dict[type, Callable[[Any], Any]] = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+def _factorial(n):
+    if not isinstance(n, int) or n > MAX_FACTORIAL:
+        raise CalculatorError(f"factorial() needs an integer <= {MAX_FACTORIAL}")
+    return math.factorial(n)
+
+
+FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "log": math.log,
+    "log2": math.log2,
+    "log10": math.log10,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "atan2": math.atan2,
+    "degrees": math.degrees,
+    "radians": math.radians,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "factorial": _factorial,
+    "gcd": math.gcd,
+    "hypot": math.hypot,
+}
+
+CONSTANTS: Dict[str, float] = {"pi": math.pi, "e": math.e, "tau": math.tau, "inf": math.inf}
+
+
+def _check_size(op: type, left: Any, right: Any) -> None:
+    """
+    Rejects integer operations whose result would exceed MAX_INT_BITS.
+    """
+    if not (isinstance(left, int) and isinstance(right, int)):
+        return
+    if op is ast.Pow and right > 0 and abs(left) > 1:
+        if left.bit_length() * right > MAX_INT_BITS:
+            raise CalculatorError("Result too large")
+    elif op is ast.Mult and left.bit_length() + right.bit_length() > MAX_INT_BITS:
+        raise CalculatorError("Result too large")
+
+
+def _eval(node: ast.AST) -> Number:
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, (int, float, complex)) and not isinstance(node.value, bool):
+            return node.value
+        raise CalculatorError(f"Unsupported constant: {node.value!r}")
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        left, right = _eval(node.left), _eval(node.right)
+        _check_size(type(node.op), left, right)
+        return BINARY_OPERATORS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        return UNARY_OPERATORS[type(node.op)](_eval(node.operand))
+    if isinstance(node, ast.Name) and node.id in CONSTANTS:
+        return CONSTANTS[node.id]
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in FUNCTIONS
+        and not node.keywords
+    ):
+        return FUNCTIONS[node.func.id](*(_eval(arg) for arg in node.args))
+    raise CalculatorError(f"Unsupported expression: {ast.dump(node)[:80]}")
+
+
+@lru_cache(maxsize=1024)
+def _parse(expr: str) -> ast.Expression:
+    if len(expr) > MAX_EXPRESSION_CHARS:
+        raise CalculatorError(f"Expression longer than {MAX_EXPRESSION_CHARS} characters")
+    try:
+        return ast.parse(expr.strip(), mode="eval")
+    except SyntaxError as e:
+        raise CalculatorError(f"Invalid expression: {e.msg}")
+
+
+def evaluate(expr: str) -> Number:
+    """
+    Evaluates an arithmetic expression such as "2 * (3 + 4) ** 2" or "sqrt(2) / pi".
+    Raises CalculatorError for anything outside the whitelist.
+    """
+    try:
+        return _eval(_parse(expr).body)
+    except CalculatorError:
+        raise
+    except RecursionError:
+        # Deeply nested input such as "-" * 999 + "1"
+        raise CalculatorError("Expression is nested too deeply")
+    except (ArithmeticError, ValueError, TypeError) as e:
+        raise CalculatorError(str(e))
+
+
+def calculate(expr: str) -> str:
+    """
+    evaluate() formatted as text. Ints within MAX_INT_BITS can still exceed the
+    interpreter's int-to-str digit limit (sys.get_int_max_str_digits).
+    """
+    result = evaluate(expr)
+    try:
+        return str(result)
+    except ValueError:
+        raise CalculatorError("Result has too many digits to display")
@@ -0,0 +1,66 @@
+"""
+Lazy tool registry.
+
+Maps tool names to "module:attribute" so a tool's module (and its backends) is only
+imported the first time the tool is requested.
+"""
+import importlib
+from typing import Dict, List
+
+TOOL_REGISTRY: Dict[str, str] = {
+    "arxiv_search": "src.agent.tools:arxiv_search",
+    "wiki_search": "src.agent.tools:wiki_search",
+    "duck_search": "src.agent.tools:duck_search",
+    "python_repl": "src.agent.tools:python_repl",
+    "calculator": "src.agent.tools:calculator",
+    "weather": "src.agent.tools:weather",
+    "scrape_url": "src.agent.tools:scrape_url",
+    "file_write": "src.agent.tools:file_write",
+    "file_read": "src.agent.tools:file_read",
+    "gmail_toolkit": "src.agent.registry:_gmail_tools",
+}
+
+_loaded: Dict[str, object] = {}
+
+
+def _gmail_tools():
+    from langchain_community.agent_toolkits import GmailToolkit
+    return GmailToolkit().get_tools()
+
+
+def register_tool(name: str, target: str) -> None:
+    """
+    Registers a tool as "module:attribute" without importing it.
+    """
+    TOOL_REGISTRY[name] = target
+    _loaded.pop(name, None)
+
+
+def available_tools() -> List[str]:
+    return sorted(TOOL_REGISTRY)
+
+
+def get_tool(name: str):
+    """
+    Returns the tool registered under `name`, importing its module on first use.
+    Toolkit entries (like "gmail_toolkit") resolve to a list of tools.
+    """
+    if name not in _loaded:
+        try:
+            module_name, attribute = TOOL_REGISTRY[name].split(":")
+        except KeyError:
+            raise KeyError(f"Unknown tool: {name}. Available: {', '.join(available_tools())}")
+        target = getattr(importlib.import_module(module_name), attribute)
+        _loaded[name] = target() if name.endswith("_toolkit") else target
+    return _loaded[name]
+
+
+def get_tools(*names: str) -> list:
+    """
+    Resolves several tools at once, flattening toolkits.
+    """
+    tools = []
+    for name in names:
+        tool = get_tool(name)
+        tools.extend(tool if isinstance(tool, list) else [tool])
+    return tools
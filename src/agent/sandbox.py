@@ -0,0 +1,221 @@
+"""
+Pool of pre-warmed subprocesses for the python_repl tool.
+
+Code runs in a separate interpreter (src/agent/_sandbox_worker.py, started with
+`python -I`, a scrubbed environment and a scratch working directory) instead of
+the server process. Each call gets:
+- a CPU-time limit (RLIMIT_CPU) and an address-space limit (RLIMIT_AS),
+- a wall-clock timeout, after which the worker is killed and replaced,
+- a fresh globals dict, with stdout/stderr captured and truncated.
+
+Workers are reused across calls and recycled after SANDBOX_MAX_CALLS_PER_WORKER.
+This contains runaway or buggy snippets; it is not a security boundary against
+deliberately malicious code.
+"""
+import atexit
+import json
+import os
+import queue
+import select
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+from loguru import logger
+
+from src.llm.config import settings
+from src.utils.exceptions import ToolExecutionError
+from src.utils.metrics import counter, histogram
+
+SANDBOX_CALLS = counter("sandbox_calls_total", "python_repl executions by outcome", labels=("outcome",))
+SANDBOX_SECONDS = histogram("sandbox_call_seconds", "Wall time of python_repl executions")
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_sandbox_worker.py")
+STARTUP_TIMEOUT_SECONDS = 10.0
+
+
+class SandboxWorker:
+    """
+    One worker subprocess speaking the line-delimited JSON protocol.
+    """
+    def __init__(self):
+        self.workdir = tempfile.mkdtemp(prefix="sandbox-")
+        self.calls = 0
+        self.process = subprocess.Popen(
+            [sys.executable, "-I", "-u", WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.workdir,
+            env={"PATH": os.environ.get("PATH", ""), "LANG": "C.UTF-8"},
+            start_new_session=True,
+            text=True,
+        )
+        if self._read(STARTUP_TIMEOUT_SECONDS) is None:
+            self.kill()
+            raise ToolExecutionError("Sandbox worker failed to start")
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def _read(self, timeout: float) -> Optional[dict]:
+        """
+        Next reply line, or None on timeout / worker death.
+        """
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            return None
+        line = self.process.stdout.readline()
+        return json.loads(line) if line else None
+
+    def execute(self, code: str, timeout: float, cpu_seconds: float, memory_mb: int, max_output_chars: int) -> Optional[str]:
+        """
+        Returns the captured output, or None if the worker timed out or died.
+        """
+        self.calls += 1
+        request = {
+            "code": code,
+            "cpu_seconds": cpu_seconds,
+            "memory_mb": memory_mb,
+            "max_output_chars": max_output_chars,
+        }
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            return None
+        reply = self._read(timeout)
+        return reply["output"] if reply else None
+
+    def kill(self) -> None:
+        if self.alive:
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class SandboxPool:
+    """
+    Fixed-size pool of pre-warmed SandboxWorkers shared by all threads.
+    """
+    def __init__(
+        self,
+        size: int = 2,
+        timeout: float = 10.0,
+        cpu_seconds: float = 5.0,
+        memory_mb: int = 512,
+        max_output_chars: int = 20000,
+        max_calls_per_worker: int = 100,
+    ):
+        self.size = size
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.max_output_chars = max_output_chars
+        self.max_calls_per_worker = max_calls_per_worker
+        self._idle: "queue.Queue[SandboxWorker]" = queue.Queue()
+        self._closed = False
+        for _ in range(size):
+            self._idle.put(SandboxWorker())
+
+    @classmethod
+    def from_settings(cls) -> "SandboxPool":
+        return cls(
+            size=settings.SANDBOX_WORKERS,
+            timeout=settings.SANDBOX_TIMEOUT_SECONDS,
+            cpu_seconds=settings.SANDBOX_CPU_SECONDS,
+            memory_mb=settings.SANDBOX_MEMORY_MB,
+            max_output_chars=settings.SANDBOX_MAX_OUTPUT_CHARS,
+            max_calls_per_worker=settings.SANDBOX_MAX_CALLS_PER_WORKER,
+        )
+
+    def _replace(self, worker: SandboxWorker) -> None:
+        """
+        Kills `worker` and starts a fresh one in the background so the caller
+        is not delayed by interpreter startup.
+        """
+        def restart():
+            worker.kill()
+            if self._closed:
+                return
+            try:
+                self._idle.put(SandboxWorker())
+            except ToolExecutionError as e:
+                logger.error("Could not restart sandbox worker: {}", e.message)
+
+        threading.Thread(target=restart, daemon=True).start()
+
+    def run(self, code: str, timeout: Optional[float] = None) -> str:
+        """
+        Executes `code` in a worker and returns its stdout/stderr (or an error string).
+        """
+        timeout = timeout or self.timeout
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            SANDBOX_CALLS.inc(outcome="no_worker")
+            raise ToolExecutionError("No sandbox worker available", details=f"pool size {self.size}")
+
+        started = time.perf_counter()
+        output = worker.execute(code, timeout, self.cpu_seconds, self.memory_mb, self.max_output_chars)
+        elapsed = time.perf_counter() - started
+        SANDBOX_SECONDS.observe(elapsed)
+
+        if output is None:
+            # Wall-clock timeout, CPU limit (SIGXCPU) or a crash: never reuse the process
+            reason = "timeout" if elapsed >= timeout else "killed"
+            SANDBOX_CALLS.inc(outcome=reason)
+            self._replace(worker)
+            if reason == "timeout":
+                return f"Error: execution timed out after {timeout:g}s"
+            return "Error: execution was terminated (CPU or memory limit exceeded)"
+
+        SANDBOX_CALLS.inc(outcome="ok")
+        if worker.calls >= self.max_calls_per_worker:
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+        return output
+
+    async def arun(self, code: str, timeout: Optional[float] = None) -> str:
+        import asyncio
+        return await asyncio.to_thread(self.run, code, timeout)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                break
+
+
+def sanitize_code(code: str) -> str:
+    """
+    Strips markdown fences and a leading "python" tag, like PythonREPLTool does.
+    """
+    code = code.strip().strip("`")
+    if code.startswith("python"):
+        code = code[len("python"):]
+    return code.strip()
+
+
+@lru_cache(maxsize=1)
+def get_sandbox_pool() -> SandboxPool:
+    """
+    Process-wide pool, started (and warmed) on first use.
+    """
+    pool = SandboxPool.from_settings()
+    atexit.register(pool.close)
+    return pool
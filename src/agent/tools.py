@@ -1,49 +1,70 @@
-"""LangGraph-ready tools (all decorated with @tool)."""
+"""LangGraph-ready tools (all decorated with @tool).
+
+Backends (arxiv, wikipedia, DuckDuckGo, the python_repl sandbox, ...) are created
+on first use so importing this module stays cheap.
+"""
+from functools import lru_cache
+
 from langchain_core.tools import tool
-from langchain_community.tools import (
-    ArxivQueryRun,
-    WikipediaQueryRun,
-    DuckDuckGoSearchRun,
-)
-from langchain_community.utilities import ArxivAPIWrapper, WikipediaAPIWrapper
-from langchain_experimental.tools import PythonREPLTool
-from langchain_community.agent_toolkits import GmailToolkit
-from langchain_community.tools.tavily_search import TavilySearchResults
 import httpx, json, pathlib, typing as t
 
-# ---------- academic papes / web 
+from src.agent.calculator import CalculatorError, calculate
+
+# ---------- lazily constructed backends
+@lru_cache(maxsize=1)
+def _arxiv():
+    from langchain_community.tools import ArxivQueryRun
+    from langchain_community.utilities import ArxivAPIWrapper
+    return ArxivQueryRun(api_wrapper=ArxivAPIWrapper())
+
+@lru_cache(maxsize=1)
+def _wikipedia():
+    from langchain_community.tools import WikipediaQueryRun
+    from langchain_community.utilities import WikipediaAPIWrapper
+    return WikipediaQueryRun(api_wrapper=WikipediaAPIWrapper())
+
+@lru_cache(maxsize=1)
+def _duckduckgo():
+    from langchain_community.tools import DuckDuckGoSearchRun
+    return DuckDuckGoSearchRun()
+
+# ---------- academic papes / web
 @tool
 def arxiv_search(query: str) -> str:
     """Search ArXiv for a paper."""
-    return ArxivQueryRun(api_wrapper=ArxivAPIWrapper()).run(query)
+    from src.utils.shared_cache import cached_tool_call
+    return cached_tool_call("tool:arxiv", query, lambda: _arxiv().run(query))
 
 @tool
 def wiki_search(query: str) -> str:
     """Search Wikipedia."""
-    return WikipediaQueryRun(api_wrapper=WikipediaAPIWrapper()).run(query)
+    from src.utils.shared_cache import cached_tool_call
+    return cached_tool_call("tool:wikipedia", query, lambda: _wikipedia().run(query))
 
 @tool
 def duck_search(query: str) -> str:
     """DuckDuckGo instant answers."""
-    return DuckDuckGoSearchRun().run(query)
+    from src.utils.shared_cache import cached_tool_call
+    return cached_tool_call("tool:duckduckgo", query, lambda: _duckduckgo().run(query))
 
-# ---------- compute 
+# ---------- compute
 @tool
 def python_repl(code: str) -> str:
     """Execute Python code and return stdout / stderr."""
-    return PythonREPLTool().run(code)
+    from src.agent.sandbox import get_sandbox_pool, sanitize_code
+    return get_sandbox_pool().run(sanitize_code(code))
 
 @tool
 def calculator(expr: str) -> str:
     """Safe calculator (uses Python ast)."""
     try:
-        return str(eval(expr, {"__builtins__": {}}))
-    except Exception as e:
+        return calculate(expr)
+    except CalculatorError as e:
         return f"Error: {e}"
 
 
 
-# ---------- weather (open-meteo) 
+# ---------- weather (open-meteo)
 @tool
 def weather(lat: float, lon: float) -> str:
     """Current weather at lat/lon."""
@@ -52,7 +73,7 @@ def weather(lat: float, lon: float) -> str:
     r.raise_for_status()
     return json.dumps(r.json()["current_weather"])
 
-# ---------- io helpers 
+# ---------- io helpers
 @tool
 def scrape_url(url: str) -> str:
     """Return plain text of a web page."""
@@ -70,4 +91,4 @@ def file_write(path: str, content: str) -> str:
 @tool
 def file_read(path: str) -> str:
     """Read text file."""
-    return pathlib.Path(path).read_text(encoding="utf-8")
\ No newline at end of file
+    return pathlib.Path(path).read_text(encoding="utf-8")
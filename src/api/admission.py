@@ -0,0 +1,142 @@
+"""
+Admission control for workflow requests.
+
+Caps the number of in-flight runs per process and keeps a bounded wait queue.
+Requests are shed early with 429/503 instead of hanging until TIMEOUT_SECONDS:
+- 429 when the queue is already full,
+- 503 when the expected queue wait exceeds the request's remaining deadline,
+  or the request waited QUEUE_TIMEOUT_SECONDS without getting a slot.
+
+A slot is held until the sync nodes of the run have returned: a run cancelled
+by its deadline leaves them executing in worker threads, and releasing the slot
+early would let real concurrency exceed the cap.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from src.llm.config import settings
+from src.utils.exceptions import OverloadedError
+from src.utils.metrics import counter, histogram
+from src.utils.tracing import NodeThreads, node_threads
+
+ADMITTED = counter("admission_admitted_total", "Requests admitted to run")
+REJECTED = counter("admission_rejected_total", "Requests shed by admission control", labels=("reason",))
+QUEUE_WAIT_SECONDS = histogram("admission_queue_wait_seconds", "Time spent waiting for a run slot")
+
+# Weight of the newest sample in the service-time moving average
+EWMA_ALPHA = 0.2
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent: int, max_queued: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.avg_service_time = 0.0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        # Release tasks for runs whose sync nodes are still executing
+        self._draining = set()
+
+    @classmethod
+    def from_settings(cls) -> "AdmissionController":
+        return cls(
+            max_concurrent=settings.MAX_CONCURRENT_REQUESTS,
+            max_queued=settings.MAX_QUEUED_REQUESTS,
+            queue_timeout=settings.QUEUE_TIMEOUT_SECONDS,
+        )
+
+    def resize(self, max_concurrent: int, max_queued: int) -> None:
+        """
+        Changes the limits; only valid while no request is in flight (worker startup).
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def expected_wait(self) -> float:
+        """
+        Rough queueing delay for a new arrival: every waiter ahead of it needs a
+        slot to free up, and slots free at max_concurrent / avg_service_time.
+        """
+        if self.in_flight < self.max_concurrent:
+            return 0.0
+        return (self.waiting + 1) * self.avg_service_time / self.max_concurrent
+
+    def _reject(self, reason: str, message: str, status_code: int, retry_after: float):
+        REJECTED.inc(reason=reason)
+        raise OverloadedError(
+            message,
+            details=f"in_flight={self.in_flight} waiting={self.waiting}",
+            status_code=status_code,
+            retry_after=retry_after,
+        )
+
+    @asynccontextmanager
+    async def slot(self, deadline: Optional[float] = None):
+        """
+        Holds a run slot for the duration of the block.
+        `deadline` is an absolute time.time() by which the request must finish.
+        """
+        now = time.time()
+        budget = self.queue_timeout
+        if deadline is not None:
+            # Leave room to actually run the request after queueing
+            budget = min(budget, deadline - now - self.avg_service_time)
+
+        if self.in_flight >= self.max_concurrent:
+            if self.waiting >= self.max_queued:
+                self._reject("queue_full", "Too many queued requests", 429, self.expected_wait())
+            if self.expected_wait() > budget:
+                self._reject("deadline", "Request cannot be served before its deadline", 503, self.expected_wait())
+
+        self.waiting += 1
+        try:
+            if self._semaphore.locked():
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=max(budget, 0.0))
+            else:
+                await self._semaphore.acquire()
+        except asyncio.TimeoutError:
+            self._reject("queue_timeout", "Timed out waiting for a free slot", 503, self.expected_wait())
+        finally:
+            self.waiting -= 1
+
+        QUEUE_WAIT_SECONDS.observe(time.time() - now)
+        ADMITTED.inc()
+        self.in_flight += 1
+        started = time.perf_counter()
+        threads = NodeThreads()
+        token = node_threads.set(threads)
+        try:
+            yield
+        finally:
+            node_threads.reset(token)
+            threads.close()
+            if threads.active:
+                # Respond now; the slot is freed once the abandoned threads return
+                task = asyncio.ensure_future(self._release_when_idle(threads, started))
+                self._draining.add(task)
+                task.add_done_callback(self._draining.discard)
+            else:
+                self._release(started)
+
+    def _release(self, started: float) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+        elapsed = time.perf_counter() - started
+        self.avg_service_time = (
+            elapsed if not self.avg_service_time
+            else EWMA_ALPHA * elapsed + (1 - EWMA_ALPHA) * self.avg_service_time
+        )
+
+    async def _release_when_idle(self, threads: NodeThreads, started: float) -> None:
+        try:
+            await asyncio.to_thread(threads.wait_idle)
+        finally:
+            self._release(started)
+
+
+admission = AdmissionController.from_settings()
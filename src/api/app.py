@@ -1,135 +1,106 @@
 # -*- coding: utf-8 -*-
-
-
-from typing import TypedDict, Annotated, Optional
-from langgraph.graph import add_messages, StateGraph, END
-from langchain_openai import ChatOpenAI
-from dotenv import load_dotenv
-from langchain_tavily import TavilySearch
-from langgraph.checkpoint.memory import MemorySaver
-from uuid import uuid4
-import json
+"""
+Tool-calling chat graph (model <-> Tavily search) with token streaming.
+
+Nothing is constructed at import time: the model, search tool and graph are built
+on the first call to get_graph(), and the interactive demo only runs as a script.
+"""
+from functools import lru_cache
+from typing import TypedDict, Annotated
 import asyncio
 
-model = ChatOpenAI(
-    model="gemini-2.0-flash",             # Any Gemini model
-    api_key=******,        # The Gemini API key
-    base_url="https://generativelanguage.googleapis.com/v1beta/"
-)
+@lru_cache(maxsize=1)
+def get_search_tool():
+    from langchain_tavily import TavilySearch
 
-import getpass
-import os
+    return TavilySearch(
+        max_results=5,
+        topic="general")
 
-if not os.environ.get("TAVILY_API_KEY"):
-    os.environ["TAVILY_API_KEY"] = getpass.getpass("Tavily API key:\n")
+@lru_cache(maxsize=1)
+def get_graph():
+    from langchain_core.messages import ToolMessage
+    from langgraph.graph import add_messages, StateGraph, END
+    from src.components.serialization import create_checkpointer
+    from src.llm.client import get_llm
 
-search_tool = TavilySearch(
-    max_results=5,
-    topic="general")
+    class State(TypedDict):
+        messages: Annotated[list, add_messages]
 
-tools = [search_tool]
+    search_tool = get_search_tool()
+    tools = [search_tool]
 
-memory = MemorySaver()
+    memory = create_checkpointer()
 
-llm_with_tools = model.bind_tools(tools=tools)
+    llm_with_tools = get_llm().bind_tools(tools=tools)
 
-from typing import TypedDict, Annotated, Optional
-from langgraph.graph import add_messages, StateGraph, END
-from langchain_openai import ChatOpenAI
-from dotenv import load_dotenv
-from langchain_tavily import TavilySearch
-from langgraph.checkpoint.memory import MemorySaver
-from uuid import uuid4
-import json
-from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+    async def model(state: State):
+        result = await llm_with_tools.ainvoke(state["messages"])
+        return {
+            "messages": [result],
+        }
 
-class State(TypedDict):
-    messages: Annotated[list, add_messages]
-
-async def model(state: State):
-    result = await llm_with_tools.ainvoke(state["messages"])
-    return {
-        "messages": [result],
-    }
+    async def tools_router(state: State):
+        last_message = state["messages"][-1]
 
-async def tools_router(state: State):
-    last_message = state["messages"][-1]
+        if(hasattr(last_message, "tool_calls") and len(last_message.tool_calls) > 0):
+            return "tool_node"
+        else:
+            return END
 
-    if(hasattr(last_message, "tool_calls") and len(last_message.tool_calls) > 0):
-        return "tool_node"
-    else:
-        return END
+    async def tool_node(state):
+        """Custom tool node that handles tool calls from the LLM."""
+        tool_calls = state["messages"][-1].tool_calls
 
-async def tool_node(state):
-    """Custom tool node that handles tool calls from the LLM."""
-    tool_calls = state["messages"][-1].tool_calls
+        tool_messages = [
+            ToolMessage(
+                content=str(await search_tool.ainvoke(tool_call["args"])),
+                tool_call_id=tool_call["id"],
+                name=tool_call["name"]
+            )
+            for tool_call in tool_calls if tool_call["name"] == "tavily_search_results_json"
+        ]
 
-    tool_messages = [
-        ToolMessage(
-            content=str(await search_tool.ainvoke(tool_call["args"])),
-            tool_call_id=tool_call["id"],
-            name=tool_call["name"]
-        )
-        for tool_call in tool_calls if tool_call["name"] == "tavily_search_results_json"
-    ]
+        return {"messages": tool_messages}
 
-    return {"messages": tool_messages}
+    graph_builder = StateGraph(State)
 
-graph_builder = StateGraph(State)
+    graph_builder.add_node("model", model)
+    graph_builder.add_node("tool_node", tool_node)
+    graph_builder.set_entry_point("model")
 
-graph_builder.add_node("model", model)
-graph_builder.add_node("tool_node", tool_node)
-graph_builder.set_entry_point("model")
+    graph_builder.add_conditional_edges("model", tools_router)
+    graph_builder.add_edge("tool_node", "model")
 
-graph_builder.add_conditional_edges("model", tools_router)
-graph_builder.add_edge("tool_node", "model")
-
-graph = graph_builder.compile(checkpointer=memory)
+    return graph_builder.compile(checkpointer=memory)
 
 # from IPython.display import Image, display
 # from langchain_core.runnables.graph import MermaidDrawMethod
 
 # display(
 #     Image(
-#         graph.get_graph().draw_mermaid_png(
+#         get_graph().get_graph().draw_mermaid_png(
 #             draw_method=MermaidDrawMethod.API
 #         )
 #     )
 # )
 
-config = {
-    "configurable": {
-        "thread_id": 5
-    }
-}
-
-# response = await graph.ainvoke({
-#     "messages": [HumanMessage(content="When is the next spaceX launch?")],
-# }, config=config)
-
 config = {
     "configurable": {
         "thread_id": 8
     }
 }
 
-# async def tool_call_model(message):
-#  for event in graph.astream_events({
-#     "messages": [HumanMessage(content=f"{message}")]
-# }, config=config, version="v2"):
-#     if event.get("event") == "on_chat_model_stream" and "chunk" in event["data"]:
-#         chunk = event["data"]["chunk"]
-#         if hasattr(chunk, "content") and chunk.content:
-#             yield chunk.content
-
 async def tool_call_model(message):
-    async for event in graph.astream_events({
+    from langchain_core.messages import HumanMessage
+
+    async for event in get_graph().astream_events({
         "messages": [HumanMessage(content=message)],
 }, config=config, version="v2"):
 
 
        if (
-            event.get("type") == "on_chat_model_stream" and 
+            event.get("type") == "on_chat_model_stream" and
             event.get("data", {}).get("chunk")
         ):
             chunk = event["data"]["chunk"]
@@ -142,5 +113,11 @@ async def main():
     async for token in tool_call_model("when is the next spacex launch"):
         print(token, end="", flush=True)
 
-asyncio.run(main())
+if __name__ == "__main__":
+    import getpass
+    import os
+
+    if not os.environ.get("TAVILY_API_KEY"):
+        os.environ["TAVILY_API_KEY"] = getpass.getpass("Tavily API key:\n")
 
+    asyncio.run(main())
@@ -0,0 +1,347 @@
+"""
+Batch workflow runs for bulk offline jobs.
+
+Input is JSONL, one item per line:
+    {"id": "a1", "prompt": "Explain quantum computing simply."}
+    {"id": "a2", "template": "CLASSIFY_PROMPT", "variables": {"categories": "spam, ham", "text": "..."}}
+
+Every item runs through one shared compiled graph with bounded concurrency, and
+results stream back as JSONL in completion order:
+    {"id": "a1", "output": "...", "error": null, "latency_ms": 812.4}
+
+Progress is appended to a JSONL file as items finish; re-running the same input
+with the same progress file skips the items that already succeeded (failed
+records are dropped from the file and the items run again). Repeated ids in the
+input run once.
+
+Over HTTP, every item also takes a slot from the API's admission controller, so
+a batch shares MAX_CONCURRENT_REQUESTS with online traffic instead of bypassing it.
+
+    python -m src.api.batch prompts.jsonl --output results.jsonl --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from loguru import logger
+
+from src.api.workflow import WORKFLOW_TYPES, WorkflowType
+from src.llm.config import settings
+from src.utils.exceptions import OverloadedError
+from src.utils.metrics import percentile
+
+router = APIRouter()
+
+JOB_ID_PATTERN = re.compile(r"^[\w.-]{1,128}$")
+LOG_EVERY = 100
+
+
+def parse_jsonl(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Parses JSONL input. Lines that are not JSON objects become items that fail
+    individually instead of aborting the batch. Items without an id get
+    "line-<n>" (1-based), which cannot collide with a numeric explicit id.
+    """
+    for lineno, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+            if not isinstance(item, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            item = {"_parse_error": f"Invalid JSON on line {lineno}: {e}"}
+        item.setdefault("id", f"line-{lineno}")
+        yield item
+
+
+def build_messages(item: Dict[str, Any]) -> list:
+    """
+    Turns a batch item into the initial message list for the graph.
+    """
+    from langchain_core.messages import HumanMessage
+    from src.llm.prompts import get_compiled_prompt
+
+    if "template" in item:
+        return get_compiled_prompt(item["template"]).format_messages(**(item.get("variables") or {}))
+    if "prompt" in item:
+        return [HumanMessage(content=str(item["prompt"]))]
+    raise ValueError("Item needs either 'prompt' or 'template'")
+
+
+class BatchRunner:
+    """
+    Runs many items through one compiled workflow graph with bounded concurrency.
+    """
+    def __init__(
+        self,
+        workflow_type: WorkflowType = "basic",
+        concurrency: Optional[int] = None,
+        progress_path: Optional[str] = None,
+        admission=None,
+    ):
+        self.workflow_type = workflow_type
+        self.concurrency = min(concurrency or settings.BATCH_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY)
+        # Items wait for an admission slot; more workers than slots would only queue
+        self.admission = admission
+        if admission is not None:
+            self.concurrency = min(self.concurrency, admission.max_concurrent)
+        self.progress_path = progress_path
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+        self.latencies: List[float] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def completed_ids(self) -> Set[str]:
+        """
+        Ids that already succeeded according to the progress file.
+        The file is rewritten without failed records (and torn or duplicate lines),
+        since those items run again and append a new record.
+        """
+        done = set()
+        if not self.progress_path or not os.path.exists(self.progress_path):
+            return done
+        kept = []
+        dropped = 0
+        with open(self.progress_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    dropped += 1 # A torn last line from an interrupted run
+                    continue
+                record_id = str(record.get("id"))
+                if record.get("error") is None and record_id not in done:
+                    done.add(record_id)
+                    kept.append(line if line.endswith("\n") else line + "\n")
+                else:
+                    dropped += 1
+        if dropped:
+            temp_path = f"{self.progress_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.writelines(kept)
+            os.replace(temp_path, self.progress_path)
+        return done
+
+    async def _admitted(self, graph, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Runs the item inside an admission slot. A batch is not latency-sensitive,
+        so when the controller sheds load the item backs off and retries.
+        """
+        while True:
+            try:
+                async with self.admission.slot():
+                    return await self._run_item(graph, item)
+            except OverloadedError as e:
+                await asyncio.sleep(max(e.retry_after, 0.1))
+
+    async def _run_item(self, graph, item: Dict[str, Any]) -> Dict[str, Any]:
+        from src.components.budget import recursion_limit, start_budget
+
+        started = time.perf_counter()
+        result = {"id": str(item["id"]), "output": None, "error": None}
+        try:
+            if "_parse_error" in item:
+                raise ValueError(item["_parse_error"])
+            state = {
+                "messages": build_messages(item),
+                "context": None,
+                "safety_metadata": None,
+                **start_budget(),
+            }
+            final_state = await graph.ainvoke(
+                state, config={"recursion_limit": recursion_limit(state["max_iterations"])}
+            )
+            messages = final_state.get("messages") or []
+            result["output"] = final_state.get("final_answer") or (messages[-1].content if messages else None)
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["latency_ms"] = (time.perf_counter() - started) * 1000
+        return result
+
+    def _record(self, result: Dict[str, Any], progress) -> None:
+        from src.components.serialization import dumps
+
+        if result["error"] is None:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        self.latencies.append(result["latency_ms"] / 1000)
+        if progress:
+            progress.write(dumps(result).decode("utf-8") + "\n")
+            progress.flush()
+
+        processed = self.succeeded + self.failed
+        if processed % LOG_EVERY == 0:
+            logger.info(
+                "Batch progress: {} done ({} failed, {} skipped), {:.2f} items/s",
+                processed, self.failed, self.skipped, self.summary()["items_per_second"],
+            )
+
+    async def run(self, items: Iterable[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields one result per (not yet completed) item, in completion order.
+        """
+        from src.api.workflow import get_graph
+
+        graph = get_graph(self.workflow_type)
+        done_ids = self.completed_ids()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def producer():
+            for item in items:
+                item_id = str(item.get("id"))
+                if item_id in done_ids:
+                    self.skipped += 1
+                    continue
+                # Repeated ids run once, so the output has one record per id
+                done_ids.add(item_id)
+                await queue.put(item)
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        run_item = self._run_item if self.admission is None else self._admitted
+
+        async def worker():
+            while (item := await queue.get()) is not None:
+                await results.put(await run_item(graph, item))
+            await results.put(None)
+
+        self.started_at = time.perf_counter()
+        tasks = [asyncio.ensure_future(producer())]
+        tasks += [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        progress = open(self.progress_path, "a", encoding="utf-8") if self.progress_path else None
+        try:
+            finished_workers = 0
+            while finished_workers < self.concurrency:
+                result = await results.get()
+                if result is None:
+                    finished_workers += 1
+                    continue
+                self._record(result, progress)
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            if progress:
+                progress.close()
+            self.finished_at = time.perf_counter()
+
+    def summary(self) -> Dict[str, Any]:
+        end = self.finished_at or time.perf_counter()
+        seconds = end - self.started_at if self.started_at else 0.0
+        processed = self.succeeded + self.failed
+        return {
+            "workflow_type": self.workflow_type,
+            "concurrency": self.concurrency,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "seconds": seconds,
+            "items_per_second": processed / seconds if seconds else 0.0,
+            "p50_ms": (percentile(self.latencies, 50) or 0.0) * 1000,
+            "p95_ms": (percentile(self.latencies, 95) or 0.0) * 1000,
+            "p99_ms": (percentile(self.latencies, 99) or 0.0) * 1000,
+        }
+
+
+def progress_path_for(job_id: Optional[str]) -> Optional[str]:
+    if job_id is None:
+        return None
+    if not JOB_ID_PATTERN.match(job_id):
+        raise HTTPException(status_code=422, detail="job_id may only contain letters, digits, '.', '_' and '-'")
+    os.makedirs(settings.BATCH_PROGRESS_DIR, exist_ok=True)
+    return os.path.join(settings.BATCH_PROGRESS_DIR, f"{job_id}.jsonl")
+
+
+@router.post("/batch")
+async def run_batch(
+    request: Request,
+    workflow_type: WorkflowType = Query("basic"),
+    concurrency: Optional[int] = Query(None, ge=1),
+    job_id: Optional[str] = Query(None, description="Resume key: items already completed under this id are skipped"),
+):
+    """
+    Runs a JSONL request body through the workflow and streams JSONL results,
+    followed by a final {"summary": {...}} line.
+    """
+    from src.api.admission import admission
+
+    body = (await request.body()).decode("utf-8")
+    runner = BatchRunner(
+        workflow_type=workflow_type,
+        concurrency=concurrency,
+        progress_path=progress_path_for(job_id),
+        admission=admission,
+    )
+
+    async def stream():
+        from src.components.serialization import dumps
+
+        async for result in runner.run(parse_jsonl(body.splitlines())):
+            yield dumps(result) + b"\n"
+        yield dumps({"summary": runner.summary()}) + b"\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+async def run_batch_file(
+    input_path: str,
+    output_path: str,
+    workflow_type: WorkflowType = "basic",
+    concurrency: Optional[int] = None,
+    resume: bool = True,
+) -> Dict[str, Any]:
+    """
+    Python API: runs a JSONL file and appends results to `output_path`.
+    The output file doubles as the progress file when `resume` is set.
+    """
+    from src.components.serialization import dumps
+
+    runner = BatchRunner(
+        workflow_type=workflow_type,
+        concurrency=concurrency,
+        progress_path=output_path if resume else None,
+    )
+    with open(input_path, encoding="utf-8") as f:
+        if resume:
+            async for _ in runner.run(parse_jsonl(f)):
+                pass
+        else:
+            with open(output_path, "w", encoding="utf-8") as out:
+                async for result in runner.run(parse_jsonl(f)):
+                    out.write(dumps(result).decode("utf-8") + "\n")
+    return runner.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a JSONL batch through the workflow")
+    parser.add_argument("input")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--workflow-type", default="basic", choices=WORKFLOW_TYPES)
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--no-resume", action="store_true")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run_batch_file(
+        args.input,
+        args.output,
+        workflow_type=args.workflow_type,
+        concurrency=args.concurrency,
+        resume=not args.no_resume,
+    ))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,45 @@
 from fastapi import FastAPI
-from src.api import workflow
+from fastapi.responses import PlainTextResponse
+from src.api import workflow, batch
+from src.utils.exceptions import (
+    AgentOSError,
+    OverloadedError,
+    SecurityError,
+    agent_os_exception_handler,
+    overloaded_exception_handler,
+    security_exception_handler,
+)
+from src.utils.logger import setup_logging, shutdown_logging
+from src.utils.metrics import render_prometheus
+
+setup_logging()
 
 app = FastAPI(title="LaunchPad", version="0.1.0")
 
 app.include_router(workflow.router, prefix="/api", tags=["Workflow"])
+app.include_router(batch.router, prefix="/api", tags=["Batch"])
+
+app.add_exception_handler(OverloadedError, overloaded_exception_handler)
+app.add_exception_handler(SecurityError, security_exception_handler)
+app.add_exception_handler(AgentOSError, agent_os_exception_handler)
+
+@app.on_event("shutdown")
+def flush_logs():
+    shutdown_logging()
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
 
+@app.get("/llm/endpoints")
+def llm_endpoints():
+    from src.llm.router import endpoint_stats
+    return {"endpoints": endpoint_stats()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
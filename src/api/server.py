@@ -0,0 +1,235 @@
+"""
+Multi-worker launcher: preload once, then fork.
+
+    python -m src.api.server --workers 4 --port 8000 --shared-cache .cache/shared.sqlite3
+
+The supervisor imports the app, compiles every workflow graph and builds the
+prompt templates, freezes the garbage collector and binds the listening socket
+before forking. Each worker runs its own uvicorn.Server on the inherited socket,
+so the preloaded objects are shared copy-on-write instead of being rebuilt (and
+duplicated) per worker. With --shared-cache (SHARED_CACHE_PATH), LLM responses,
+embeddings and tool results are shared across workers through SQLite.
+
+Admission caps and provider quotas (MAX_CONCURRENT_REQUESTS, MAX_QUEUED_REQUESTS,
+MAX_CONCURRENT_LLM_CALLS, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE) are
+enforced per process, so each worker gets 1/N of them and the pool as a whole
+stays within the configured values.
+
+The supervisor restarts workers that exit, forwards SIGINT/SIGTERM, and logs
+per-worker RSS/PSS every WORKER_MEMORY_REPORT_SECONDS. Requires os.fork (Linux/macOS).
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import time
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from src.llm.config import settings
+from src.utils.metrics import process_memory
+
+SHUTDOWN_GRACE_SECONDS = 30.0
+# A worker that dies faster than this is restarted with a delay to avoid a crash loop
+MIN_WORKER_LIFETIME_SECONDS = 1.0
+POLL_INTERVAL_SECONDS = 0.5
+MB = 1024 * 1024
+# Per-process limits divided between the workers
+SHARED_LIMITS = (
+    "MAX_CONCURRENT_REQUESTS",
+    "MAX_QUEUED_REQUESTS",
+    "MAX_CONCURRENT_LLM_CALLS",
+    "LLM_REQUESTS_PER_MINUTE",
+    "LLM_TOKENS_PER_MINUTE",
+)
+
+
+def preload():
+    """
+    Builds everything that is read-only after startup, before the workers fork.
+    """
+    from src.api.main import app
+    from src.api.workflow import WORKFLOW_TYPES, get_graph
+    from src.llm.prompts import available_prompts, get_compiled_prompt
+    from src.utils.shared_cache import get_shared_cache
+
+    started = time.perf_counter()
+    for workflow_type in WORKFLOW_TYPES:
+        get_graph(workflow_type)
+    for name in available_prompts():
+        get_compiled_prompt(name)
+    # Creates the schema once; workers open their own connections after fork
+    get_shared_cache()
+
+    # Keep the collector from touching (and so copying) the preloaded objects in workers
+    gc.collect()
+    gc.freeze()
+    logger.info("Preloaded app in {:.2f}s ({} objects frozen)", time.perf_counter() - started, gc.get_freeze_count())
+    return app
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def share_limits(workers: int) -> None:
+    """
+    Gives this worker its 1/workers share of the per-process limits (at least 1
+    each), and drops limiter/client objects built before the fork.
+    """
+    from src.api.admission import admission
+    from src.llm import rate_limit
+
+    if workers > 1:
+        for name in SHARED_LIMITS:
+            value = getattr(settings, name)
+            if value:
+                setattr(settings, name, max(value // workers, 1))
+        admission.resize(settings.MAX_CONCURRENT_REQUESTS, settings.MAX_QUEUED_REQUESTS)
+    rate_limit.get_limiter.cache_clear()
+    rate_limit.get_http_client.cache_clear()
+    rate_limit.get_async_http_client.cache_clear()
+
+
+def run_worker(app, sock: socket.socket, workers: int = 1) -> None:
+    import uvicorn
+
+    share_limits(workers)
+
+    # uvicorn installs its own handlers; drop the supervisor's
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    config = uvicorn.Config(app, log_config=None)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def memory_report(pids: List[int]) -> Dict[str, float]:
+    """
+    Logs RSS/PSS per worker. The PSS total is the real footprint of the pool.
+    """
+    total_pss = 0.0
+    for pid in pids:
+        memory = process_memory(pid)
+        if not memory:
+            continue
+        total_pss += memory["pss"] / MB
+        logger.info(
+            "worker pid={} rss={:.1f}MB pss={:.1f}MB shared={:.1f}MB private={:.1f}MB",
+            pid, memory["rss"] / MB, memory["pss"] / MB, memory["shared"] / MB, memory["private"] / MB,
+        )
+    supervisor = process_memory()
+    logger.info(
+        "workers={} total_pss={:.1f}MB supervisor_pss={:.1f}MB",
+        len(pids), total_pss, supervisor.get("pss", 0) / MB,
+    )
+    return {"workers": len(pids), "total_pss_mb": total_pss}
+
+
+class Supervisor:
+    def __init__(self, app, sock: socket.socket, workers: int, memory_report_seconds: float):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.memory_report_seconds = memory_report_seconds
+        self.children: Dict[int, float] = {}
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(self.app, self.sock, self.workers)
+            except BaseException:
+                logger.exception("Worker crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+        logger.info("Started worker pid={}", pid)
+
+    def _stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def _reap(self) -> None:
+        while self.children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+            started = self.children.pop(pid, None)
+            if started is None:
+                continue
+            logger.warning("Worker pid={} exited with status {}", pid, os.waitstatus_to_exitcode(status))
+            if not self.stopping:
+                if time.monotonic() - started < MIN_WORKER_LIFETIME_SECONDS:
+                    time.sleep(MIN_WORKER_LIFETIME_SECONDS)
+                self.spawn()
+
+    def _shutdown(self) -> None:
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + SHUTDOWN_GRACE_SECONDS
+        while self.children and time.monotonic() < deadline:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid:
+                self.children.pop(pid, None)
+            else:
+                time.sleep(0.1)
+        for pid in self.children:
+            logger.warning("Killing worker pid={} after {}s", pid, SHUTDOWN_GRACE_SECONDS)
+            os.kill(pid, signal.SIGKILL)
+
+    def run(self) -> None:
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+        for _ in range(self.workers):
+            self.spawn()
+
+        next_report = time.monotonic() + self.memory_report_seconds
+        try:
+            while not self.stopping:
+                self._reap()
+                if self.memory_report_seconds and time.monotonic() >= next_report:
+                    memory_report(list(self.children))
+                    next_report = time.monotonic() + self.memory_report_seconds
+                time.sleep(POLL_INTERVAL_SECONDS)
+        finally:
+            self._shutdown()
+            self.sock.close()
+            logger.info("All workers stopped")
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the API with preloaded, forked workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.API_WORKERS)
+    parser.add_argument("--shared-cache", default=settings.SHARED_CACHE_PATH, help="SQLite file shared by all workers")
+    parser.add_argument("--memory-report-seconds", type=float, default=settings.WORKER_MEMORY_REPORT_SECONDS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    # Must be set before preload so the cache-aware factories see it
+    settings.SHARED_CACHE_PATH = args.shared_cache
+
+    app = preload()
+    sock = bind_socket(args.host, args.port)
+    logger.info("Listening on {}:{} with {} workers", args.host, args.port, args.workers)
+    Supervisor(app, sock, args.workers, args.memory_report_seconds).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,98 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+import asyncio
+import time
+from functools import lru_cache
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional, Dict, Any, get_args
 
-from src.components.builder import WorkflowBuilder
-from langchain_core.messages import HumanMessage
+from loguru import logger
+
+from src.api.admission import admission
+from src.llm.config import settings
 
 router = APIRouter()
 
+WorkflowType = Literal["basic", "advanced", "auto"]
+WORKFLOW_TYPES = get_args(WorkflowType)
+
 class WorkflowRequest(BaseModel):
     prompt: str
+    # Not used by the graph nodes, so it does not select a compiled graph
     system_prompt: Optional[str] = "You are a helpful assistant."
-    workflow_type: str = "basic" # basic or advanced
+    workflow_type: WorkflowType = "basic"
+    # Refine loop limits (advanced path); defaults come from Settings
+    max_iterations: Optional[int] = Field(None, ge=1, le=settings.REFINE_MAX_ITERATIONS_CAP)
+    token_budget: Optional[int] = None
+    deadline_seconds: Optional[float] = None
+    # "full" returns the whole final state, "final" only the answer and last message
+    response_mode: Literal["full", "final"] = "full"
 
 class WorkflowResponse(BaseModel):
     result: Dict[str, Any]
 
+@lru_cache(maxsize=None)
+def get_graph(workflow_type: WorkflowType):
+    """
+    Compiles the requested graph once and reuses it across requests.
+    LangGraph and the node modules are imported here, on first use.
+    """
+    from src.components.builder import WorkflowBuilder
+
+    if workflow_type not in WORKFLOW_TYPES:
+        raise ValueError(f"Unknown workflow_type '{workflow_type}', expected one of {', '.join(WORKFLOW_TYPES)}")
+    builder = WorkflowBuilder()
+    if workflow_type == "advanced":
+        return builder.build_advanced_graph()
+    elif workflow_type == "auto":
+        return builder.build_auto_graph()
+    return builder.build_basic_graph()
+
 @router.post("/run", response_model=WorkflowResponse)
 async def run_workflow(request: WorkflowRequest):
-    try:
-        builder = WorkflowBuilder(system_prompt=request.system_prompt)
-        
-        if request.workflow_type == "advanced":
-            graph = builder.build_advanced_graph()
-        else:
-            graph = builder.build_basic_graph()
-            
-        initial_state = {
-            "messages": [HumanMessage(content=request.prompt)],
-            "context": None,
-            "safety_metadata": None
-        }
-        
-        # Invoke the graph
-        final_state = graph.invoke(initial_state)
-        
-        # Serialize the output (convert messages to dicts if needed)
-        # For simplicity, we just return the raw state dict, 
-        # but in production you'd want to serialize messages properly.
-        return {"result": final_state}
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    from langchain_core.messages import HumanMessage
+    from src.components.budget import recursion_limit, start_budget
+    from src.components.serialization import state_to_dict, dumps
+
+    # The whole request (queueing + run) must finish within this deadline
+    deadline = time.time() + (request.deadline_seconds or settings.TIMEOUT_SECONDS)
+
+    async with admission.slot(deadline=deadline):
+        try:
+            graph = get_graph(request.workflow_type)
+
+            initial_state = {
+                "messages": [HumanMessage(content=request.prompt)],
+                "context": None,
+                "safety_metadata": None,
+                **start_budget(
+                    max_iterations=request.max_iterations,
+                    token_budget=request.token_budget,
+                    deadline_seconds=request.deadline_seconds,
+                ),
+            }
+
+            # Invoke the graph
+            final_state = await asyncio.wait_for(
+                graph.ainvoke(
+                    initial_state,
+                    config={"recursion_limit": recursion_limit(initial_state["max_iterations"])},
+                ),
+                timeout=max(deadline - time.time(), 0.0),
+            )
+
+            if final_state.get("loop_timings"):
+                logger.info(
+                    "Refine loop: {} iteration(s), stop={}, per-loop seconds={}",
+                    final_state["iteration"],
+                    final_state.get("stop_reason"),
+                    [round(t, 3) for t in final_state["loop_timings"]],
+                )
+
+            # Encode directly instead of going through jsonable_encoder + response_model validation
+            body = dumps({"result": state_to_dict(final_state, request.response_mode)})
+            return Response(content=body, media_type="application/json")
+
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Workflow exceeded its deadline")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,82 @@
+"""
+Iteration, token and wall-clock budgets for the refine loop.
+"""
+import time
+from typing import Any, Dict, Optional
+
+from src.llm.config import settings
+from src.components.state import AgentState
+
+# Graph steps outside the refine loop (router, planner, scheduler / guard, memory)
+# plus slack, and steps per refine pass (agent, evaluator, judge)
+FIXED_GRAPH_STEPS = 5
+STEPS_PER_ITERATION = 3
+
+
+def start_budget(
+    max_iterations: Optional[int] = None,
+    token_budget: Optional[int] = None,
+    deadline_seconds: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Returns the budget fields to merge into the initial AgentState.
+    """
+    deadline_seconds = deadline_seconds or settings.REFINE_DEADLINE_SECONDS
+    return {
+        "iteration": 0,
+        "max_iterations": max_iterations or settings.REFINE_MAX_ITERATIONS,
+        "token_budget": token_budget or settings.REFINE_TOKEN_BUDGET,
+        "tokens_used": 0,
+        "deadline": time.time() + deadline_seconds,
+        "loop_timings": [],
+    }
+
+
+def recursion_limit(max_iterations: Optional[int] = None) -> int:
+    """
+    LangGraph recursion_limit that lets the refine loop run max_iterations times
+    (the default of 25 steps is exceeded from about 7 iterations on).
+    """
+    iterations = max_iterations or settings.REFINE_MAX_ITERATIONS
+    return FIXED_GRAPH_STEPS + STEPS_PER_ITERATION * iterations
+
+
+def count_tokens(response) -> int:
+    """
+    Total tokens reported by the provider for a single LLM response.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return usage.get("total_tokens", 0)
+    token_usage = getattr(response, "response_metadata", {}).get("token_usage") or {}
+    return token_usage.get("total_tokens", 0)
+
+
+def add_usage(state: AgentState, response) -> int:
+    """
+    Returns the running token count including this response.
+    """
+    return (state.get("tokens_used") or 0) + count_tokens(response)
+
+
+def stop_reason(state: AgentState) -> Optional[str]:
+    """
+    Returns why another refine iteration must not start, or None if budget remains.
+    """
+    max_iterations = state.get("max_iterations") or settings.REFINE_MAX_ITERATIONS
+    if (state.get("iteration") or 0) >= max_iterations:
+        return "max_iterations"
+
+    token_budget = state.get("token_budget")
+    if token_budget and (state.get("tokens_used") or 0) >= token_budget:
+        return "token_budget"
+
+    deadline = state.get("deadline")
+    if deadline:
+        # Only start another loop if one more pass is expected to fit
+        timings = state.get("loop_timings") or []
+        expected = timings[-1] if timings else 0.0
+        if time.time() + expected >= deadline:
+            return "deadline"
+
+    return None
@@ -3,26 +3,37 @@ from langgraph.graph import StateGraph, END
 from langchain_core.tools import BaseTool
 
 from src.components.state import AgentState
+from src.utils.tracing import traced_node
 from src.components.nodes.guard_node import guard_node
 from src.components.nodes.memory_node import memory_node
 from src.components.nodes.agent_node import agent_node
 from src.components.nodes.planner_node import planner_node
+from src.components.nodes.scheduler_node import scheduler_node
 from src.components.nodes.evaluator_node import evaluator_node
-from src.components.nodes.judge_node import judge_node
+from src.components.nodes.judge_node import judge_node, route_after_judge
+from src.components.nodes.router_node import router_node, route_after_router, route_after_agent
 
 class WorkflowBuilder:
-    def __init__(self, system_prompt: str = "You are a helpful assistant.", tools: List[BaseTool] = []):
+    def __init__(self, system_prompt: str = "You are a helpful assistant.", tools: List[BaseTool] = [], checkpointer=None):
         self.system_prompt = system_prompt
         self.tools = tools
+        # e.g. src.components.serialization.create_checkpointer() for compact checkpoints
+        self.checkpointer = checkpointer
         self.graph_builder = StateGraph(AgentState)
 
+    def _add_node(self, name: str, node: Callable):
+        """
+        Registers a node wrapped in a tracing span.
+        """
+        self.graph_builder.add_node(name, traced_node(name, node))
+
     def build_basic_graph(self):
         """
         Builds the standard Guard -> Memory -> Agent flow.
         """
-        self.graph_builder.add_node("guard", guard_node)
-        self.graph_builder.add_node("memory", memory_node)
-        self.graph_builder.add_node("agent", agent_node)
+        self._add_node("guard", guard_node)
+        self._add_node("memory", memory_node)
+        self._add_node("agent", agent_node)
 
         self.graph_builder.set_entry_point("guard")
         
@@ -30,22 +41,69 @@ class WorkflowBuilder:
         self.graph_builder.add_edge("memory", "agent")
         self.graph_builder.add_edge("agent", END)
 
-        return self.graph_builder.compile()
+        return self.graph_builder.compile(checkpointer=self.checkpointer)
 
     def build_advanced_graph(self):
         """
-        Builds a flow with Planner -> Agent -> Evaluator -> Judge.
+        Builds a flow with Planner -> Scheduler -> Agent -> Evaluator -> Judge,
+        looping Judge -> Agent while the critique finds problems and budget remains.
         """
-        self.graph_builder.add_node("planner", planner_node)
-        self.graph_builder.add_node("agent", agent_node)
-        self.graph_builder.add_node("evaluator", evaluator_node)
-        self.graph_builder.add_node("judge", judge_node)
+        self._add_node("planner", planner_node)
+        self._add_node("scheduler", scheduler_node)
+        self._add_node("agent", agent_node)
+        self._add_node("evaluator", evaluator_node)
+        self._add_node("judge", judge_node)
 
         self.graph_builder.set_entry_point("planner")
 
-        self.graph_builder.add_edge("planner", "agent")
+        self.graph_builder.add_edge("planner", "scheduler")
+        self.graph_builder.add_edge("scheduler", "agent")
         self.graph_builder.add_edge("agent", "evaluator")
         self.graph_builder.add_edge("evaluator", "judge")
-        self.graph_builder.add_edge("judge", END)
+        self.graph_builder.add_conditional_edges(
+            "judge",
+            route_after_judge,
+            {"agent": "agent", "end": END},
+        )
         
-        return self.graph_builder.compile()
+        return self.graph_builder.compile(checkpointer=self.checkpointer)
+
+    def build_auto_graph(self):
+        """
+        Builds a Router that sends each request down the cheapest suitable path:
+        basic:    Guard -> Memory -> Agent
+        advanced: Planner -> Scheduler -> Agent -> Evaluator -> Judge
+        """
+        self._add_node("router", router_node)
+        self._add_node("guard", guard_node)
+        self._add_node("memory", memory_node)
+        self._add_node("planner", planner_node)
+        self._add_node("scheduler", scheduler_node)
+        self._add_node("agent", agent_node)
+        self._add_node("evaluator", evaluator_node)
+        self._add_node("judge", judge_node)
+
+        self.graph_builder.set_entry_point("router")
+
+        self.graph_builder.add_conditional_edges(
+            "router",
+            route_after_router,
+            {"basic": "guard", "advanced": "planner"},
+        )
+        self.graph_builder.add_edge("guard", "memory")
+        self.graph_builder.add_edge("memory", "agent")
+        self.graph_builder.add_edge("planner", "scheduler")
+        self.graph_builder.add_edge("scheduler", "agent")
+        self.graph_builder.add_conditional_edges(
+            "agent",
+            route_after_agent,
+            {"evaluator": "evaluator", "end": END},
+        )
+        self.graph_builder.add_edge("evaluator", "judge")
+        self.graph_builder.add_conditional_edges(
+            "judge",
+            route_after_judge,
+            {"agent": "agent", "end": END},
+        )
+
+        return self.graph_builder.compile(checkpointer=self.checkpointer)
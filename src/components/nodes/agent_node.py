@@ -1,18 +1,29 @@
-from langchain_core.messages import HumanMessage, SystemMessage
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from src.llm.client import get_llm
 from src.components.state import AgentState
+from src.components.budget import add_usage
+
+REVISION_REQUEST = "Revise your previous answer to address the critique. Reply with the full revised answer only."
 
 def agent_node(state: AgentState) -> AgentState:
     """
     Invokes the LLM to generate a response based on messages and context.
+    On a refine pass, the model sees the original request, its latest draft and
+    the critique (not every earlier draft), and the new draft replaces the old one.
     """
-    print("--- AGENT NODE ---")
+    started_at = time.time()
     llm = get_llm()
     
     messages = state["messages"]
     context = state.get("context", "")
-    
-    # Simple prompt engineering to include context
+
+    critique = state.get("critique")
+    revising = bool(critique and state.get("needs_refinement") and messages and isinstance(messages[-1], AIMessage))
+    # The request without the draft being revised
+    history = messages[:-1] if revising else messages
+
     # Simple prompt engineering to include context and plan
     system_content = []
     if context:
@@ -22,17 +33,33 @@ def agent_node(state: AgentState) -> AgentState:
     if plan:
         plan_str = "\n".join([f"{i+1}. {step}" for i, step in enumerate(plan)])
         system_content.append(f"Plan:\n{plan_str}")
+
+    # Merge the sub-agent results produced by the scheduler
+    step_results = state.get("step_results")
+    if step_results:
+        results_str = "\n\n".join(
+            f"Step {step['id']} ({step['task']}):\n{step_results.get(step['id'], '')}"
+            for step in state.get("plan_graph") or []
+        )
+        system_content.append(f"Results of the plan steps (combine them into the final answer):\n{results_str}")
+
+    # Refine loop: feed the judge's critique back into the next attempt
+    if revising:
+        system_content.append(f"Critique of your previous answer (address it in your revision):\n{critique}")
         
     if system_content:
         system_msg = SystemMessage(content="\n\n".join(system_content))
         # Prepend context if not already present (simplified logic)
         messages = [system_msg] + messages
-        
+    if revising:
+        messages = messages + [HumanMessage(content=REVISION_REQUEST)]
+
     response = llm.invoke(messages)
-    
-    # Append response to history? Or just return the latest?
-    # LangGraph usually expects updates to the state.
-    # If 'messages' is an Annotated list with add_messages, we return the new message.
-    # Here we are using a simple TypedDict, so we manually append.
-    
-    return {"messages": state["messages"] + [response]}
+
+    # 'messages' is a plain list in this TypedDict state, so updates are built manually;
+    # a revision replaces the previous draft instead of growing the history each pass.
+    return {
+        "messages": history + [response],
+        "tokens_used": add_usage(state, response),
+        "loop_started_at": started_at,
+    }
@@ -1,24 +1,18 @@
-from langchain_core.messages import HumanMessage
 from src.llm.client import get_llm
+from src.llm.prompts import get_prompt
 from src.components.state import AgentState
+from src.components.budget import add_usage
 
 def evaluator_node(state: AgentState) -> AgentState:
     """
     Critiques the agent's output or the plan.
     """
-    print("--- EVALUATOR NODE ---")
     llm = get_llm()
     
     messages = state["messages"]
     last_response = messages[-1].content if messages else ""
     
-    prompt = f"""
-    You are an Evaluator Agent.
-    Critique the following response for accuracy, safety, and completeness.
+    prompt = get_prompt("EVALUATOR_PROMPT")
+    response = llm.invoke(prompt.format_messages(response=last_response))
     
-    Response: {last_response}
-    """
-    
-    response = llm.invoke([HumanMessage(content=prompt)])
-    
-    return {"critique": response.content}
+    return {"critique": response.content, "tokens_used": add_usage(state, response)}
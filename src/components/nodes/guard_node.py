@@ -7,7 +7,6 @@ def guard_node(state: AgentState) -> AgentState:
     Checks inputs/outputs against safety guardrails.
     For now, it's a pass-through that initializes metadata.
     """
-    print("--- GUARD NODE ---")
     # Example logic:
     # guard.validate(state["messages"][-1].content)
     
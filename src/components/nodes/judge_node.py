@@ -1,27 +1,44 @@
-from langchain_core.messages import HumanMessage
+import re
+import time
+
 from src.llm.client import get_llm
+from src.llm.prompts import get_prompt
 from src.components.state import AgentState
+from src.components.budget import add_usage, stop_reason
+
+VERDICT_PATTERN = re.compile(r"^\s*VERDICT:\s*(PASS|REVISE)\s*$", re.IGNORECASE | re.MULTILINE)
 
 def judge_node(state: AgentState) -> AgentState:
     """
-    Decides if the output is sufficient or if replanning/refining is needed.
-    For this boilerplate, it just synthesizes a final answer.
+    Decides if the output is sufficient or if refining is needed.
+    Synthesizes a final answer either way, so the loop can stop at any budget limit.
     """
-    print("--- JUDGE NODE ---")
     llm = get_llm()
-    
+
     critique = state.get("critique", "")
     messages = state["messages"]
     last_response = messages[-1].content if messages else ""
-    
-    prompt = f"""
-    You are a Judge Agent.
-    Based on the original response and the critique, provide the final, polished answer.
-    
-    Original Response: {last_response}
-    Critique: {critique}
-    """
-    
-    response = llm.invoke([HumanMessage(content=prompt)])
-    
-    return {"final_answer": response.content}
+
+    prompt = get_prompt("JUDGE_PROMPT")
+    response = llm.invoke(prompt.format_messages(response=last_response, critique=critique))
+
+    match = VERDICT_PATTERN.search(response.content)
+    needs_refinement = bool(match) and match.group(1).upper() == "REVISE"
+    final_answer = VERDICT_PATTERN.sub("", response.content, count=1).strip()
+
+    started_at = state.get("loop_started_at") or time.time()
+    updates = {
+        "final_answer": final_answer,
+        "iteration": (state.get("iteration") or 0) + 1,
+        "tokens_used": add_usage(state, response),
+        "loop_timings": (state.get("loop_timings") or []) + [time.time() - started_at],
+    }
+
+    reason = stop_reason({**state, **updates}) if needs_refinement else "approved"
+    updates["needs_refinement"] = reason is None
+    updates["stop_reason"] = reason
+    return updates
+
+
+def route_after_judge(state: AgentState) -> str:
+    return "agent" if state.get("needs_refinement") else "end"
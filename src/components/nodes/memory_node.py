@@ -4,7 +4,6 @@ def memory_node(state: AgentState) -> AgentState:
     """
     Injects context from Graphiti (Knowledge Graph) or ChromaDB (Vector Store).
     """
-    print("--- MEMORY NODE ---")
     # Placeholder for retrieval logic
     # context = vector_store.similarity_search(...)
     # state["context"] = context
@@ -1,30 +1,109 @@
-from langchain_core.messages import SystemMessage, HumanMessage
+import json
+from typing import Any, Dict, List, Union
+
+from pydantic import BaseModel
 from src.llm.client import get_llm
+from src.llm.config import settings
+from src.llm.prompts import get_prompt
+from src.llm.structured import generate_structured
 from src.components.state import AgentState
+from src.components.budget import count_tokens
+
+class PlanStep(BaseModel):
+    id: Union[str, int]
+    task: str
+    depends_on: List[Union[str, int]] = []
+
+class Plan(BaseModel):
+    steps: List[PlanStep]
+
+def sequential_plan(tasks: List[str]) -> List[Dict[str, Any]]:
+    """
+    Builds a plan where every step depends on the one before it.
+    """
+    return [
+        {"id": str(i + 1), "task": task, "depends_on": [str(i)] if i else []}
+        for i, task in enumerate(tasks)
+    ]
+
+def has_cycle(steps: List[Dict[str, Any]]) -> bool:
+    deps = {step["id"]: step["depends_on"] for step in steps}
+    visiting, done = set(), set()
+
+    def visit(step_id: str) -> bool:
+        if step_id in done:
+            return False
+        if step_id in visiting:
+            return True
+        visiting.add(step_id)
+        if any(visit(dep) for dep in deps[step_id]):
+            return True
+        visiting.discard(step_id)
+        done.add(step_id)
+        return False
+
+    return any(visit(step_id) for step_id in deps)
+
+def normalize_plan(raw_steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Turns raw step dicts into steps of the form
+    {"id": str, "task": str, "depends_on": [str, ...]} that the scheduler can run.
+    """
+    steps = []
+    for i, raw in enumerate(raw_steps[:settings.PLAN_MAX_STEPS]):
+        steps.append({
+            "id": str(raw.get("id", i + 1)),
+            "task": str(raw["task"]).strip(),
+            "depends_on": [str(dep) for dep in raw.get("depends_on") or []],
+        })
+
+    # Drop dangling references; a cyclic plan cannot be scheduled, so run it in order
+    ids = {step["id"] for step in steps}
+    for step in steps:
+        step["depends_on"] = [dep for dep in step["depends_on"] if dep in ids and dep != step["id"]]
+    if len(ids) != len(steps) or has_cycle(steps):
+        return sequential_plan([step["task"] for step in steps])
+    return steps
+
+def parse_plan(plan_text: str, request: str) -> List[Dict[str, Any]]:
+    """
+    Parses the planner's raw JSON output.
+    Text that is not JSON becomes a sequential plan built from its lines; JSON of
+    the wrong shape becomes a single step for the whole request (its lines are
+    syntax, not tasks, and each step costs an LLM call).
+    """
+    try:
+        data = json.loads(plan_text)
+    except ValueError:
+        lines = [line.strip() for line in plan_text.split('\n') if line.strip()]
+        return sequential_plan(lines[:settings.PLAN_MAX_STEPS])
+    try:
+        return normalize_plan(data["steps"])
+    except (KeyError, TypeError, AttributeError):
+        return sequential_plan([request])
 
 def planner_node(state: AgentState) -> AgentState:
     """
-    Decomposes the user request into a list of subtasks.
+    Decomposes the user request into subtasks with dependencies between them.
     """
-    print("--- PLANNER NODE ---")
-    llm = get_llm()
-    
+    llm = get_llm(json_mode=True)
+
     messages = state["messages"]
     # Extract the latest user request
     user_request = messages[-1].content if messages else "No request"
-    
-    prompt = f"""
-    You are a Planner Agent.
-    Break down the following user request into a step-by-step plan.
-    Return ONLY the plan as a numbered list.
-    
-    Request: {user_request}
-    """
-    
-    response = llm.invoke([HumanMessage(content=prompt)])
-    
-    # Naive parsing of the plan
-    plan_text = response.content
-    plan_steps = [line.strip() for line in plan_text.split('\n') if line.strip()]
-    
-    return {"plan": plan_steps}
+
+    prompt = get_prompt("PLANNER_PROMPT").format_messages(request=user_request)
+
+    # Validated output; only broken fields are re-requested, then fall back to the raw text
+    result = generate_structured(prompt, Plan, llm=llm, strict=False)
+    if result.value is not None:
+        plan_graph = normalize_plan([step.model_dump() for step in result.value.steps])
+    else:
+        plan_graph = parse_plan(result.raw, user_request)
+    plan_steps = [step["task"] for step in plan_graph]
+
+    return {
+        "plan": plan_steps,
+        "plan_graph": plan_graph,
+        "tokens_used": (state.get("tokens_used") or 0) + sum(count_tokens(r) for r in result.responses),
+    }
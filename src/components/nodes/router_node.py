@@ -0,0 +1,86 @@
+import re
+from typing import Optional
+
+from src.llm.client import get_llm
+from src.llm.config import settings
+from src.llm.prompts import get_prompt
+from src.components.state import AgentState
+from src.utils.metrics import ROUTE_DECISIONS, LLM_CALLS_SAVED
+
+# LLM calls made by each path of the auto graph. The advanced path also makes one
+# call per plan step, but no plan exists when routing, so LLM_CALLS_SAVED counts
+# only these fixed calls (a lower bound).
+BASIC_PATH_LLM_CALLS = 1     # agent
+ADVANCED_PATH_LLM_CALLS = 4  # planner, agent, evaluator, judge
+
+# Signals that a request needs planning / critique
+COMPLEX_PATTERNS = [
+    re.compile(r"\bstep[- ]by[- ]step\b", re.IGNORECASE),
+    re.compile(r"\b(plan|design|architect|strategy|roadmap)\b", re.IGNORECASE),
+    re.compile(r"\b(compare|contrast|evaluate|analy[sz]e|trade-?offs?)\b", re.IGNORECASE),
+    re.compile(r"\b(first|then|finally|afterwards)\b.*\b(then|finally|afterwards)\b", re.IGNORECASE | re.DOTALL),
+    re.compile(r"^\s*(\d+[.)]|[-*])\s+", re.MULTILINE),
+]
+
+
+def classify_heuristic(text: str) -> Optional[str]:
+    """
+    Cheap routing based on length and wording.
+    Returns "basic", "advanced", or None when the request is ambiguous.
+    """
+    words = len(text.split())
+    signals = sum(1 for pattern in COMPLEX_PATTERNS if pattern.search(text))
+    signals += max(text.count("?") - 1, 0)
+
+    if words >= settings.ROUTER_MIN_COMPLEX_WORDS or signals >= 2:
+        return "advanced"
+    if words <= settings.ROUTER_MAX_SIMPLE_WORDS and signals == 0:
+        return "basic"
+    return None
+
+
+def classify_with_model(text: str) -> str:
+    """
+    Asks the small router model whether the request is simple or complex.
+    """
+    llm = get_llm(model=settings.ROUTER_MODEL, streaming=False)
+
+    prompt = get_prompt("ROUTER_PROMPT")
+    response = llm.invoke(prompt.format_messages(request=text))
+    return "advanced" if "COMPLEX" in response.content.upper() else "basic"
+
+
+def router_node(state: AgentState) -> AgentState:
+    """
+    Picks the graph path for the request: heuristics first, then the optional
+    small-model classifier for ambiguous requests.
+    """
+    messages = state["messages"]
+    user_request = messages[-1].content if messages else ""
+
+    route = classify_heuristic(user_request)
+    method = "heuristic"
+    if route is None:
+        if settings.ROUTER_MODEL:
+            route = classify_with_model(user_request)
+            method = "classifier"
+        else:
+            route = "advanced"
+            method = "fallback"
+
+    ROUTE_DECISIONS.inc(route=route, method=method)
+    if route == "basic":
+        saved = ADVANCED_PATH_LLM_CALLS - BASIC_PATH_LLM_CALLS
+        if method == "classifier":
+            saved -= 1
+        LLM_CALLS_SAVED.inc(saved)
+
+    return {"route": route}
+
+
+def route_after_router(state: AgentState) -> str:
+    return state.get("route") or "advanced"
+
+
+def route_after_agent(state: AgentState) -> str:
+    return "evaluator" if state.get("route") == "advanced" else "end"
@@ -0,0 +1,66 @@
+import asyncio
+import time
+from typing import Dict
+
+from loguru import logger
+from src.llm.client import get_llm
+from src.llm.config import settings
+from src.llm.prompts import get_prompt
+from src.components.state import AgentState
+from src.components.budget import count_tokens
+
+async def scheduler_node(state: AgentState) -> AgentState:
+    """
+    Executes the structured plan: every step runs as a sub-agent call as soon as
+    the steps it depends on have finished, so independent steps run concurrently
+    and the whole plan completes in critical-path time.
+    """
+    steps = state.get("plan_graph") or []
+    if not steps:
+        return {}
+
+    llm = get_llm()
+    step_prompt = get_prompt("PLAN_STEP_PROMPT")
+    messages = state["messages"]
+    user_request = messages[-1].content if messages else ""
+
+    semaphore = asyncio.Semaphore(settings.PLAN_MAX_PARALLEL)
+    tasks_by_id = {step["id"]: step["task"] for step in steps}
+    futures: Dict[str, asyncio.Task] = {}
+    results: Dict[str, str] = {}
+    tokens = 0
+
+    async def run_step(step) -> None:
+        nonlocal tokens
+        if step["depends_on"]:
+            await asyncio.gather(*(futures[dep] for dep in step["depends_on"]))
+
+        inputs = "\n\n".join(
+            f"Result of step {dep} ({tasks_by_id[dep]}):\n{results[dep]}"
+            for dep in step["depends_on"]
+        )
+        prompt = step_prompt.format_messages(
+            request=user_request,
+            inputs=f"\n\n{inputs}" if inputs else "",
+            task=step["task"],
+        )
+
+        async with semaphore:
+            try:
+                response = await llm.ainvoke(prompt)
+                results[step["id"]] = response.content
+                tokens += count_tokens(response)
+            except Exception as e:
+                logger.warning("Plan step {} failed: {}", step["id"], e)
+                results[step["id"]] = f"Step failed: {e}"
+
+    started_at = time.time()
+    for step in steps:
+        futures[step["id"]] = asyncio.ensure_future(run_step(step))
+    await asyncio.gather(*futures.values())
+    logger.debug("Executed {} plan steps in {:.2f}s", len(steps), time.time() - started_at)
+
+    return {
+        "step_results": results,
+        "tokens_used": (state.get("tokens_used") or 0) + tokens,
+    }
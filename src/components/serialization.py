@@ -0,0 +1,184 @@
+"""
+Compact encoding of AgentState for API responses and checkpoints.
+
+Messages are reduced to their type, content and only the non-empty optional
+fields, then the whole state is written in one pass with orjson (falling back to
+the stdlib json module when orjson is not installed).
+
+The same encoding backs CompactSerializer, a LangGraph checkpoint serializer that
+delegates anything it cannot represent exactly (tuples, sets, custom objects) to
+LangGraph's JsonPlusSerializer.
+"""
+import json
+from typing import Any, Dict, Literal, Tuple
+
+from langchain_core.messages import BaseMessage, messages_from_dict
+
+try:
+    import orjson
+except ImportError: # pragma: no cover - optional speed-up
+    orjson = None
+
+ResponseMode = Literal["full", "final"]
+
+MESSAGE_TAG = "__msg__"
+COMPACT_TYPE = "compact-json"
+
+# Optional message fields, emitted only when set
+OPTIONAL_MESSAGE_FIELDS = (
+    "name",
+    "id",
+    "tool_calls",
+    "invalid_tool_calls",
+    "tool_call_id",
+    "usage_metadata",
+    "additional_kwargs",
+    "response_metadata",
+    "role",
+    "status",
+    "artifact",
+)
+
+
+class _Unsupported(TypeError):
+    """Raised in strict mode for values JSON cannot round-trip."""
+
+
+def message_to_dict(message: BaseMessage) -> Dict[str, Any]:
+    data = {"type": message.type, "content": message.content}
+    for field in OPTIONAL_MESSAGE_FIELDS:
+        value = getattr(message, field, None)
+        if value and not (field == "status" and value == "success"):
+            data[field] = value
+    return data
+
+
+def message_from_dict(data: Dict[str, Any]) -> BaseMessage:
+    data = dict(data)
+    message_type = data.pop("type")
+    return messages_from_dict([{"type": message_type, "data": data}])[0]
+
+
+def to_jsonable(value: Any, strict: bool = False) -> Any:
+    """
+    Converts a state value into JSON-native types in a single walk.
+    In strict mode (checkpoints) anything that would not round-trip raises.
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, BaseMessage):
+        data = to_jsonable(message_to_dict(value), strict)
+        return {MESSAGE_TAG: data} if strict else data
+    if isinstance(value, dict):
+        if strict and not all(isinstance(key, str) for key in value):
+            raise _Unsupported("non-string keys")
+        return {str(key): to_jsonable(item, strict) for key, item in value.items()}
+    if isinstance(value, list) or (isinstance(value, tuple) and not strict):
+        return [to_jsonable(item, strict) for item in value]
+    if strict:
+        raise _Unsupported(type(value).__name__)
+    if hasattr(value, "model_dump"):
+        return to_jsonable(value.model_dump(), strict)
+    return str(value)
+
+
+def from_jsonable(value: Any) -> Any:
+    """
+    Inverse of to_jsonable(strict=True): restores tagged messages.
+    """
+    if isinstance(value, dict):
+        if MESSAGE_TAG in value and len(value) == 1:
+            return message_from_dict(from_jsonable(value[MESSAGE_TAG]))
+        return {key: from_jsonable(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [from_jsonable(item) for item in value]
+    return value
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Writes already JSON-native data as compact UTF-8 JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def state_to_dict(state: Dict[str, Any], mode: ResponseMode = "full") -> Dict[str, Any]:
+    """
+    JSON-native view of a final AgentState.
+    "final" keeps only the answer and the last message instead of the whole history.
+    """
+    if mode == "final":
+        messages = state.get("messages") or []
+        last_message = message_to_dict(messages[-1]) if messages else None
+        final_answer = state.get("final_answer")
+        if final_answer is None and last_message is not None:
+            final_answer = last_message["content"]
+        return {"final_answer": final_answer, "last_message": to_jsonable(last_message)}
+    return to_jsonable(state)
+
+
+def encode_state(state: Dict[str, Any], mode: ResponseMode = "full") -> bytes:
+    return dumps(state_to_dict(state, mode))
+
+
+def encode_payload(payload: Any) -> bytes:
+    """
+    Encodes any response payload that may contain states or messages.
+    """
+    return dumps(to_jsonable(payload))
+
+
+def decode_state(data: bytes) -> Dict[str, Any]:
+    """
+    Restores a state written by encode_state(mode="full") with message objects.
+    """
+    state = loads(data)
+    if state.get("messages"):
+        state["messages"] = [message_from_dict(message) for message in state["messages"]]
+    return state
+
+
+class CompactSerializer:
+    """
+    LangGraph checkpoint serializer using the compact state encoding.
+    """
+    def __init__(self, fallback=None):
+        if fallback is None:
+            from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+            fallback = JsonPlusSerializer()
+        self.fallback = fallback
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        try:
+            return COMPACT_TYPE, dumps(to_jsonable(obj, strict=True))
+        except (_Unsupported, TypeError, ValueError):
+            return self.fallback.dumps_typed(obj)
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_ == COMPACT_TYPE:
+            return from_jsonable(loads(payload))
+        return self.fallback.loads_typed(data)
+
+    # Older LangGraph versions call the untyped variants
+    def dumps(self, obj: Any) -> bytes:
+        return self.fallback.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self.fallback.loads(data)
+
+
+def create_checkpointer():
+    """
+    In-memory checkpointer that stores states with the compact encoding.
+    """
+    from langgraph.checkpoint.memory import MemorySaver
+    return MemorySaver(serde=CompactSerializer())
@@ -6,5 +6,18 @@ class AgentState(TypedDict):
     context: Optional[str]
     safety_metadata: Optional[Dict[str, Any]]
     plan: Optional[List[str]]
+    plan_graph: Optional[List[Dict[str, Any]]]
+    step_results: Optional[Dict[str, str]]
     critique: Optional[str]
     final_answer: Optional[str]
+    route: Optional[str]
+    # Refine loop bookkeeping
+    iteration: Optional[int]
+    max_iterations: Optional[int]
+    token_budget: Optional[int]
+    tokens_used: Optional[int]
+    deadline: Optional[float]
+    loop_started_at: Optional[float]
+    loop_timings: Optional[List[float]]
+    needs_refinement: Optional[bool]
+    stop_reason: Optional[str]
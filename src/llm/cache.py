@@ -0,0 +1,103 @@
+"""
+LangChain adapters for the shared cache tier (src/utils/shared_cache.py).
+
+- SharedLLMCache: a BaseCache for chat/LLM responses, installed globally by
+  enable_llm_cache() so every worker process reuses the others' answers.
+- CachedEmbeddings: wraps an Embeddings model and only sends texts that no
+  worker has embedded before.
+"""
+import asyncio
+import json
+from array import array
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.embeddings import Embeddings
+from langchain_core.load import dumps, loads
+
+from src.llm.config import settings
+from src.utils.shared_cache import SharedCache, get_shared_cache, make_key
+
+LLM_NAMESPACE = "llm"
+
+
+class SharedLLMCache(BaseCache):
+    def __init__(self, cache: SharedCache, ttl: Optional[float] = None):
+        self.cache = cache
+        self.ttl = ttl
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Any]]:
+        value = self.cache.get(LLM_NAMESPACE, make_key(prompt, llm_string))
+        if value is None:
+            return None
+        return [loads(generation) for generation in json.loads(value)]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Any]) -> None:
+        value = json.dumps([dumps(generation) for generation in return_val])
+        self.cache.set(LLM_NAMESPACE, make_key(prompt, llm_string), value.encode("utf-8"), self.ttl)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.cache.clear(LLM_NAMESPACE)
+
+
+@lru_cache(maxsize=1)
+def enable_llm_cache() -> bool:
+    """
+    Installs SharedLLMCache as LangChain's global cache (once per process).
+    """
+    cache = get_shared_cache()
+    if cache is None or not settings.SHARED_CACHE_LLM_RESPONSES:
+        return False
+    from langchain_core.globals import set_llm_cache
+    set_llm_cache(SharedLLMCache(cache, ttl=settings.SHARED_CACHE_TTL_SECONDS))
+    return True
+
+
+def _encode(vector: List[float]) -> bytes:
+    return array("d", vector).tobytes()
+
+
+def _decode(value: bytes) -> List[float]:
+    vector = array("d")
+    vector.frombytes(value)
+    return vector.tolist()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings backed by the shared cache; misses go to the wrapped model in one batch.
+    """
+    def __init__(self, embeddings: Embeddings, cache: SharedCache, namespace: str):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.namespace = namespace
+
+    def _lookup(self, texts: List[str]):
+        keys = [make_key(text) for text in texts]
+        found = self.cache.get_many(self.namespace, list(dict.fromkeys(keys)))
+        missing = list(dict.fromkeys(text for text, key in zip(texts, keys) if key not in found))
+        return keys, found, missing
+
+    def _store(self, keys, found, missing: List[str], vectors: List[List[float]]) -> List[List[float]]:
+        new = {make_key(text): _encode(vector) for text, vector in zip(missing, vectors)}
+        if new:
+            self.cache.set_many(self.namespace, new)
+        found.update(new)
+        return [_decode(found[key]) for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._lookup(texts)
+        vectors = self.embeddings.embed_documents(missing) if missing else []
+        return self._store(keys, found, missing, vectors)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = await asyncio.to_thread(self._lookup, texts)
+        vectors = await self.embeddings.aembed_documents(missing) if missing else []
+        return await asyncio.to_thread(self._store, keys, found, missing, vectors)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
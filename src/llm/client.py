@@ -1,45 +1,80 @@
 from functools import lru_cache
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from loguru import logger
 
 from src.llm.config import settings
 
+# langchain_openai is imported on first client construction to keep startup fast
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+    from langchain_openai import ChatOpenAI
+
 def get_llm(
     temperature: float = 0.0,
     model: Optional[str] = None,
     streaming: bool = True,
     json_mode: bool = False
-) -> ChatOpenAI:
+) -> "ChatOpenAI":
     """
     Creates a standard LLM client.
     """
-    
+    from langchain_openai import ChatOpenAI
+    from src.llm.rate_limit import get_http_client, get_async_http_client
+    from src.utils.tracing import TRACING_HANDLER
+
+    if settings.SHARED_CACHE_PATH:
+        from src.llm.cache import enable_llm_cache
+        enable_llm_cache()
+
     model_to_use = model or settings.MODEL_NAME
     model_kwargs = {}
     if json_mode:
         model_kwargs["response_format"] = {"type": "json_object"}
 
-    logger.debug(f"Initializing LLM: {model_to_use} | Temp: {temperature} | Async: True")
+    logger.debug("Initializing LLM: {} | Temp: {} | Async: True", model_to_use, temperature)
 
-    return ChatOpenAI(
-        model=model_to_use,
+    llm_kwargs = dict(
         temperature=temperature,
-        api_key=settings.API_KEY.get_secret_value(),
-        base_url=settings.BASE_URL,
         streaming=streaming,
+        stream_usage=True,
         max_retries=settings.MAX_RETRIES,
         request_timeout=settings.TIMEOUT_SECONDS,
         model_kwargs=model_kwargs,
+        callbacks=[TRACING_HANDLER],
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+    )
+
+    # Several endpoints configured: hedge / fail over between them
+    if settings.LLM_ENDPOINTS and model is None:
+        from src.llm.router import HedgedChatModel
+        return HedgedChatModel.from_endpoints(settings.LLM_ENDPOINTS, **llm_kwargs)
+
+    return ChatOpenAI(
+        model=model_to_use,
+        api_key=settings.API_KEY.get_secret_value(),
+        base_url=settings.BASE_URL,
+        **llm_kwargs,
     )
 
 @lru_cache(maxsize=1)
-def get_embeddings() -> OpenAIEmbeddings:
+def get_embeddings() -> "Embeddings":
+    from langchain_openai import OpenAIEmbeddings
+    from src.llm.rate_limit import get_http_client, get_async_http_client
+    from src.utils.shared_cache import get_shared_cache
 
-    return OpenAIEmbeddings(
+    embeddings = OpenAIEmbeddings(
         model=settings.EMBEDDING_MODEL,
         api_key=settings.API_KEY.get_secret_value(),
         base_url=settings.BASE_URL,
-        check_embedding_ctx_length=False # Disable check for local models to avoid errors
-    )
\ No newline at end of file
+        check_embedding_ctx_length=False, # Disable check for local models to avoid errors
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+    )
+    # Shared across worker processes when SHARED_CACHE_PATH is set
+    cache = get_shared_cache()
+    if cache is not None:
+        from src.llm.cache import CachedEmbeddings
+        return CachedEmbeddings(embeddings, cache, namespace=f"embeddings:{settings.EMBEDDING_MODEL}")
+    return embeddings
\ No newline at end of file
@@ -1,6 +1,6 @@
 import os
-from typing import Literal
-from pydantic import SecretStr, Field
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, SecretStr, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
@@ -11,8 +11,20 @@ base_url = os.getenv("BASE_URL")
 model_name =os.getenv("MODEL_NAME")
 embedding_model= os.getenv("EMBEDDING_MODEL")
 
+class EndpointConfig(BaseModel):
+    """One OpenAI-compatible endpoint for multi-provider routing."""
+    name: str
+    base_url: str
+    model: str
+    api_key: Optional[SecretStr] = None # Falls back to API_KEY
+
 class Settings(BaseSettings):
+    ENV: Literal["development", "production"] = "development"
     LOG_LEVEL: str = "INFO"
+    LOG_STDLIB_LEVEL: Optional[str] = None # Level for library (stdlib) loggers, defaults to LOG_LEVEL
+    LOG_ENQUEUE: bool = True # Write sinks from a background thread
+    LOG_SAMPLE_RATES: Dict[str, float] = Field(default_factory=dict, description="Fraction of sub-WARNING records kept per module prefix")
+    LOG_RATE_LIMIT_PER_SECOND: Optional[float] = None # Per-logger cap for sub-WARNING records
 
     API_KEY: SecretStr = Field(api_key, description="API Key for the Model Provider")
     
@@ -25,6 +37,67 @@ class Settings(BaseSettings):
     MAX_RETRIES: int = 3
     TIMEOUT_SECONDS: int = 60
 
+    # --- Admission control (per process; divided between API_WORKERS) ---
+    MAX_CONCURRENT_REQUESTS: int = 16
+    MAX_QUEUED_REQUESTS: int = 64
+    QUEUE_TIMEOUT_SECONDS: float = 10.0
+
+    # --- Provider quotas (per process; divided between API_WORKERS) ---
+    MAX_CONCURRENT_LLM_CALLS: Optional[int] = 32
+    LLM_REQUESTS_PER_MINUTE: Optional[int] = Field(None, description="Provider RPM quota")
+    LLM_TOKENS_PER_MINUTE: Optional[int] = Field(None, description="Provider TPM quota")
+
+    # --- Batch jobs ---
+    BATCH_CONCURRENCY: int = 8
+    BATCH_MAX_CONCURRENCY: int = 64
+    BATCH_PROGRESS_DIR: str = ".batch_progress"
+
+    # --- Cost estimation (USD per 1K tokens) ---
+    LLM_PROMPT_COST_PER_1K: float = 0.0
+    LLM_COMPLETION_COST_PER_1K: float = 0.0
+
+    # --- Multi-provider routing (JSON list of EndpointConfig, in priority order) ---
+    LLM_ENDPOINTS: List[EndpointConfig] = Field(default_factory=list, description="Endpoints for hedging / failover")
+    HEDGE_PERCENTILE: float = 95.0
+    HEDGE_DELAY_SECONDS: float = 2.0 # Used until an endpoint has enough latency samples
+    ENDPOINT_FAILURE_THRESHOLD: int = 3
+    ENDPOINT_COOLDOWN_SECONDS: float = 30.0
+
+    # --- Auto routing ---
+    ROUTER_MODEL: Optional[str] = Field(None, description="Small model used to classify ambiguous requests")
+    ROUTER_MAX_SIMPLE_WORDS: int = 40
+    ROUTER_MIN_COMPLEX_WORDS: int = 200
+
+    # --- Refine loop budgets ---
+    REFINE_MAX_ITERATIONS: int = 2
+    REFINE_MAX_ITERATIONS_CAP: int = 10 # Upper bound for a request's max_iterations
+    REFINE_TOKEN_BUDGET: int = 20000
+    REFINE_DEADLINE_SECONDS: float = 45.0
+
+    # --- Plan execution ---
+    PLAN_MAX_STEPS: int = 8
+    PLAN_MAX_PARALLEL: int = 4
+
+    # --- Shared cache across worker processes (SQLite, WAL) ---
+    SHARED_CACHE_PATH: Optional[str] = None # e.g. ".cache/shared.sqlite3"; disabled when unset
+    SHARED_CACHE_TTL_SECONDS: Optional[float] = 86400.0 # LLM responses and tool results; embeddings never expire
+    SHARED_CACHE_LLM_RESPONSES: bool = True
+
+    # --- Multi-worker server (src/api/server.py) ---
+    API_WORKERS: int = 1
+    WORKER_MEMORY_REPORT_SECONDS: float = 60.0
+
+    # --- python_repl sandbox (pre-warmed worker subprocesses) ---
+    SANDBOX_WORKERS: int = 2
+    SANDBOX_TIMEOUT_SECONDS: float = 10.0 # Wall clock; the worker is killed and replaced after this
+    SANDBOX_CPU_SECONDS: float = 5.0
+    SANDBOX_MEMORY_MB: int = 512
+    SANDBOX_MAX_OUTPUT_CHARS: int = 20000
+    SANDBOX_MAX_CALLS_PER_WORKER: int = 100
+
+    # --- Structured output ---
+    STRUCTURED_MAX_REPAIRS: int = 1 # Follow-up calls that re-request only the invalid fields
+
     model_config = SettingsConfigDict(
         env_file=".env", 
         env_file_encoding="utf-8",
@@ -1,13 +1,240 @@
 """
 Prompt Templates using LangChain
+
+Templates are registered as factories and built on first access, so importing this
+module does not import langchain_core.prompts or construct any template:
+
+    from src.llm.prompts import QA_PROMPT   # built here, then cached
+    get_prompt("QA_PROMPT")                 # same object
+
+Hot paths use compiled templates instead: the template string is parsed once into
+literal and variable segments, static parts (e.g. system prompts) are rendered
+once, and formatting is a single join without re-validation:
+
+    get_compiled_prompt("QA_PROMPT").format_messages(context=..., question=...)
 """
-from langchain_core.prompts import (
-    ChatPromptTemplate,
-    MessagesPlaceholder,
-    PromptTemplate,
-    SystemMessagePromptTemplate,
-    HumanMessagePromptTemplate
-)
+import string
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+    from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
+
+
+# ============================================================================
+# LAZY REGISTRY
+# ============================================================================
+
+_PROMPT_FACTORIES: Dict[str, Callable[[], Any]] = {}
+_PROMPTS: Dict[str, Any] = {}
+_COMPILED: Dict[str, Any] = {}
+
+
+def register_prompt(name: str):
+    """Register a factory that builds the named template on first use"""
+    def decorator(factory: Callable[[], Any]) -> Callable[[], Any]:
+        _PROMPT_FACTORIES[name] = factory
+        _PROMPTS.pop(name, None)
+        _COMPILED.pop(name, None)
+        return factory
+    return decorator
+
+
+def get_prompt(name: str):
+    """Return the named template, building it on first access"""
+    if name not in _PROMPTS:
+        try:
+            factory = _PROMPT_FACTORIES[name]
+        except KeyError:
+            raise KeyError(f"Unknown prompt: {name}")
+        _PROMPTS[name] = factory()
+    return _PROMPTS[name]
+
+
+def available_prompts() -> List[str]:
+    return sorted(_PROMPT_FACTORIES)
+
+
+def __getattr__(name: str):
+    # Module-level access (e.g. `from src.llm.prompts import QA_PROMPT`)
+    if name in _PROMPT_FACTORIES:
+        return get_prompt(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ============================================================================
+# COMPILED TEMPLATES
+# ============================================================================
+
+_FORMATTER = string.Formatter()
+
+
+class CompiledTemplate:
+    """
+    An f-string style template ("Context: {context}") parsed once.
+    Fields with a conversion, format spec or attribute/index access use str.format.
+    """
+    __slots__ = ("template", "variables", "static_text", "_parts", "_slots", "_simple")
+
+    def __init__(self, template: str):
+        self.template = template
+        parts: List[str] = []
+        slots: List[Tuple[int, str]] = []
+        simple = True
+        for literal, field, format_spec, conversion in _FORMATTER.parse(template):
+            if literal:
+                parts.append(literal)
+            if field is None:
+                continue
+            if format_spec or conversion or not field.isidentifier():
+                simple = False
+            slots.append((len(parts), field))
+            parts.append("")
+        self.variables: FrozenSet[str] = frozenset(
+            name.split(".")[0].split("[")[0] for _, name in slots
+        )
+        self._parts = parts
+        self._slots = slots
+        self._simple = simple
+        # Rendered text of a template without variables ("{{" already unescaped)
+        self.static_text: Optional[str] = "".join(parts) if not slots else None
+
+    @property
+    def is_static(self) -> bool:
+        return not self._slots
+
+    def format(self, **kwargs: Any) -> str:
+        if not self._simple:
+            return self.template.format(**kwargs)
+        parts = self._parts.copy()
+        try:
+            for index, name in self._slots:
+                value = kwargs[name]
+                parts[index] = value if type(value) is str else str(value)
+        except KeyError as e:
+            raise KeyError(f"Missing prompt variable: {e.args[0]}") from None
+        return "".join(parts)
+
+
+def _message_classes() -> Dict[str, type]:
+    from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+    return {"system": SystemMessage, "human": HumanMessage, "ai": AIMessage}
+
+
+def _as_messages(history: Sequence[Any]) -> List["BaseMessage"]:
+    """Placeholder values may also be (role, text) tuples or strings, as in LangChain"""
+    from langchain_core.messages import BaseMessage, convert_to_messages
+    if all(isinstance(message, BaseMessage) for message in history):
+        return list(history)
+    return convert_to_messages(history)
+
+
+class CompiledChatPrompt:
+    """
+    Chat prompt of (role, template) parts; role "placeholder" inserts a list of
+    messages passed under that name (like MessagesPlaceholder).
+    Messages are built with model_construct: the content is already a str, so
+    pydantic validation would only repeat work. Static parts keep their rendered
+    text; a new message object is still returned per call since callers (and
+    LangGraph) may set ids on it.
+    """
+    def __init__(self, parts: Sequence[Tuple[str, Any]]):
+        classes = _message_classes()
+        self._parts: List[Tuple[str, Any, Any]] = []
+        variables = set()
+        for role, template in parts:
+            if role == "placeholder":
+                name, optional = template if isinstance(template, tuple) else (template, False)
+                self._parts.append(("placeholder", name, optional))
+                variables.add(name)
+                continue
+            compiled = template if isinstance(template, CompiledTemplate) else CompiledTemplate(template)
+            self._parts.append((role, compiled, classes[role]))
+            variables |= compiled.variables
+        self.input_variables = sorted(variables)
+
+    @classmethod
+    def from_messages(cls, parts: Sequence[Tuple[str, Any]]) -> "CompiledChatPrompt":
+        return cls(parts)
+
+    def format_messages(self, **kwargs: Any) -> List["BaseMessage"]:
+        messages = []
+        for role, template, target in self._parts:
+            if role == "placeholder":
+                history = kwargs.get(template)
+                if history is None and not target:
+                    raise KeyError(f"Missing prompt variable: {template}")
+                if history:
+                    messages.extend(_as_messages(history))
+            elif template.is_static:
+                messages.append(target.model_construct(content=template.static_text))
+            else:
+                messages.append(target.model_construct(content=template.format(**kwargs)))
+        return messages
+
+    def format(self, **kwargs: Any) -> str:
+        return "\n".join(f"{m.type}: {m.content}" for m in self.format_messages(**kwargs))
+
+
+def compile_prompt(prompt: Any):
+    """
+    Compiles a LangChain PromptTemplate / ChatPromptTemplate (f-string format).
+    """
+    if isinstance(prompt, (CompiledTemplate, CompiledChatPrompt)):
+        return prompt
+
+    from langchain_core.prompts import MessagesPlaceholder, PromptTemplate
+    from langchain_core.prompts.chat import (
+        AIMessagePromptTemplate,
+        HumanMessagePromptTemplate,
+        SystemMessagePromptTemplate,
+    )
+    if isinstance(prompt, PromptTemplate):
+        if prompt.template_format != "f-string" or prompt.partial_variables:
+            raise ValueError("Only plain f-string templates can be compiled")
+        return CompiledTemplate(prompt.template)
+
+    roles = {
+        SystemMessagePromptTemplate: "system",
+        HumanMessagePromptTemplate: "human",
+        AIMessagePromptTemplate: "ai",
+    }
+    if prompt.partial_variables:
+        raise ValueError("Prompts with partial variables cannot be compiled")
+    parts = []
+    for message in prompt.messages:
+        if isinstance(message, MessagesPlaceholder):
+            parts.append(("placeholder", (message.variable_name, message.optional)))
+        elif type(message) in roles and isinstance(message.prompt, PromptTemplate):
+            if message.prompt.template_format != "f-string":
+                raise ValueError("Only f-string templates can be compiled")
+            parts.append((roles[type(message)], message.prompt.template))
+        else:
+            raise ValueError(f"Cannot compile prompt part {type(message).__name__}")
+    return CompiledChatPrompt(parts)
+
+
+def get_compiled_prompt(name: str):
+    """
+    Fast-path version of a registered prompt, compiled on first access.
+    """
+    if name not in _COMPILED:
+        prompt = get_prompt(name)
+        try:
+            _COMPILED[name] = compile_prompt(prompt)
+        except ValueError:
+            # Partials, jinja2/mustache templates etc. keep the LangChain path
+            _COMPILED[name] = prompt
+    return _COMPILED[name]
+
+
+def create_compiled_prompt(
+    human_message: str,
+    system_message: Optional[str] = None,
+) -> CompiledChatPrompt:
+    """Create a compiled prompt with an optional system message"""
+    parts = [("system", system_message)] if system_message else []
+    return CompiledChatPrompt(parts + [("human", human_message)])
 
 
 # ============================================================================
@@ -26,15 +253,18 @@ SYSTEM_PROMPTS = {
 # SIMPLE PROMPTS
 # ============================================================================
 
-def create_simple_prompt(template: str) -> PromptTemplate:
+def create_simple_prompt(template: str) -> "PromptTemplate":
     """Create a simple prompt template"""
+    from langchain_core.prompts import PromptTemplate
     return PromptTemplate.from_template(template)
 
 
 # Example usage
-SUMMARIZE_PROMPT = create_simple_prompt(
-    "Summarize the following text in {style} style:\n\n{text}"
-)
+@register_prompt("SUMMARIZE_PROMPT")
+def _summarize_prompt():
+    return create_simple_prompt(
+        "Summarize the following text in {style} style:\n\n{text}"
+    )
 
 
 # ============================================================================
@@ -44,8 +274,9 @@ SUMMARIZE_PROMPT = create_simple_prompt(
 def create_chat_prompt(
     system_message: str,
     human_message: str
-) -> ChatPromptTemplate:
+) -> "ChatPromptTemplate":
     """Create a chat prompt with system and human messages"""
+    from langchain_core.prompts import ChatPromptTemplate
     return ChatPromptTemplate.from_messages([
         ("system", system_message),
         ("human", human_message)
@@ -53,28 +284,37 @@ def create_chat_prompt(
 
 
 # Task-specific prompts
-QA_PROMPT = create_chat_prompt(
-    system_message="Answer questions based on the provided context.",
-    human_message="Context: {context}\n\nQuestion: {question}"
-)
+@register_prompt("QA_PROMPT")
+def _qa_prompt():
+    return create_chat_prompt(
+        system_message="Answer questions based on the provided context.",
+        human_message="Context: {context}\n\nQuestion: {question}"
+    )
 
-EXTRACT_PROMPT = create_chat_prompt(
-    system_message="Extract structured information from text.",
-    human_message="Extract: {fields}\n\nText: {text}\n\nReturn JSON."
-)
+@register_prompt("EXTRACT_PROMPT")
+def _extract_prompt():
+    return create_chat_prompt(
+        system_message="Extract structured information from text.",
+        human_message="Extract: {fields}\n\nText: {text}\n\nReturn JSON."
+    )
 
-CLASSIFY_PROMPT = create_chat_prompt(
-    system_message="Classify text into categories.",
-    human_message="Categories: {categories}\n\nText: {text}"
-)
+@register_prompt("CLASSIFY_PROMPT")
+def _classify_prompt():
+    return create_chat_prompt(
+        system_message="Classify text into categories.",
+        human_message="Categories: {categories}\n\nText: {text}"
+    )
 
 
 # ============================================================================
 # AGENT PROMPTS
 # ============================================================================
 
-REACT_AGENT_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", """You are an AI agent that can use tools.
+@register_prompt("REACT_AGENT_PROMPT")
+def _react_agent_prompt():
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+    return ChatPromptTemplate.from_messages([
+        ("system", """You are an AI agent that can use tools.
 
 Available tools:
 {tools}
@@ -91,37 +331,105 @@ To answer, respond with:
     "thought": "I have enough information",
     "final_answer": "complete answer"
 }}"""),
-    MessagesPlaceholder("chat_history", optional=True),
-    ("human", "{input}"),
-    MessagesPlaceholder("agent_scratchpad")
-])
+        MessagesPlaceholder("chat_history", optional=True),
+        ("human", "{input}"),
+        MessagesPlaceholder("agent_scratchpad")
+    ])
 
 
 # ============================================================================
 # RAG PROMPTS
 # ============================================================================
 
-RAG_QA_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", "Answer questions using the provided context. Cite sources with [1], [2], etc."),
-    ("human", "Context:\n{context}\n\nQuestion: {question}")
-])
+@register_prompt("RAG_QA_PROMPT")
+def _rag_qa_prompt():
+    from langchain_core.prompts import ChatPromptTemplate
+    return ChatPromptTemplate.from_messages([
+        ("system", "Answer questions using the provided context. Cite sources with [1], [2], etc."),
+        ("human", "Context:\n{context}\n\nQuestion: {question}")
+    ])
 
-CONVERSATIONAL_RAG_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", "You are a helpful assistant with access to a knowledge base."),
-    MessagesPlaceholder("chat_history", optional=True),
-    ("human", "Context:\n{context}\n\nQuestion: {question}")
-])
+@register_prompt("CONVERSATIONAL_RAG_PROMPT")
+def _conversational_rag_prompt():
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+    return ChatPromptTemplate.from_messages([
+        ("system", "You are a helpful assistant with access to a knowledge base."),
+        MessagesPlaceholder("chat_history", optional=True),
+        ("human", "Context:\n{context}\n\nQuestion: {question}")
+    ])
 
 
 # ============================================================================
 # CONVERSATION PROMPTS
 # ============================================================================
 
-CONVERSATION_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", "{system_message}"),
-    MessagesPlaceholder("chat_history"),
-    ("human", "{input}")
-])
+@register_prompt("CONVERSATION_PROMPT")
+def _conversation_prompt():
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+    return ChatPromptTemplate.from_messages([
+        ("system", "{system_message}"),
+        MessagesPlaceholder("chat_history"),
+        ("human", "{input}")
+    ])
+
+
+# ============================================================================
+# WORKFLOW NODE PROMPTS (compiled)
+# ============================================================================
+
+@register_prompt("PLANNER_PROMPT")
+def _planner_prompt():
+    return create_compiled_prompt(
+        human_message="""You are a Planner Agent.
+Break down the following user request into a step-by-step plan.
+Return ONLY a JSON object of the form:
+{{"steps": [{{"id": "1", "task": "...", "depends_on": []}}, {{"id": "2", "task": "...", "depends_on": ["1"]}}]}}
+List a step in "depends_on" only if it needs that step's output,
+so that independent steps can be worked on in parallel.
+
+Request: {request}"""
+    )
+
+@register_prompt("PLAN_STEP_PROMPT")
+def _plan_step_prompt():
+    # {inputs} is empty or starts with a blank line
+    return create_compiled_prompt(
+        system_message="You are working on one step of a larger task.\n\nOverall request: {request}{inputs}",
+        human_message="{task}",
+    )
+
+@register_prompt("EVALUATOR_PROMPT")
+def _evaluator_prompt():
+    return create_compiled_prompt(
+        human_message="""You are an Evaluator Agent.
+Critique the following response for accuracy, safety, and completeness.
+
+Response: {response}"""
+    )
+
+@register_prompt("JUDGE_PROMPT")
+def _judge_prompt():
+    return create_compiled_prompt(
+        human_message="""You are a Judge Agent.
+Based on the original response and the critique, decide whether the response
+needs another revision, then provide the final, polished answer.
+Start with a single line: "VERDICT: PASS" if the critique found no significant
+problems, or "VERDICT: REVISE" if it did.
+
+Original Response: {response}
+Critique: {critique}"""
+    )
+
+@register_prompt("ROUTER_PROMPT")
+def _router_prompt():
+    return create_compiled_prompt(
+        human_message="""Classify the following user request.
+Reply SIMPLE if it can be answered directly in one step.
+Reply COMPLEX if it needs planning, multiple steps, or careful review.
+Reply with exactly one word.
+
+Request: {request}"""
+    )
 
 
 # # Usage Examples
@@ -0,0 +1,278 @@
+"""
+Client-side limits for calls to the LLM provider.
+
+All provider traffic from get_llm/get_embeddings goes through shared httpx clients
+whose transports enforce, per process:
+- a cap on in-flight LLM calls (MAX_CONCURRENT_LLM_CALLS),
+- token buckets matching the provider's RPM / TPM quotas
+  (LLM_REQUESTS_PER_MINUTE / LLM_TOKENS_PER_MINUTE).
+"""
+import asyncio
+import threading
+import time
+import weakref
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Optional, Union
+
+import httpx
+
+from src.llm.config import settings
+
+# Rough prompt-size estimate used to charge the TPM bucket before the call
+CHARS_PER_TOKEN = 4
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `capacity` per `period` seconds.
+    """
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, amount: float = 1.0) -> float:
+        """
+        Takes `amount` tokens if available and returns 0.
+        Otherwise returns the seconds to wait before retrying.
+        Requests larger than the capacity are admitted once the bucket is full.
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    def acquire(self, amount: float = 1.0) -> None:
+        while (wait := self.try_acquire(amount)) > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, amount: float = 1.0) -> None:
+        while (wait := self.try_acquire(amount)) > 0:
+            await asyncio.sleep(wait)
+
+
+class SlotPool:
+    """
+    Counting semaphore shared by threads and event loops. A released slot is
+    handed to the oldest waiter: threads wait on an Event, coroutines await a
+    future on their own loop, so the event loop is never blocked or polled.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self._free = size
+        self._lock = threading.Lock()
+        self._waiters: Deque[Union[threading.Event, asyncio.Future]] = deque()
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        event.wait()
+
+    async def aacquire(self) -> None:
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if future in self._waiters:
+                    self._waiters.remove(future)
+                    raise
+            # The slot was already handed over: pass it on (or _wake does, if
+            # the future was cancelled before the hand-over ran)
+            if not future.cancelled():
+                self.release()
+            raise
+
+    @staticmethod
+    def _wake(future: asyncio.Future, pool: "SlotPool") -> None:
+        if future.cancelled():
+            pool.release()
+        else:
+            future.set_result(None)
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                    return
+                try:
+                    waiter.get_loop().call_soon_threadsafe(self._wake, waiter, self)
+                    return
+                except RuntimeError:
+                    continue # Its event loop is closed
+            self._free += 1
+
+
+class ProviderLimiter:
+    """
+    Concurrency cap plus RPM/TPM buckets shared by the sync and async transports.
+    """
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ):
+        self._slots = SlotPool(max_concurrent) if max_concurrent else None
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    @classmethod
+    def from_settings(cls) -> "ProviderLimiter":
+        return cls(
+            max_concurrent=settings.MAX_CONCURRENT_LLM_CALLS,
+            requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+        )
+
+    @staticmethod
+    def estimate_tokens(request: httpx.Request) -> int:
+        return max(len(request.content) // CHARS_PER_TOKEN, 1)
+
+    def acquire(self, request: httpx.Request) -> None:
+        if self.requests:
+            self.requests.acquire()
+        if self.tokens:
+            self.tokens.acquire(self.estimate_tokens(request))
+        if self._slots:
+            self._slots.acquire()
+
+    async def aacquire(self, request: httpx.Request) -> None:
+        if self.requests:
+            await self.requests.aacquire()
+        if self.tokens:
+            await self.tokens.aacquire(self.estimate_tokens(request))
+        if self._slots:
+            await self._slots.aacquire()
+
+    def release(self) -> None:
+        if self._slots:
+            self._slots.release()
+
+
+class _ReleasingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Response body wrapper that frees the concurrency slot once the body is closed,
+    so streamed completions hold their slot until the last token.
+    """
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    def _release_once(self) -> None:
+        if not self._released:
+            self._released = True
+            self._release()
+
+    def __iter__(self):
+        yield from self._stream
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._release_once()
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release_once()
+
+
+class LimitedTransport(httpx.BaseTransport):
+    def __init__(self, limiter: ProviderLimiter, transport: Optional[httpx.BaseTransport] = None):
+        self.limiter = limiter
+        self.transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.limiter.acquire(request)
+        try:
+            response = self.transport.handle_request(request)
+        except BaseException:
+            self.limiter.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, self.limiter.release)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncLimitedTransport(httpx.AsyncBaseTransport):
+    def __init__(self, limiter: ProviderLimiter, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.limiter = limiter
+        self.transport = transport
+        # Connection pools are bound to an event loop, so keep one per loop
+        self._per_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncBaseTransport]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _transport(self) -> httpx.AsyncBaseTransport:
+        if self.transport is not None:
+            return self.transport
+        loop = asyncio.get_running_loop()
+        if loop not in self._per_loop:
+            self._per_loop[loop] = httpx.AsyncHTTPTransport()
+        return self._per_loop[loop]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.aacquire(request)
+        try:
+            response = await self._transport().handle_async_request(request)
+        except BaseException:
+            self.limiter.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, self.limiter.release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport().aclose()
+
+
+@lru_cache(maxsize=1)
+def get_limiter() -> ProviderLimiter:
+    return ProviderLimiter.from_settings()
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """
+    Process-wide sync client for provider calls (connection pooling + limits).
+    """
+    return httpx.Client(transport=LimitedTransport(get_limiter()), timeout=settings.TIMEOUT_SECONDS)
+
+
+@lru_cache(maxsize=1)
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Process-wide async client for provider calls (connection pooling + limits).
+    """
+    return httpx.AsyncClient(transport=AsyncLimitedTransport(get_limiter()), timeout=settings.TIMEOUT_SECONDS)
@@ -0,0 +1,318 @@
+"""
+Multi-endpoint LLM routing with health tracking, hedged requests and failover.
+
+With LLM_ENDPOINTS configured, get_llm() returns a HedgedChatModel that:
+- sends each call to the first healthy endpoint (in configured priority order),
+- fires one duplicate ("hedged") request at the next endpoint when the primary is
+  slower than its own HEDGE_PERCENTILE latency, keeps the first answer and cancels
+  the loser,
+- fails over to the next endpoint on errors, and marks an endpoint unhealthy for
+  ENDPOINT_COOLDOWN_SECONDS after ENDPOINT_FAILURE_THRESHOLD consecutive failures.
+
+Streaming calls are not hedged: tokens come from the first healthy endpoint, with
+failover only until the first chunk has been produced.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import ConfigDict
+
+from src.llm.config import settings, EndpointConfig
+from src.utils.exceptions import ConfigurationError, LLMGenerationError
+from src.utils.metrics import counter, histogram, percentile
+
+ENDPOINT_LATENCY = histogram(
+    "llm_endpoint_latency_seconds", "Latency of successful calls per LLM endpoint", labels=("endpoint",)
+)
+ENDPOINT_ERRORS = counter("llm_endpoint_errors_total", "Failed calls per LLM endpoint", labels=("endpoint",))
+HEDGES = counter("llm_hedged_requests_total", "Hedged duplicate requests and which side won", labels=("endpoint", "outcome"))
+
+
+class BackgroundLoop:
+    """
+    Event loop in a daemon thread. The sync path runs its hedged calls here,
+    because a thread blocked in a sync HTTP call cannot be cancelled while a
+    task can (which closes the loser's connection).
+    """
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # A forked worker inherits the loop object but not its thread
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                threading.Thread(target=self._loop.run_forever, name="llm-hedge", daemon=True).start()
+            return self._loop
+
+    def run(self, coro):
+        """
+        Runs the coroutine on the loop and blocks until it finishes.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
+
+_BACKGROUND_LOOP = BackgroundLoop()
+
+
+class EndpointStats:
+    """
+    Rolling latency window and health state for one endpoint.
+    """
+    def __init__(self, name: str, window: int = 200):
+        self.name = name
+        self.latencies: deque = deque(maxlen=window)
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+    def record_success(self, latency: Optional[float]) -> None:
+        """
+        `latency` is None for calls whose duration says nothing about the hedge
+        delay (streams), which only update the health state.
+        """
+        with self._lock:
+            if latency is not None:
+                self.latencies.append(latency)
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.unhealthy_until = 0.0
+        if latency is not None:
+            ENDPOINT_LATENCY.observe(latency, endpoint=self.name)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= settings.ENDPOINT_FAILURE_THRESHOLD:
+                self.unhealthy_until = time.monotonic() + settings.ENDPOINT_COOLDOWN_SECONDS
+        ENDPOINT_ERRORS.inc(endpoint=self.name)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            samples = list(self.latencies)
+        return percentile(samples, pct)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "samples": len(self.latencies),
+            "p50_seconds": self.percentile(50),
+            "p95_seconds": self.percentile(95),
+            "p99_seconds": self.percentile(99),
+        }
+
+
+_STATS: Dict[str, EndpointStats] = {}
+
+
+def get_stats(name: str) -> EndpointStats:
+    if name not in _STATS:
+        _STATS[name] = EndpointStats(name)
+    return _STATS[name]
+
+
+def endpoint_stats() -> List[Dict[str, Any]]:
+    """
+    Per-endpoint latency and health, for the API / dashboards.
+    """
+    return [stats.snapshot() for stats in _STATS.values()]
+
+
+class HedgedChatModel(BaseChatModel):
+    """
+    Chat model that spreads one logical call over several OpenAI-compatible endpoints.
+    """
+    clients: List[Any]
+    names: List[str]
+    hedge_percentile: float = 95.0
+    hedge_delay: float = 2.0
+    min_hedge_delay: float = 0.05
+    min_samples: int = 20
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @classmethod
+    def from_endpoints(cls, endpoints: List[EndpointConfig], **llm_kwargs) -> "HedgedChatModel":
+        """
+        Builds one ChatOpenAI per endpoint. Client-side retries are disabled because
+        failover to the next endpoint replaces them.
+        """
+        from langchain_openai import ChatOpenAI
+        from src.llm.rate_limit import get_async_http_client
+
+        callbacks = llm_kwargs.pop("callbacks", None)
+        # Async calls run on the caller's loop and on the background loop, so the
+        # client needs its per-loop connection pools
+        llm_kwargs.setdefault("http_async_client", get_async_http_client())
+        clients = []
+        for endpoint in endpoints:
+            api_key = endpoint.api_key or settings.API_KEY
+            if api_key is None:
+                raise ConfigurationError(
+                    f"No API key for LLM endpoint '{endpoint.name}'",
+                    details="Set api_key in LLM_ENDPOINTS or API_KEY",
+                )
+            clients.append(ChatOpenAI(
+                model=endpoint.model,
+                base_url=endpoint.base_url,
+                api_key=api_key.get_secret_value(),
+                **{**llm_kwargs, "max_retries": 0},
+            ))
+        return cls(
+            clients=clients,
+            names=[endpoint.name for endpoint in endpoints],
+            hedge_percentile=settings.HEDGE_PERCENTILE,
+            hedge_delay=settings.HEDGE_DELAY_SECONDS,
+            callbacks=callbacks,
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return "hedged-openai"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _order(self) -> List[int]:
+        """
+        Healthy endpoints in priority order, then unhealthy ones as a last resort.
+        """
+        indexes = range(len(self.clients))
+        healthy = [i for i in indexes if get_stats(self.names[i]).healthy]
+        return healthy + [i for i in indexes if i not in healthy]
+
+    def _delay_for(self, index: int) -> float:
+        stats = get_stats(self.names[index])
+        if len(stats.latencies) < self.min_samples:
+            return self.hedge_delay
+        return max(stats.percentile(self.hedge_percentile), self.min_hedge_delay)
+
+    def _combine_llm_output(self, llm_outputs):
+        return self.clients[0]._combine_llm_output(llm_outputs)
+
+    # ---------- sync path
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        """
+        Runs the async implementation on the background loop, so the hedged
+        loser is cancelled instead of running to completion in a thread.
+        """
+        return _BACKGROUND_LOOP.run(self._agenerate(messages, stop=stop, **kwargs))
+
+    # ---------- async path
+    async def _acall(self, index: int, messages, stop, **kwargs) -> ChatResult:
+        stats = get_stats(self.names[index])
+        started = time.perf_counter()
+        try:
+            result = await self.clients[index]._agenerate(messages, stop=stop, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stats.record_failure()
+            raise
+        stats.record_success(time.perf_counter() - started)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        order = self._order()
+        pending: Dict[asyncio.Task, int] = {}
+        errors: List[str] = []
+        launched = 0
+        hedged = False
+
+        def launch():
+            nonlocal launched
+            index = order[launched]
+            launched += 1
+            pending[asyncio.ensure_future(self._acall(index, messages, stop, **kwargs))] = index
+
+        launch()
+        try:
+            while pending:
+                can_hedge = not hedged and len(pending) == 1 and launched < len(order)
+                timeout = self._delay_for(order[0]) if can_hedge else None
+                done, _ = await asyncio.wait(list(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    launch()
+                    continue
+
+                for task in done:
+                    index = pending.pop(task)
+                    if task.exception() is not None:
+                        errors.append(f"{self.names[index]}: {task.exception()}")
+                        continue
+                    if hedged:
+                        outcome = "primary_won" if index == order[0] else "hedge_won"
+                        HEDGES.inc(endpoint=self.names[index], outcome=outcome)
+                    return task.result()
+
+                if not pending and launched < len(order):
+                    launch()
+        finally:
+            # Cancel the hedged loser (or everything, if we were cancelled ourselves)
+            for task in pending:
+                task.cancel()
+
+        raise LLMGenerationError("All LLM endpoints failed", details="; ".join(errors))
+
+    # ---------- streaming path (primary endpoint, no hedging)
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        errors: List[str] = []
+        for index in self._order():
+            stats = get_stats(self.names[index])
+            yielded = False
+            try:
+                for chunk in self.clients[index]._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    yielded = True
+                    yield chunk
+            except Exception as e:
+                stats.record_failure()
+                if yielded:
+                    raise
+                errors.append(f"{self.names[index]}: {e}")
+                continue
+            stats.record_success(None)
+            return
+        raise LLMGenerationError("All LLM endpoints failed", details="; ".join(errors))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        errors: List[str] = []
+        for index in self._order():
+            stats = get_stats(self.names[index])
+            yielded = False
+            try:
+                async for chunk in self.clients[index]._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    yielded = True
+                    yield chunk
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.record_failure()
+                if yielded:
+                    raise
+                errors.append(f"{self.names[index]}: {e}")
+                continue
+            stats.record_success(None)
+            return
+        raise LLMGenerationError("All LLM endpoints failed", details="; ".join(errors))
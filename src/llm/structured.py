@@ -0,0 +1,297 @@
+"""
+Structured output: prompt templates -> streamed JSON -> validated Pydantic models.
+
+    result = generate_structured(get_compiled_prompt("CLASSIFY_PROMPT").format_messages(...), model)
+    result.value  # validated model instance
+
+The response is streamed in JSON mode and parsed incrementally, so `on_field` sees
+each top-level field as soon as it is complete. When validation fails, only the
+missing or invalid fields are requested again (up to STRUCTURED_MAX_REPAIRS times)
+instead of regenerating the whole object.
+"""
+import inspect
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Literal, Optional, Set, Type
+
+from loguru import logger
+from pydantic import BaseModel, Field, ValidationError, create_model
+
+from src.llm.config import settings
+from src.utils.exceptions import LLMGenerationError
+from src.utils.json_stream import StreamingJSONParser, repair_json
+
+FieldCallback = Callable[[str, Any], Any]
+
+
+@dataclass
+class StructuredResult:
+    value: Optional[BaseModel]
+    raw: str
+    # Every LLM response involved (first call + repairs), for token accounting
+    responses: List[Any] = field(default_factory=list)
+    repaired_fields: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+# ============================================================================
+# SCHEMAS FOR THE REGISTERED PROMPTS
+# ============================================================================
+
+def extraction_model(fields: List[str]) -> Type[BaseModel]:
+    """
+    Model for EXTRACT_PROMPT: one nullable string per requested field.
+    """
+    definitions = {
+        f"field_{i}": (Optional[str], Field(..., alias=name))
+        for i, name in enumerate(fields)
+    }
+    return create_model("Extraction", **definitions)
+
+
+def classification_model(categories: List[str]) -> Type[BaseModel]:
+    """
+    Model for CLASSIFY_PROMPT: the category must be one of `categories`.
+    """
+    return create_model(
+        "Classification",
+        category=(Literal[tuple(categories)], ...),
+        confidence=(Optional[float], None),
+    )
+
+
+# ============================================================================
+# PROMPT PLUMBING
+# ============================================================================
+
+def format_instructions(schema: Dict[str, Any]) -> str:
+    return (
+        "Respond with ONLY a JSON object (no prose, no code fences) matching this JSON schema:\n"
+        + json.dumps(schema, separators=(",", ":"))
+    )
+
+
+def with_format_instructions(messages: list, model: Type[BaseModel]) -> list:
+    """
+    Appends the schema to the system message (or adds one).
+    """
+    from langchain_core.messages import SystemMessage
+
+    instructions = format_instructions(model.model_json_schema())
+    if messages and isinstance(messages[0], SystemMessage):
+        return [SystemMessage(content=f"{messages[0].content}\n\n{instructions}")] + list(messages[1:])
+    return [SystemMessage(content=instructions)] + list(messages)
+
+
+def sub_schema(model: Type[BaseModel], names: Set[str]) -> Dict[str, Any]:
+    """
+    JSON schema of `model` restricted to the given top-level properties.
+    """
+    schema = model.model_json_schema()
+    restricted = {
+        "type": "object",
+        "properties": {k: v for k, v in schema.get("properties", {}).items() if k in names},
+        "required": sorted(names),
+    }
+    if "$defs" in schema:
+        restricted["$defs"] = schema["$defs"]
+    return restricted
+
+
+def repair_messages(messages: list, raw: str, model: Type[BaseModel], failing: Set[str]) -> list:
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    return list(messages) + [
+        AIMessage(content=raw),
+        HumanMessage(content=(
+            f"These fields were missing or invalid: {', '.join(sorted(failing))}.\n"
+            "Return ONLY a JSON object with just these fields, matching this JSON schema:\n"
+            + json.dumps(sub_schema(model, failing), separators=(",", ":"))
+        )),
+    ]
+
+
+def property_names(model: Type[BaseModel]) -> Set[str]:
+    return set(model.model_json_schema().get("properties", {}))
+
+
+# ============================================================================
+# PARSING / VALIDATION
+# ============================================================================
+
+def collect_fields(parser: StreamingJSONParser) -> Dict[str, Any]:
+    """
+    Fields from the streaming parser, completed by a repair pass if the object
+    was truncated or never properly opened.
+    """
+    if parser.done:
+        return dict(parser.fields)
+    repaired = repair_json(parser.text) or {}
+    return {**repaired, **parser.fields}
+
+
+def validate(model: Type[BaseModel], data: Dict[str, Any], parse_errors: Set[str]):
+    """
+    Returns (instance, set()) on success or (None, failing top-level fields).
+    """
+    try:
+        return model.model_validate(data), set()
+    except ValidationError as e:
+        failing = set(parse_errors)
+        for error in e.errors():
+            if not error["loc"]:
+                return None, property_names(model)
+            failing.add(str(error["loc"][0]))
+        return None, failing & property_names(model) or property_names(model)
+
+
+def parse_text(text: str) -> StreamingJSONParser:
+    parser = StreamingJSONParser()
+    parser.feed(text)
+    return parser
+
+
+class _Attempt:
+    """
+    Shared state of one structured generation across the first call and repairs.
+    """
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.data: Dict[str, Any] = {}
+        self.raw = ""
+        self.responses: List[Any] = []
+        self.repaired: List[str] = []
+        self.failing: Set[str] = set()
+        self.value: Optional[BaseModel] = None
+
+    def absorb(self, parser: StreamingJSONParser, response, repair: bool = False) -> None:
+        self.responses.append(response)
+        fields = collect_fields(parser)
+        if repair:
+            self.repaired.extend(sorted(self.failing & set(fields)))
+            for name in self.failing:
+                self.data.pop(name, None)
+            self.data.update({k: v for k, v in fields.items() if k in self.failing})
+        else:
+            self.raw = parser.text
+            self.data = fields
+        self.value, self.failing = validate(self.model, self.data, set(parser.errors))
+
+    def result(self, strict: bool) -> StructuredResult:
+        error = None
+        if self.value is None:
+            error = f"Invalid fields after {len(self.responses)} call(s): {', '.join(sorted(self.failing))}"
+            if strict:
+                raise LLMGenerationError("Structured output failed validation", details=error)
+            logger.warning(error)
+        return StructuredResult(self.value, self.raw, self.responses, self.repaired, error)
+
+
+def _combine(response, chunk):
+    return chunk if response is None else response + chunk
+
+
+# ============================================================================
+# GENERATION
+# ============================================================================
+
+def generate_structured(
+    messages: list,
+    model: Type[BaseModel],
+    llm=None,
+    on_field: Optional[FieldCallback] = None,
+    max_repairs: Optional[int] = None,
+    strict: bool = True,
+) -> StructuredResult:
+    """
+    Streams a JSON response for `messages` and validates it into `model`.
+    With strict=False a result with value=None is returned instead of raising.
+    """
+    if llm is None:
+        from src.llm.client import get_llm
+        llm = get_llm(json_mode=True)
+    max_repairs = settings.STRUCTURED_MAX_REPAIRS if max_repairs is None else max_repairs
+    messages = with_format_instructions(messages, model)
+    attempt = _Attempt(model)
+
+    parser, response = StreamingJSONParser(), None
+    for chunk in llm.stream(messages):
+        response = _combine(response, chunk)
+        for name, value in parser.feed(chunk.content or ""):
+            if on_field:
+                on_field(name, value)
+    attempt.absorb(parser, response)
+
+    for _ in range(max_repairs):
+        if attempt.value is not None:
+            break
+        logger.debug("Re-requesting structured fields: {}", sorted(attempt.failing))
+        response = llm.invoke(repair_messages(messages, attempt.raw, model, attempt.failing))
+        attempt.absorb(parse_text(response.content or ""), response, repair=True)
+
+    return attempt.result(strict)
+
+
+async def agenerate_structured(
+    messages: list,
+    model: Type[BaseModel],
+    llm=None,
+    on_field: Optional[FieldCallback] = None,
+    max_repairs: Optional[int] = None,
+    strict: bool = True,
+) -> StructuredResult:
+    """
+    Async variant of generate_structured; `on_field` may be a coroutine function.
+    """
+    if llm is None:
+        from src.llm.client import get_llm
+        llm = get_llm(json_mode=True)
+    max_repairs = settings.STRUCTURED_MAX_REPAIRS if max_repairs is None else max_repairs
+    messages = with_format_instructions(messages, model)
+    attempt = _Attempt(model)
+
+    parser, response = StreamingJSONParser(), None
+    async for chunk in llm.astream(messages):
+        response = _combine(response, chunk)
+        for name, value in parser.feed(chunk.content or ""):
+            if on_field and inspect.isawaitable(outcome := on_field(name, value)):
+                await outcome
+    attempt.absorb(parser, response)
+
+    for _ in range(max_repairs):
+        if attempt.value is not None:
+            break
+        logger.debug("Re-requesting structured fields: {}", sorted(attempt.failing))
+        response = await llm.ainvoke(repair_messages(messages, attempt.raw, model, attempt.failing))
+        attempt.absorb(parse_text(response.content or ""), response, repair=True)
+
+    return attempt.result(strict)
+
+
+# ============================================================================
+# TEMPLATE SHORTCUTS
+# ============================================================================
+
+def extract(text: str, fields: List[str], **kwargs) -> Dict[str, Optional[str]]:
+    """
+    EXTRACT_PROMPT with a validated result keyed by the requested field names.
+    With strict=False, every field is None if the output never validated.
+    """
+    from src.llm.prompts import get_compiled_prompt
+
+    messages = get_compiled_prompt("EXTRACT_PROMPT").format_messages(fields=", ".join(fields), text=text)
+    result = generate_structured(messages, extraction_model(fields), **kwargs)
+    if result.value is None:
+        return dict.fromkeys(fields)
+    return result.value.model_dump(by_alias=True)
+
+
+def classify(text: str, categories: List[str], **kwargs) -> Optional[BaseModel]:
+    """
+    CLASSIFY_PROMPT with the category checked against `categories`.
+    With strict=False, None if the output never validated.
+    """
+    from src.llm.prompts import get_compiled_prompt
+
+    messages = get_compiled_prompt("CLASSIFY_PROMPT").format_messages(categories=", ".join(categories), text=text)
+    return generate_structured(messages, classification_model(categories), **kwargs).value
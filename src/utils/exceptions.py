@@ -24,6 +24,13 @@ class SecurityError(AgentOSError):
     """Raised by Guardrails when PII or unsafe content is detected."""
     pass
 
+class OverloadedError(AgentOSError):
+    """Raised by admission control when a request is shed instead of queued."""
+    def __init__(self, message: str, details: str = None, status_code: int = 503, retry_after: float = 1.0):
+        super().__init__(message, details)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
 # --- FastAPI Exception Handlers ---
 # You will register these in src/scaffold/main.py later
 
@@ -50,4 +57,18 @@ async def security_exception_handler(request: Request, exc: SecurityError):
             "error": "SecurityViolation",
             "message": exc.message
         },
-    )
\ No newline at end of file
+    )
+
+async def overloaded_exception_handler(request: Request, exc: OverloadedError):
+    """
+    Fast 429/503 with a Retry-After hint when the server sheds load.
+    """
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "error": "Overloaded",
+            "message": exc.message,
+            "details": exc.details
+        },
+        headers={"Retry-After": str(max(int(round(exc.retry_after)), 1))},
+    )
@@ -0,0 +1,149 @@
+"""
+Incremental JSON parsing for streamed LLM output.
+
+StreamingJSONParser is fed text chunks as they arrive and reports each top-level
+field of the JSON object as soon as its value is complete, so callers can act on
+early fields before generation finishes. Fields whose value is not valid JSON are
+kept in `errors` instead of failing the whole object.
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+# A key (with or without its colon) cut off before its value
+DANGLING_KEY = re.compile(r'(?<=[{,])\s*"(?:[^"\\]|\\.)*"\s*:?\s*$')
+
+
+class StreamingJSONParser:
+    """
+    Tracks string/escape state and nesting depth over the accumulated text;
+    only the top level of the first JSON object is split into fields.
+    """
+    def __init__(self):
+        self.text = ""
+        self.fields: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+        self.started = False
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = "key" # key -> key_string -> colon -> value
+        self._key: Optional[str] = None
+        self._key_start = 0
+        self._value_start = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Adds a chunk and returns the (key, value) pairs completed by it.
+        """
+        self.text += chunk
+        completed = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            if self.done:
+                break
+            c = text[i]
+            if not self.started:
+                if c == "{":
+                    self.started = True
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == "key_string":
+                        self._key = json.loads(text[self._key_start:i + 1])
+                        self._expect = "colon"
+                continue
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == "key":
+                    self._key_start = i
+                    self._expect = "key_string"
+            elif c == ":" and self._depth == 1 and self._expect == "colon":
+                self._value_start = i + 1
+                self._expect = "value"
+            elif c in "{[":
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    if self._expect == "value":
+                        self._finish_value(text[self._value_start:i], completed)
+                    self.done = True
+            elif c == "," and self._depth == 1 and self._expect == "value":
+                self._finish_value(text[self._value_start:i], completed)
+                self._expect = "key"
+        self._pos = len(text)
+        return completed
+
+    def _finish_value(self, raw: str, completed: List[Tuple[str, Any]]) -> None:
+        raw = raw.strip()
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            self.errors[self._key] = raw
+            return
+        self.fields[self._key] = value
+        self.errors.pop(self._key, None)
+        completed.append((self._key, value))
+
+
+def close_json(text: str) -> str:
+    """
+    Closes an unterminated string and any open brackets at the end of `text`.
+    """
+    stack, in_string, escape = [], False, False
+    for c in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in "{[":
+            stack.append("}" if c == "{" else "]")
+        elif c in "}]" and stack:
+            stack.pop()
+    if in_string:
+        text += '"'
+    text = text.rstrip()
+    if stack and stack[-1] == "}":
+        text = DANGLING_KEY.sub("", text).rstrip()
+    text = text.rstrip(",")
+    return text + "".join(reversed(stack))
+
+
+def repair_json(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Best-effort parse of a JSON object from model output: strips code fences and
+    surrounding prose, trailing commas and truncation. Returns None if it fails.
+    """
+    text = CODE_FENCE.sub("", text.strip())
+    start = text.find("{")
+    if start < 0:
+        return None
+    text = text[start:]
+    end = text.rfind("}")
+    candidates = [text[:end + 1]] if end >= 0 else []
+    candidates.append(close_json(text))
+    for candidate in candidates:
+        for attempt in (candidate, TRAILING_COMMA.sub(r"\1", candidate)):
+            try:
+                value = json.loads(attempt)
+            except ValueError:
+                continue
+            if isinstance(value, dict):
+                return value
+    return None
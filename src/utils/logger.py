@@ -1,28 +1,83 @@
 import sys
+import random
 import logging
+from typing import TYPE_CHECKING, Dict, Optional
 from loguru import logger
 from src.llm.config import settings
+from src.utils.metrics import counter
+
+if TYPE_CHECKING:
+    from src.llm.rate_limit import TokenBucket
+
+LOGS_DROPPED = counter("log_records_dropped_total", "Log records dropped by sampling or rate limiting", labels=("reason",))
+
+# Records at or above this level are never sampled or rate limited
+ALWAYS_KEEP_LEVEL = logging.WARNING
 
 class InterceptHandler(logging.Handler):
     """
     Redirects standard logging messages (from libraries) to Loguru.
+    The stdlib record already knows its origin, so no stack walk is needed.
     """
+    _levels: Dict[int, str] = {}
+
     def emit(self, record):
         # Get corresponding Loguru level if it exists
-        try:
-            level = logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
-
-        # Find caller from where originated the logged message
-        frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
-            frame = frame.f_back
-            depth += 1
-
-        logger.opt(depth=depth, exception=record.exc_info).log(
-            level, record.getMessage()
-        )
+        level = self._levels.get(record.levelno)
+        if level is None:
+            try:
+                level = logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno
+            self._levels[record.levelno] = level
+
+        logger.patch(
+            lambda r: r.update(name=record.name, function=record.funcName, line=record.lineno)
+        ).opt(exception=record.exc_info).log(level, record.getMessage())
+
+class SamplingFilter:
+    """
+    Loguru filter for hot paths: keeps a fraction of low-level records per logger
+    (LOG_SAMPLE_RATES, by module prefix) and caps each logger at
+    LOG_RATE_LIMIT_PER_SECOND records. Warnings and errors always pass.
+    """
+    def __init__(self, sample_rates: Optional[Dict[str, float]] = None, rate_limit: Optional[float] = None):
+        self.sample_rates = sample_rates or {}
+        self.rate_limit = rate_limit
+        self._rates: Dict[str, float] = {}
+        self._buckets: Dict[str, "TokenBucket"] = {}
+
+    @classmethod
+    def from_settings(cls) -> Optional["SamplingFilter"]:
+        if not settings.LOG_SAMPLE_RATES and not settings.LOG_RATE_LIMIT_PER_SECOND:
+            return None
+        return cls(settings.LOG_SAMPLE_RATES, settings.LOG_RATE_LIMIT_PER_SECOND)
+
+    def _rate_for(self, name: str) -> float:
+        if name not in self._rates:
+            # Longest matching module prefix wins
+            matches = [p for p in self.sample_rates if name == p or name.startswith(p + ".")]
+            self._rates[name] = self.sample_rates[max(matches, key=len)] if matches else 1.0
+        return self._rates[name]
+
+    def _bucket_for(self, name: str):
+        if name not in self._buckets:
+            from src.llm.rate_limit import TokenBucket
+            self._buckets[name] = TokenBucket(self.rate_limit, period=1.0)
+        return self._buckets[name]
+
+    def __call__(self, record) -> bool:
+        if record["level"].no >= ALWAYS_KEEP_LEVEL:
+            return True
+        name = record["name"] or ""
+        rate = self._rate_for(name)
+        if rate < 1.0 and random.random() >= rate:
+            LOGS_DROPPED.inc(reason="sampled")
+            return False
+        if self.rate_limit and self._bucket_for(name).try_acquire() > 0:
+            LOGS_DROPPED.inc(reason="rate_limited")
+            return False
+        return True
 
 def setup_logging():
     """
@@ -31,29 +86,45 @@ def setup_logging():
     # 1. Remove default handlers
     logger.remove()
 
+    # Sampling / rate limiting for hot paths (None when not configured)
+    log_filter = SamplingFilter.from_settings()
+
     # 2. Determine format based on Environment
     # Development: Readable colors
     # Production: JSON structured logs (better for CloudWatch/Datadog)
+    # With LOG_ENQUEUE, sinks are written by a background thread so request
+    # handlers never block on stdout
     if settings.ENV == "production":
         logger.add(
             sys.stdout,
-            serialize=True, 
+            serialize=True,
             level=settings.LOG_LEVEL,
-            enqueue=True # Async safe
+            filter=log_filter,
+            enqueue=settings.LOG_ENQUEUE
         )
     else:
         logger.add(
             sys.stdout,
             format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
             level=settings.LOG_LEVEL,
+            filter=log_filter,
+            enqueue=settings.LOG_ENQUEUE,
             colorize=True
         )
 
     # 3. Intercept standard library logs (e.g. uvicorn, langchain)
-    logging.basicConfig(handlers=[InterceptHandler()], level=0)
-    
+    # The root level drops disabled records in the library before a LogRecord is built
+    stdlib_level = logger.level((settings.LOG_STDLIB_LEVEL or settings.LOG_LEVEL).upper()).no
+    logging.basicConfig(handlers=[InterceptHandler()], level=stdlib_level, force=True)
+
     # Silence noisy libraries if needed
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
-    
-    logger.info(f"Logger initialized in {settings.ENV} mode")
\ No newline at end of file
+
+    logger.info("Logger initialized in {} mode", settings.ENV)
+
+def shutdown_logging():
+    """
+    Flushes queued records (LOG_ENQUEUE) before the process exits.
+    """
+    logger.complete()
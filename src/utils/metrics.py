@@ -0,0 +1,265 @@
+"""
+In-process metrics registry (Prometheus-style counters and histograms).
+"""
+import bisect
+import math
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels.
+    """
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {value}"
+            for key, value in sorted(self.samples().items())
+        ]
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with optional labels.
+    """
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+    ):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = {key: (list(e[0]), e[1], e[2]) for key, e in self._values.items()}
+
+        lines = []
+        for key, (counts, total, count) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labels + ('le',), key + (le,))} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class Gauge:
+    """
+    Point-in-time values, read from `collect` at scrape time.
+    `collect` returns {label values tuple: value}.
+    """
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        collect: Callable[[], Dict[Tuple[str, ...], float]],
+        labels: Tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {value}"
+            for key, value in sorted(self.collect().items())
+        ]
+
+
+Metric = Union[Counter, Histogram, Gauge]
+
+REGISTRY: Dict[str, Metric] = {}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def percentile(samples: List[float], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of raw samples (None for an empty list).
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def counter(name: str, description: str, labels: Tuple[str, ...] = ()) -> Counter:
+    """
+    Returns the registered counter with this name, creating it on first use.
+    """
+    if name not in REGISTRY:
+        REGISTRY[name] = Counter(name, description, labels)
+    return REGISTRY[name]
+
+
+def histogram(name: str, description: str, labels: Tuple[str, ...] = (), **kwargs) -> Histogram:
+    """
+    Returns the registered histogram with this name, creating it on first use.
+    """
+    if name not in REGISTRY:
+        REGISTRY[name] = Histogram(name, description, labels, **kwargs)
+    return REGISTRY[name]
+
+
+def gauge(name: str, description: str, collect: Callable[[], Dict[Tuple[str, ...], float]], labels: Tuple[str, ...] = ()) -> Gauge:
+    """
+    Returns the registered gauge with this name, creating it on first use.
+    """
+    if name not in REGISTRY:
+        REGISTRY[name] = Gauge(name, description, collect, labels)
+    return REGISTRY[name]
+
+
+def process_memory(pid: Union[int, str] = "self") -> Dict[str, int]:
+    """
+    RSS / PSS / shared / private bytes of a process from /proc (Linux).
+    PSS splits copy-on-write pages shared with forked siblings, so summing it
+    across workers gives their real footprint; summing RSS double counts.
+    """
+    fields = {"Rss": "rss", "Pss": "pss", "Shared_Clean": "shared", "Shared_Dirty": "shared",
+              "Private_Clean": "private", "Private_Dirty": "private"}
+    memory = {"rss": 0, "pss": 0, "shared": 0, "private": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in fields:
+                    memory[fields[name]] += int(rest.split()[0]) * 1024
+    except (OSError, ValueError):
+        return {}
+    return memory
+
+
+def render_prometheus() -> str:
+    """
+    Renders every registered metric in the Prometheus text exposition format.
+    """
+    lines = []
+    for metric in REGISTRY.values():
+        lines.append(f"# HELP {metric.name} {metric.description}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# --- Process memory (per worker when running under src/api/server.py) ---
+PROCESS_MEMORY = gauge(
+    "process_memory_bytes",
+    "Memory of this worker process by kind (rss, pss, shared, private)",
+    lambda: {(str(os.getpid()), kind): value for kind, value in process_memory().items()},
+    labels=("pid", "kind"),
+)
+
+# --- Workflow routing ---
+ROUTE_DECISIONS = counter(
+    "workflow_route_decisions_total",
+    "Routing decisions taken by the auto workflow",
+    labels=("route", "method"),
+)
+
+LLM_CALLS_SAVED = counter(
+    "workflow_llm_calls_saved_total",
+    "LLM calls avoided by routing requests to the basic path (lower bound, excludes plan steps)",
+)
+
+# --- Per-node tracing ---
+NODE_WALL_SECONDS = histogram(
+    "workflow_node_wall_seconds",
+    "Wall time spent in each workflow node",
+    labels=("node",),
+)
+
+NODE_LLM_SECONDS = histogram(
+    "workflow_node_llm_seconds",
+    "Time spent waiting on LLM calls inside each workflow node",
+    labels=("node",),
+)
+
+NODE_TOKENS = histogram(
+    "workflow_node_tokens",
+    "Tokens used per workflow node execution",
+    labels=("node", "kind"),
+    buckets=(10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000),
+)
+
+NODE_COST_DOLLARS = counter(
+    "workflow_node_cost_dollars_total",
+    "Estimated LLM cost per workflow node",
+    labels=("node",),
+)
+
+NODE_ERRORS = counter(
+    "workflow_node_errors_total",
+    "Exceptions raised by workflow nodes",
+    labels=("node",),
+)
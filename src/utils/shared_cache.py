@@ -0,0 +1,164 @@
+"""
+Cross-process cache tier backed by a local SQLite database in WAL mode.
+
+All uvicorn workers started by src/api/server.py open the same file, so an LLM
+response, embedding or tool result computed by one worker is a hit for the
+others (and survives restarts). Values are bytes, keyed by (namespace, key),
+with an optional expiry time.
+
+Connections are per thread and per process: a connection inherited across
+fork() is never reused.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.llm.config import settings
+from src.utils.metrics import counter
+
+CACHE_LOOKUPS = counter("shared_cache_lookups_total", "Shared cache lookups", labels=("namespace", "outcome"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID
+"""
+
+# SQLite limits the number of bound parameters per statement
+MAX_BATCH = 500
+
+
+def make_key(*parts) -> str:
+    """
+    Stable key for arbitrary string parts (model name, prompt, query, ...).
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class SharedCache:
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.conn = self._connect()
+            local.pid = os.getpid()
+        return local.conn
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        return self.get_many(namespace, [key]).get(key)
+
+    def get_many(self, namespace: str, keys: List[str]) -> Dict[str, bytes]:
+        found: Dict[str, bytes] = {}
+        now = time.time()
+        for start in range(0, len(keys), MAX_BATCH):
+            batch = keys[start:start + MAX_BATCH]
+            rows = self.conn.execute(
+                f"SELECT key, value FROM cache WHERE namespace = ? AND key IN ({','.join('?' * len(batch))})"
+                " AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, *batch, now),
+            ).fetchall()
+            found.update(rows)
+        hits = len(found)
+        if hits:
+            CACHE_LOOKUPS.inc(hits, namespace=namespace, outcome="hit")
+        if len(keys) - hits:
+            CACHE_LOOKUPS.inc(len(keys) - hits, namespace=namespace, outcome="miss")
+        return found
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self.set_many(namespace, {key: value}, ttl)
+
+    def set_many(self, namespace: str, items: Dict[str, bytes], ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        conn = self.conn
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                [(namespace, key, sqlite3.Binary(value), expires_at) for key, value in items.items()],
+            )
+
+    def delete(self, namespace: str, keys: Iterable[str]) -> None:
+        self.conn.executemany(
+            "DELETE FROM cache WHERE namespace = ? AND key = ?", [(namespace, key) for key in keys]
+        )
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        if namespace is None:
+            self.conn.execute("DELETE FROM cache")
+        else:
+            self.conn.execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
+
+    def prune(self) -> int:
+        """
+        Deletes expired entries and returns how many were removed.
+        """
+        return self.conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def cached_call(
+        self,
+        namespace: str,
+        key: str,
+        fn: Callable[[], str],
+        ttl: Optional[float] = None,
+    ) -> str:
+        """
+        Returns the cached text for `key`, computing and storing it on a miss.
+        """
+        value = self.get(namespace, key)
+        if value is not None:
+            return value.decode("utf-8")
+        result = fn()
+        self.set(namespace, key, result.encode("utf-8"), ttl)
+        return result
+
+
+@lru_cache(maxsize=1)
+def get_shared_cache() -> Optional[SharedCache]:
+    """
+    Process-wide cache, or None unless SHARED_CACHE_PATH is configured.
+    """
+    if not settings.SHARED_CACHE_PATH:
+        return None
+    return SharedCache(settings.SHARED_CACHE_PATH)
+
+
+def cached_tool_call(namespace: str, query: str, fn: Callable[[], str]) -> str:
+    """
+    Runs a (read-only) tool through the shared cache when it is enabled.
+    """
+    cache = get_shared_cache()
+    if cache is None:
+        return fn()
+    return cache.cached_call(namespace, make_key(query), fn, ttl=settings.SHARED_CACHE_TTL_SECONDS)
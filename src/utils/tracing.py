@@ -0,0 +1,218 @@
+"""
+Per-node tracing for the workflow graph.
+
+Every node registered by WorkflowBuilder is wrapped in a span that records wall
+time, time spent inside LLM calls, prompt/completion tokens and estimated cost.
+LLM calls are attributed to the active span through a LangChain callback handler
+that get_llm attaches to every client.
+"""
+import functools
+import inspect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from loguru import logger
+
+from src.llm.config import settings
+from src.utils.metrics import (
+    NODE_WALL_SECONDS,
+    NODE_LLM_SECONDS,
+    NODE_TOKENS,
+    NODE_COST_DOLLARS,
+    NODE_ERRORS,
+)
+
+
+@dataclass
+class Span:
+    node: str
+    start: float
+    wall_time: float = 0.0
+    llm_time: float = 0.0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    error: Optional[str] = None
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+class NodeThreads:
+    """
+    Counts the sync nodes of one run that are executing in worker threads.
+    Cancelling the run does not stop those threads, so admission control waits
+    for them (wait_idle) before handing the run's slot to the next request.
+    Once closed, nodes of the abandoned run that had not started yet are skipped.
+    """
+    def __init__(self):
+        self.active = 0
+        self.closed = False
+        self._idle = threading.Condition()
+
+    def enter(self) -> None:
+        with self._idle:
+            if self.closed:
+                raise RuntimeError("Run was abandoned")
+            self.active += 1
+
+    def exit(self) -> None:
+        with self._idle:
+            self.active -= 1
+            if not self.active:
+                self._idle.notify_all()
+
+    def close(self) -> None:
+        with self._idle:
+            self.closed = True
+
+    def wait_idle(self) -> None:
+        with self._idle:
+            self._idle.wait_for(lambda: not self.active)
+
+
+# Set per run by admission control; copied into the threads that run sync nodes
+node_threads: ContextVar[Optional[NodeThreads]] = ContextVar("node_threads", default=None)
+
+
+def estimate_cost(prompt_tokens: int, completion_tokens: int) -> float:
+    return (
+        prompt_tokens * settings.LLM_PROMPT_COST_PER_1K
+        + completion_tokens * settings.LLM_COMPLETION_COST_PER_1K
+    ) / 1000
+
+
+def _token_usage(response) -> Dict[str, int]:
+    """
+    Extracts prompt/completion tokens from an LLMResult (streaming or not).
+    """
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        return {
+            "prompt": usage.get("prompt_tokens", 0),
+            "completion": usage.get("completion_tokens", 0),
+        }
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if metadata:
+                return {
+                    "prompt": metadata.get("input_tokens", 0),
+                    "completion": metadata.get("output_tokens", 0),
+                }
+    return {"prompt": 0, "completion": 0}
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    Attributes LLM latency and token usage to the span of the running node.
+    """
+    run_inline = True
+
+    def __init__(self):
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        span = _current_span.get()
+        if span is None:
+            return
+        if started is not None:
+            span.llm_time += time.perf_counter() - started
+        usage = _token_usage(response)
+        span.llm_calls += 1
+        span.prompt_tokens += usage["prompt"]
+        span.completion_tokens += usage["completion"]
+        span.cost += estimate_cost(usage["prompt"], usage["completion"])
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        span = _current_span.get()
+        if span is not None and started is not None:
+            span.llm_time += time.perf_counter() - started
+
+
+TRACING_HANDLER = TracingCallbackHandler()
+
+
+def _finish(span: Span) -> None:
+    span.wall_time = time.perf_counter() - span.start
+
+    NODE_WALL_SECONDS.observe(span.wall_time, node=span.node)
+    NODE_LLM_SECONDS.observe(span.llm_time, node=span.node)
+    if span.llm_calls:
+        NODE_TOKENS.observe(span.prompt_tokens, node=span.node, kind="prompt")
+        NODE_TOKENS.observe(span.completion_tokens, node=span.node, kind="completion")
+        NODE_COST_DOLLARS.inc(span.cost, node=span.node)
+    if span.error:
+        NODE_ERRORS.inc(node=span.node)
+
+    fields = asdict(span)
+    fields.pop("start")
+    logger.bind(span=fields).info(
+        "span node={} wall={:.3f}s llm={:.3f}s tokens={}+{} cost=${:.5f}",
+        span.node, span.wall_time, span.llm_time, span.prompt_tokens, span.completion_tokens, span.cost,
+    )
+
+
+def traced_node(name: str, fn: Callable) -> Callable:
+    """
+    Wraps a (sync or async) graph node so each execution is recorded as a span.
+    """
+    label = name.upper()
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(state, *args, **kwargs):
+            logger.debug("--- {} NODE ---", label)
+            span = Span(node=name, start=time.perf_counter())
+            token = _current_span.set(span)
+            try:
+                return await fn(state, *args, **kwargs)
+            except Exception as e:
+                span.error = repr(e)
+                raise
+            finally:
+                _current_span.reset(token)
+                _finish(span)
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(state, *args, **kwargs):
+        threads = node_threads.get()
+        if threads is not None:
+            threads.enter()
+        try:
+            logger.debug("--- {} NODE ---", label)
+            span = Span(node=name, start=time.perf_counter())
+            token = _current_span.set(span)
+            try:
+                return fn(state, *args, **kwargs)
+            except Exception as e:
+                span.error = repr(e)
+                raise
+            finally:
+                _current_span.reset(token)
+                _finish(span)
+        finally:
+            if threads is not None:
+                threads.exit()
+
+    return wrapper
@@ -0,0 +1,105 @@
+"""
+Concurrency caps: the provider slot pool (src/llm/rate_limit.py) and admission
+slots held by abandoned sync nodes (src/api/admission.py).
+"""
+import asyncio
+import contextvars
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+pytest.importorskip("langchain_core")
+pytest.importorskip("pydantic_settings")
+
+from src.api.admission import AdmissionController
+from src.llm.rate_limit import SlotPool
+from src.utils.tracing import traced_node
+
+
+def test_slot_pool_caps_threads_and_coroutines_together():
+    pool = SlotPool(2)
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def track(delta):
+        nonlocal active, peak
+        with lock:
+            active += delta
+            peak = max(peak, active)
+
+    def thread_call():
+        pool.acquire()
+        track(1)
+        time.sleep(0.02)
+        track(-1)
+        pool.release()
+
+    async def async_call():
+        await pool.aacquire()
+        track(1)
+        await asyncio.sleep(0.02)
+        track(-1)
+        pool.release()
+
+    async def main():
+        threads = [threading.Thread(target=thread_call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        await asyncio.gather(*(async_call() for _ in range(6)))
+        await asyncio.to_thread(lambda: [thread.join() for thread in threads])
+
+    asyncio.run(main())
+    assert peak == 2
+    assert pool._free == 2 and not pool._waiters
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    pool = SlotPool(1)
+
+    async def main():
+        await pool.aacquire()
+        waiter = asyncio.ensure_future(pool.aacquire())
+        await asyncio.sleep(0)
+        # Hand the slot over and cancel the waiter before it resumes
+        pool.release()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0)
+        await asyncio.wait_for(pool.aacquire(), timeout=1)
+
+    asyncio.run(main())
+
+
+def test_slot_is_held_until_abandoned_sync_node_returns():
+    controller = AdmissionController(max_concurrent=1, max_queued=4, queue_timeout=5)
+    release_node = threading.Event()
+    node = traced_node("slow", lambda state: release_node.wait(5))
+
+    async def run_abandoned():
+        async with controller.slot():
+            loop = asyncio.get_running_loop()
+            context = contextvars.copy_context()
+            future = loop.run_in_executor(None, context.run, node, {})
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(future, timeout=0.05)
+
+    async def main():
+        await run_abandoned()
+        # The request returned, but its node thread is still running
+        assert controller.in_flight == 1
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(controller._semaphore.acquire(), timeout=0.1)
+        release_node.set()
+        async with controller.slot():
+            assert controller.in_flight == 1
+        assert controller.in_flight == 0
+
+    asyncio.run(main())
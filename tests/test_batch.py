@@ -0,0 +1,140 @@
+"""
+Batch runs (src/api/batch.py): input parsing, resuming from the progress file
+and one record per id, driven by a scripted graph.
+"""
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("fastapi")
+pytest.importorskip("langchain_core")
+pytest.importorskip("pydantic_settings")
+
+from langchain_core.messages import AIMessage
+
+from src.api import workflow
+from src.api.batch import BatchRunner, parse_jsonl
+
+
+class ScriptedGraph:
+    """
+    Answers each prompt with its upper-cased text; prompts listed in `fail` raise.
+    """
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.prompts = []
+
+    async def ainvoke(self, state, config=None):
+        prompt = state["messages"][-1].content
+        self.prompts.append(prompt)
+        await asyncio.sleep(0)
+        if prompt in self.fail:
+            raise RuntimeError(f"cannot answer {prompt}")
+        return {"messages": state["messages"] + [AIMessage(content=prompt.upper())]}
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    graph = ScriptedGraph()
+    monkeypatch.setattr(workflow, "get_graph", lambda *args, **kwargs: graph)
+    return graph
+
+
+def run(runner, items):
+    async def collect():
+        return [result async for result in runner.run(items)]
+    return asyncio.run(collect())
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_implicit_ids_do_not_collide_with_explicit_ids():
+    lines = [
+        '{"prompt": "first"}',
+        '{"id": "1", "prompt": "second"}',
+        "",
+        "not json",
+        '{"id": 1, "prompt": "fourth"}',
+    ]
+    items = list(parse_jsonl(lines))
+    assert [str(item["id"]) for item in items] == ["line-1", "1", "line-4", "1"]
+    assert items[2]["_parse_error"].startswith("Invalid JSON on line 4")
+
+
+def test_results_and_per_item_errors(graph, tmp_path):
+    items = parse_jsonl(['{"id": "a", "prompt": "x"}', "[]", '{"id": "b"}'])
+    results = {r["id"]: r for r in run(BatchRunner(concurrency=2), items)}
+    assert results["a"]["output"] == "X" and results["a"]["error"] is None
+    assert results["line-2"]["error"].startswith("ValueError: Invalid JSON on line 2")
+    assert "prompt" in results["b"]["error"]
+
+
+def test_resume_skips_succeeded_and_reruns_failed_items(graph, tmp_path):
+    progress = str(tmp_path / "progress.jsonl")
+    lines = ['{"id": "a", "prompt": "a"}', '{"id": "b", "prompt": "b"}', '{"id": "c", "prompt": "c"}']
+
+    graph.fail = {"b"}
+    first = BatchRunner(concurrency=2, progress_path=progress)
+    run(first, parse_jsonl(lines))
+    assert (first.succeeded, first.failed) == (2, 1)
+    with open(progress, "a", encoding="utf-8") as f:
+        f.write('{"id": "c", "output"') # Torn line from an interrupted run
+
+    graph.fail = set()
+    graph.prompts.clear()
+    second = BatchRunner(concurrency=2, progress_path=progress)
+    results = run(second, parse_jsonl(lines))
+    assert [r["id"] for r in results] == ["b"] and graph.prompts == ["b"]
+    assert (second.succeeded, second.failed, second.skipped) == (1, 0, 2)
+
+    # The failed record and the torn line were dropped; one success per id remains
+    records = read_records(progress)
+    assert sorted(r["id"] for r in records) == ["a", "b", "c"]
+    assert all(r["error"] is None for r in records)
+
+
+def test_repeated_ids_run_once(graph, tmp_path):
+    progress = str(tmp_path / "progress.jsonl")
+    lines = ['{"id": "a", "prompt": "one"}', '{"id": "a", "prompt": "two"}', '{"prompt": "three"}']
+    runner = BatchRunner(concurrency=3, progress_path=progress)
+    results = run(runner, parse_jsonl(lines))
+    assert sorted(r["id"] for r in results) == ["a", "line-3"]
+    assert graph.prompts.count("one") + graph.prompts.count("two") == 1
+    assert len(read_records(progress)) == 2
+
+
+def test_duplicate_records_in_progress_file_are_collapsed(graph, tmp_path):
+    progress = tmp_path / "progress.jsonl"
+    progress.write_text(
+        '{"id": "a", "output": "A", "error": null}\n'
+        '{"id": "a", "output": "A", "error": null}\n'
+        '{"id": "b", "output": null, "error": "boom"}\n',
+        encoding="utf-8",
+    )
+    assert BatchRunner(progress_path=str(progress)).completed_ids() == {"a"}
+    assert read_records(progress) == [{"id": "a", "output": "A", "error": None}]
+
+
+def test_workflow_type_is_validated():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from pydantic import ValidationError
+    from src.api.batch import router
+
+    with pytest.raises(ValidationError):
+        workflow.WorkflowRequest(prompt="x", workflow_type="bogus")
+    with pytest.raises(ValueError, match="bogus"):
+        workflow.get_graph("bogus")
+
+    app = FastAPI()
+    app.include_router(router)
+    response = TestClient(app).post("/batch", params={"workflow_type": "bogus"}, content=b"")
+    assert response.status_code == 422
@@ -0,0 +1,56 @@
+"""
+AST calculator used by the calculator tool (src/agent/calculator.py).
+"""
+import math
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.agent.calculator import CalculatorError, calculate, evaluate
+
+
+@pytest.mark.parametrize("expr", ["2 * (3 + 4) ** 2", "10 / 4", "7 // 2", "-3 ** 2", "2 ** -1", "17 % 5", "1e3 + .5"])
+def test_matches_python_arithmetic(expr):
+    assert evaluate(expr) == eval(expr, {"__builtins__": {}})
+
+
+def test_functions_and_constants():
+    assert evaluate("sqrt(16) + factorial(5)") == 124
+    assert evaluate("max(1, 7, 3)") == 7
+    assert evaluate("cos(pi)") == pytest.approx(-1)
+    assert evaluate("log(e)") == pytest.approx(1)
+    assert math.isinf(evaluate("inf"))
+
+
+@pytest.mark.parametrize("expr", [
+    "__import__('os').system('true')",
+    "(1).__class__",
+    "[x for x in range(3)]",
+    "open('/etc/passwd')",
+    "True + 1",
+    "9 ** 9 ** 9",
+    "factorial(100000)",
+    "1 / 0",
+    "sqrt(-1)",
+    "2 +",
+    "1" * 2000,
+    "-" * 999 + "1",
+    "(" * 300 + "1" + ")" * 300,
+])
+def test_rejects_unsafe_or_unbounded(expr):
+    with pytest.raises(CalculatorError):
+        evaluate(expr)
+
+
+@pytest.mark.parametrize("expr", ["10**4400", "2**49999", "3**20000"])
+def test_results_beyond_str_digit_limit_are_errors(expr):
+    with pytest.raises(CalculatorError, match="too many digits"):
+        calculate(expr)
+
+
+def test_calculate_formats_result():
+    assert calculate("2 ** 10") == "1024"
+    assert calculate("10 / 4") == "2.5"
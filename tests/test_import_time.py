@@ -0,0 +1,89 @@
+"""
+Import-time budget for the API and CLI entry points (based on `python -X importtime`).
+
+Budgets can be tuned per environment with IMPORT_BUDGET_MS_<MODULE>, e.g.
+IMPORT_BUDGET_MS_SRC_API_MAIN=800.
+"""
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+# Heavy modules that must only be imported on first use
+LAZY_MODULES = [
+    "langchain_openai",
+    "langgraph",
+    "langchain_community",
+    "langchain_experimental",
+    "langchain_tavily",
+    "arxiv",
+    "wikipedia",
+    "duckduckgo_search",
+]
+
+BUDGETS_MS = {
+    "src.api.main": 1500,
+    "main": 1000,
+    "src.agent.tools": 1000,
+    "src.llm.prompts": 50,
+}
+
+# Third-party packages each entry point legitimately needs at import time
+REQUIRES = {
+    "src.api.main": ["fastapi", "loguru", "pydantic_settings"],
+    "main": ["loguru", "pydantic_settings"],
+    "src.agent.tools": ["langchain_core", "httpx"],
+    "src.llm.prompts": [],
+}
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_import(module: str):
+    """
+    Imports `module` in a fresh interpreter.
+    Returns (cumulative milliseconds, set of all imported module names).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    cumulative_us, imported = 0, set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        imported.add(name)
+        if name == module:
+            cumulative_us = int(match.group(2))
+    return cumulative_us / 1000, imported
+
+
+def budget_ms(module: str) -> float:
+    env_name = "IMPORT_BUDGET_MS_" + module.upper().replace(".", "_")
+    return float(os.environ.get(env_name, BUDGETS_MS[module]))
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS_MS))
+def test_import_time_budget(module):
+    for requirement in REQUIRES[module]:
+        pytest.importorskip(requirement)
+
+    elapsed_ms, imported = profile_import(module)
+
+    eager = sorted(
+        name for name in imported
+        if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    )
+    assert not eager, f"{module} eagerly imports {eager}"
+    assert elapsed_ms <= budget_ms(module), f"{module} took {elapsed_ms:.0f}ms to import"
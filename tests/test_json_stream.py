@@ -0,0 +1,48 @@
+"""
+Incremental JSON parsing and repair of model output (src/utils/json_stream.py).
+"""
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.json_stream import StreamingJSONParser, repair_json
+
+
+def feed_in_chunks(text: str, size: int):
+    parser = StreamingJSONParser()
+    seen = []
+    for i in range(0, len(text), size):
+        seen.extend(parser.feed(text[i:i + size]))
+    return parser, seen
+
+
+def test_fields_surface_as_soon_as_complete():
+    parser = StreamingJSONParser()
+    assert parser.feed('{"category": "spam", "confid') == [("category", "spam")]
+    assert parser.feed('ence": 0.9') == []
+    assert parser.feed('}') == [("confidence", 0.9)]
+    assert parser.done
+
+
+def test_nested_values_strings_and_prose():
+    text = 'Sure:\n```json\n{"tags": ["a", "b,}"], "nested": {"x": "y\\"}"}, "n": null}\n```'
+    for size in (1, 3, 7, len(text)):
+        parser, seen = feed_in_chunks(text, size)
+        assert parser.fields == {"tags": ["a", "b,}"], "nested": {"x": 'y"}'}, "n": None}
+        assert [name for name, _ in seen] == ["tags", "nested", "n"]
+
+
+def test_invalid_field_does_not_fail_the_object():
+    parser, _ = feed_in_chunks('{"ok": 1, "bad": tru, "also_ok": "x"}', 4)
+    assert parser.fields == {"ok": 1, "also_ok": "x"}
+    assert parser.errors == {"bad": "tru"}
+
+
+def test_repair_json():
+    assert repair_json('{"a": 1, "b": "abc') == {"a": 1, "b": "abc"}
+    assert repair_json('{"a": 1, "b":') == {"a": 1}
+    assert repair_json('{"a": [1, 2') == {"a": [1, 2]}
+    assert repair_json('{"a": 1,}') == {"a": 1}
+    assert repair_json('```json\n{"a": {"b": "c"}}\n```') == {"a": {"b": "c"}}
+    assert repair_json("no json here") is None
@@ -0,0 +1,124 @@
+"""
+Hedging and failover across two local stub servers (benchmarks/fake_llm_server.py).
+"""
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("fastapi")
+pytest.importorskip("uvicorn")
+pytest.importorskip("langchain_openai")
+pytest.importorskip("pydantic_settings")
+
+from pydantic import SecretStr
+
+from benchmarks.fake_llm_server import FakeLLMConfig, run_in_thread
+from src.llm.config import EndpointConfig
+from src.llm.router import HedgedChatModel, endpoint_stats
+
+
+@pytest.fixture
+def servers():
+    started = []
+
+    def start(**config):
+        server, url = run_in_thread(FakeLLMConfig(completion_tokens=8, tokens_per_second=0, **config))
+        started.append(server)
+        start.apps[url] = server.config.app
+        return url
+
+    start.apps = {}
+    yield start
+    for server in started:
+        server.should_exit = True
+
+
+def make_model(urls, names, hedge_delay=0.2):
+    endpoints = [
+        EndpointConfig(name=name, base_url=url, model="fake", api_key=SecretStr("fake"))
+        for name, url in zip(names, urls)
+    ]
+    model = HedgedChatModel.from_endpoints(endpoints, streaming=False, request_timeout=10)
+    model.hedge_delay = hedge_delay
+    return model
+
+
+def test_hedge_beats_slow_primary(servers):
+    slow = servers(latency_ms=2000)
+    fast = servers(latency_ms=10)
+    model = make_model([slow, fast], ["slow-primary", "fast-secondary"])
+
+    started = time.perf_counter()
+    response = asyncio.run(model.ainvoke("hello"))
+    elapsed = time.perf_counter() - started
+
+    assert response.content
+    assert elapsed < 1.5
+    stats = {s["name"]: s for s in endpoint_stats()}
+    assert stats["fast-secondary"]["successes"] == 1
+
+
+def test_sync_hedge_aborts_the_losing_request(servers):
+    slow = servers(latency_ms=3000)
+    fast = servers(latency_ms=10)
+    model = make_model([slow, fast], ["sync-slow-primary", "sync-fast-secondary"])
+
+    started = time.perf_counter()
+    assert model.invoke("hello").content
+    assert time.perf_counter() - started < 1.5
+
+    # The slow server sees the client hang up instead of answering after 3s
+    slow_app = servers.apps[slow]
+    deadline = time.monotonic() + 1.5
+    while slow_app.state.disconnected == 0 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert slow_app.state.disconnected == 1
+    stats = {s["name"]: s for s in endpoint_stats()}
+    assert stats["sync-slow-primary"]["failures"] == 0
+
+
+def test_failover_on_errors(servers):
+    broken = servers(latency_ms=10, error_rate=1.0)
+    healthy = servers(latency_ms=10)
+    model = make_model([broken, healthy], ["broken", "healthy"], hedge_delay=5.0)
+
+    assert model.invoke("hello").content
+    assert asyncio.run(model.ainvoke("hello")).content
+
+    stats = {s["name"]: s for s in endpoint_stats()}
+    assert stats["broken"]["failures"] == 2
+    assert stats["healthy"]["successes"] == 2
+
+
+def test_streaming_uses_one_endpoint_and_fails_over_before_first_chunk(servers):
+    broken = servers(latency_ms=10, error_rate=1.0)
+    healthy = servers(latency_ms=10)
+    model = make_model([broken, healthy], ["stream-broken", "stream-healthy"], hedge_delay=0.01)
+
+    chunks = list(model.stream("hello"))
+    assert len(chunks) > 1
+    assert "".join(chunk.content for chunk in chunks)
+
+    async def collect():
+        return [chunk async for chunk in model.astream("hello")]
+
+    assert len(asyncio.run(collect())) > 1
+    stats = {s["name"]: s for s in endpoint_stats()}
+    assert stats["stream-broken"]["failures"] == 2
+    assert stats["stream-healthy"]["successes"] == 2
+    # Streams do not feed the latency window used for the hedge delay
+    assert stats["stream-healthy"]["samples"] == 0
+
+
+def test_missing_api_key_is_a_configuration_error(monkeypatch):
+    from src.llm.config import settings
+    from src.utils.exceptions import ConfigurationError
+
+    monkeypatch.setattr(settings, "API_KEY", None)
+    with pytest.raises(ConfigurationError, match="no-key"):
+        HedgedChatModel.from_endpoints([EndpointConfig(name="no-key", base_url="http://localhost:1/v1", model="fake")])
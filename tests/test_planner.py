@@ -0,0 +1,179 @@
+"""
+Plan parsing (src/components/nodes/planner_node.py) and dependency-ordered,
+parallel execution of the plan (src/components/nodes/scheduler_node.py),
+driven by scripted chat models.
+"""
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("langchain_core")
+pytest.importorskip("pydantic_settings")
+
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+
+from src.components.nodes import planner_node as planner_module
+from src.components.nodes import scheduler_node as scheduler_module
+from src.components.nodes.planner_node import normalize_plan, parse_plan, planner_node, sequential_plan
+from src.components.nodes.scheduler_node import scheduler_node
+from src.llm.config import settings
+
+
+class ScriptedLLM:
+    """
+    Streams the given replies in order, like the JSON-mode client the planner uses.
+    """
+    def __init__(self, *replies: str, chunk_size: int = 8):
+        self.replies = list(replies)
+        self.chunk_size = chunk_size
+
+    def stream(self, messages):
+        text = self.replies.pop(0)
+        for i in range(0, len(text), self.chunk_size):
+            yield AIMessageChunk(content=text[i:i + self.chunk_size])
+
+    def invoke(self, messages):
+        return AIMessage(content=self.replies.pop(0))
+
+
+class StepLLM:
+    """
+    Answers plan steps by task: each takes `delay` seconds and returns "<task> done",
+    or raises for tasks listed in `fail`. Records when each step ran.
+    """
+    def __init__(self, delay: float = 0.05, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.prompts = {}
+        self.spans = {}
+        self.active = 0
+        self.peak = 0
+
+    async def ainvoke(self, messages):
+        task = messages[-1].content
+        self.prompts[task] = messages[0].content
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        started = time.perf_counter()
+        try:
+            await asyncio.sleep(self.delay)
+            if task in self.fail:
+                raise RuntimeError(f"{task} broke")
+            return AIMessage(content=f"{task} done", usage_metadata={
+                "input_tokens": 3, "output_tokens": 2, "total_tokens": 5,
+            })
+        finally:
+            self.active -= 1
+            self.spans[task] = (started, time.perf_counter())
+
+
+def step(step_id, task, depends_on=()):
+    return {"id": step_id, "task": task, "depends_on": list(depends_on)}
+
+
+def test_normalize_plan_drops_dangling_and_self_references():
+    steps = normalize_plan([
+        {"id": 1, "task": " Gather facts ", "depends_on": [7]},
+        {"id": 2, "task": "Check sources", "depends_on": [2]},
+        {"id": 3, "task": "Write", "depends_on": [1, "2"]},
+    ])
+    assert steps == [
+        step("1", "Gather facts"),
+        step("2", "Check sources"),
+        step("3", "Write", ["1", "2"]),
+    ]
+
+
+@pytest.mark.parametrize("raw", [
+    # Duplicate ids
+    [{"id": "1", "task": "a"}, {"id": "1", "task": "b"}, {"id": "2", "task": "c", "depends_on": ["1"]}],
+    # Cycle
+    [{"id": "1", "task": "a", "depends_on": ["3"]}, {"id": "2", "task": "b", "depends_on": ["1"]},
+     {"id": "3", "task": "c", "depends_on": ["2"]}],
+])
+def test_unschedulable_plans_fall_back_to_sequential(raw):
+    assert normalize_plan(raw) == sequential_plan(["a", "b", "c"])
+    assert normalize_plan(raw) == [step("1", "a"), step("2", "b", ["1"]), step("3", "c", ["2"])]
+
+
+def test_normalize_plan_caps_the_number_of_steps(monkeypatch):
+    monkeypatch.setattr(settings, "PLAN_MAX_STEPS", 2)
+    steps = normalize_plan([{"task": "a"}, {"task": "b", "depends_on": [3]}, {"task": "c"}])
+    assert steps == [step("1", "a"), step("2", "b")]
+
+
+def test_parse_plan():
+    text = '{"steps": [{"id": "x", "task": "t1"}, {"id": "y", "task": "t2", "depends_on": ["x"]}]}'
+    assert parse_plan(text, "request") == [step("x", "t1"), step("y", "t2", ["x"])]
+    # Not JSON: one step per non-empty line
+    assert parse_plan("First\n\n  Second  \n", "request") == sequential_plan(["First", "Second"])
+    # JSON of the wrong shape: the whole request as one step
+    for wrong in ('{"plan": []}', "[1, 2]", '{"steps": [{"id": 1}]}', '"steps"'):
+        assert parse_plan(wrong, "the request") == [step("1", "the request")], wrong
+
+
+def test_planner_node_uses_the_validated_plan(monkeypatch):
+    reply = '{"steps": [{"id": "1", "task": "Research"}, {"id": "2", "task": "Summarize", "depends_on": ["1"]}]}'
+    monkeypatch.setattr(planner_module, "get_llm", lambda **kwargs: ScriptedLLM(reply))
+    updates = planner_node({"messages": [HumanMessage(content="Summarize the research")], "tokens_used": 4})
+    assert updates["plan"] == ["Research", "Summarize"]
+    assert updates["plan_graph"] == [step("1", "Research"), step("2", "Summarize", ["1"])]
+    assert updates["tokens_used"] == 4
+
+
+def test_planner_node_falls_back_to_the_raw_text(monkeypatch):
+    monkeypatch.setattr(planner_module, "get_llm", lambda **kwargs: ScriptedLLM("Look it up\nWrite it down", "nope"))
+    updates = planner_node({"messages": [HumanMessage(content="q")]})
+    assert updates["plan_graph"] == sequential_plan(["Look it up", "Write it down"])
+
+
+def run_scheduler(monkeypatch, llm, plan_graph):
+    monkeypatch.setattr(scheduler_module, "get_llm", lambda: llm)
+    state = {"messages": [HumanMessage(content="Compare A and B")], "plan_graph": plan_graph, "tokens_used": 1}
+    started = time.perf_counter()
+    updates = asyncio.run(scheduler_node(state))
+    return updates, time.perf_counter() - started
+
+
+def test_scheduler_runs_independent_steps_in_parallel_and_respects_dependencies(monkeypatch):
+    llm = StepLLM(delay=0.1)
+    plan = [step("1", "Study A"), step("2", "Study B"), step("3", "Compare", ["1", "2"])]
+    updates, elapsed = run_scheduler(monkeypatch, llm, plan)
+
+    assert updates["step_results"] == {"1": "Study A done", "2": "Study B done", "3": "Compare done"}
+    assert updates["tokens_used"] == 1 + 3 * 5
+    # Critical path is two steps, not three
+    assert elapsed < 0.28
+    assert llm.peak == 2
+    assert llm.spans["Compare"][0] >= max(llm.spans["Study A"][1], llm.spans["Study B"][1])
+    # The dependent step sees its inputs and the overall request
+    compare_prompt = llm.prompts["Compare"]
+    assert "Overall request: Compare A and B" in compare_prompt
+    assert "Result of step 1 (Study A):\nStudy A done" in compare_prompt
+    assert "Result of step 2 (Study B):\nStudy B done" in compare_prompt
+    assert llm.prompts["Study A"] == "You are working on one step of a larger task.\n\nOverall request: Compare A and B"
+
+
+def test_scheduler_caps_parallel_steps(monkeypatch):
+    monkeypatch.setattr(settings, "PLAN_MAX_PARALLEL", 2)
+    llm = StepLLM(delay=0.05)
+    updates, _ = run_scheduler(monkeypatch, llm, [step(str(i), f"task {i}") for i in range(1, 6)])
+    assert len(updates["step_results"]) == 5
+    assert llm.peak == 2
+
+
+def test_failed_step_does_not_block_its_dependents(monkeypatch):
+    llm = StepLLM(delay=0.01, fail={"Fetch"})
+    updates, _ = run_scheduler(monkeypatch, llm, [step("1", "Fetch"), step("2", "Report", ["1"])])
+    assert updates["step_results"]["1"] == "Step failed: Fetch broke"
+    assert updates["step_results"]["2"] == "Report done"
+    assert "Step failed: Fetch broke" in llm.prompts["Report"]
+
+
+def test_scheduler_without_a_plan_is_a_no_op(monkeypatch):
+    assert run_scheduler(monkeypatch, StepLLM(), [])[0] == {}
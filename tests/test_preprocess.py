@@ -0,0 +1,79 @@
+"""
+The fast cleaner (src/data/preprocess.py) must produce exactly what the original
+five-pass implementation produced, including when the input is streamed.
+"""
+import html
+import os
+import random
+import re
+import sys
+import unicodedata
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.preprocess import clean, clean_many, clean_stream
+
+
+def reference_clean(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text)
+    text = html.unescape(text)
+    text = re.sub(r"<[^>]+>", "", text)
+    text = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+PIECES = [
+    "word", "Ünïcödé", "ﬁle", "①", "ｆｕｌｌ", "é", "　", "\xa0", " ", "  ", "\t", "\n", "\r",
+    "\x0b", "\x0c", "\x1c", "\x1f", "\x00", "\x7f", " ", "\x85",
+    "<b>", "</p>", "<a href='x'>", "<", ">", "<>", "<br\n/>", "&amp;", "&lt;i&gt;", "&lt;", "&gt;", "&#60;",
+    "&#x3c;", "&amp", "&nbsp;", "&#1;", "&fflig;", "﹤", "＞", "&", ";", "#",
+]
+
+
+def random_text(rng: random.Random, size: int) -> str:
+    return "".join(rng.choice(PIECES) for _ in range(size))
+
+
+@pytest.mark.parametrize("text", [
+    "", "   ", "plain ascii text", "  <p>Hello&nbsp;<b>world</b></p>\n\n\tbye  ",
+    "&lt;script&gt;alert(1)&lt;/script&gt; kept?", "ﬁ ligature and ｆｕｌｌｗｉｄｔｈ",
+    "tab\x0bvt\x0cff\x1cfs", "a\x00b", "< not a tag", "a <b\nc> d", "x y\x85z",
+])
+def test_examples_match_reference(text):
+    assert clean(text) == reference_clean(text)
+
+
+def test_random_documents_match_reference():
+    rng = random.Random(0)
+    for _ in range(2000):
+        text = random_text(rng, rng.randint(0, 60))
+        assert clean(text) == reference_clean(text), repr(text)
+
+
+def test_stream_matches_reference():
+    rng = random.Random(1)
+    for _ in range(300):
+        text = random_text(rng, rng.randint(0, 400))
+        pieces, i = [], 0
+        while i < len(text):
+            step = rng.randint(1, 40)
+            pieces.append(text[i:i + step])
+            i += step
+        streamed = list(clean_stream(pieces, min_chunk=rng.choice([1, 8, 64])))
+        assert " ".join(streamed) == reference_clean(text), repr(text)
+        assert all(streamed)
+
+
+def test_stream_keeps_tags_split_across_chunks():
+    chunks = ["before <a ", "href='x' ", "title=y> after &lt;i ", "x&gt; end"]
+    assert " ".join(clean_stream(chunks, min_chunk=1)) == reference_clean("".join(chunks)) == "before after end"
+
+
+def test_clean_many():
+    texts = ["<b>one</b>", "two&amp;", "ﬁ  three"]
+    expected = [reference_clean(text) for text in texts]
+    assert clean_many(texts) == expected
+    assert clean_many(texts, workers=2, chunksize=1) == expected
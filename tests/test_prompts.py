@@ -0,0 +1,85 @@
+"""
+Compiled prompt templates (src/llm/prompts.py) must render exactly like
+str.format / ChatPromptTemplate.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.llm.prompts import CompiledTemplate, available_prompts, get_prompt
+
+
+@pytest.mark.parametrize("template", [
+    "Context: {context}\n\nQuestion: {question}",
+    '{{"steps": [{{"id": "1"}}]}}\nRequest: {request}',
+    "no variables at all",
+    "{question}{question} {context}",
+    "{context!r} {question:>30}",
+])
+def test_matches_str_format(template):
+    variables = {"context": "a {curly} context", "question": 42, "request": "plan"}
+    compiled = CompiledTemplate(template)
+    assert compiled.format(**variables) == template.format(**variables)
+    assert compiled.is_static == (template == "no variables at all")
+
+
+def test_static_text_unescapes_braces():
+    compiled = CompiledTemplate('Return {{"a": 1}}')
+    assert compiled.is_static
+    assert compiled.static_text == 'Return {"a": 1}' == compiled.format()
+
+
+def test_variables_and_missing_values():
+    compiled = CompiledTemplate("{a} and {b} and {a}")
+    assert compiled.variables == {"a", "b"}
+    with pytest.raises(KeyError, match="b"):
+        compiled.format(a=1)
+
+
+def test_registry_is_lazy_and_node_prompts_are_registered():
+    names = available_prompts()
+    for name in ("PLANNER_PROMPT", "PLAN_STEP_PROMPT", "EVALUATOR_PROMPT", "JUDGE_PROMPT", "ROUTER_PROMPT"):
+        assert name in names
+    with pytest.raises(KeyError):
+        get_prompt("NO_SUCH_PROMPT")
+
+
+def test_compiled_chat_prompts_match_langchain():
+    pytest.importorskip("langchain_core")
+    from langchain_core.messages import AIMessage, HumanMessage
+    from src.llm.prompts import compile_prompt, get_compiled_prompt
+
+    history = [HumanMessage(content="hi"), AIMessage(content="hello")]
+    cases = {
+        "QA_PROMPT": {"context": "ctx {x}", "question": "q?"},
+        "CONVERSATION_PROMPT": {"system_message": "be brief", "chat_history": history, "input": "next"},
+        "CONVERSATIONAL_RAG_PROMPT": {"context": "c", "question": "q"},
+        "REACT_AGENT_PROMPT": {"tools": "search", "input": "go", "agent_scratchpad": [("ai", "thinking")]},
+    }
+    for name, variables in cases.items():
+        expected = get_prompt(name).format_messages(**variables)
+        assert get_compiled_prompt(name).format_messages(**variables) == expected, name
+    assert compile_prompt(get_prompt("SUMMARIZE_PROMPT")).format(style="short", text="t") == \
+        get_prompt("SUMMARIZE_PROMPT").format(style="short", text="t")
+
+
+def test_static_parts_with_escaped_braces_match_langchain():
+    pytest.importorskip("langchain_core")
+    from langchain_core.prompts import ChatPromptTemplate
+    from src.llm.prompts import compile_prompt
+
+    parts = [("system", 'Reply with JSON like {{"answer": "..."}}'), ("human", "{question}")]
+    expected = ChatPromptTemplate.from_messages(parts).format_messages(question="q")
+    compiled = compile_prompt(ChatPromptTemplate.from_messages(parts))
+    assert compiled.format_messages(question="q") == expected
+    assert expected[0].content == 'Reply with JSON like {"answer": "..."}'
+
+
+def test_judge_prompt_keeps_verdict_instructions():
+    pytest.importorskip("langchain_core")
+    [message] = get_prompt("JUDGE_PROMPT").format_messages(response="r", critique="c")
+    assert '"VERDICT: PASS"' in message.content and '"VERDICT: REVISE"' in message.content
+    assert message.content.endswith("Original Response: r\nCritique: c")
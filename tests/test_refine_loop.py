@@ -0,0 +1,117 @@
+"""
+Refine loop (src/components/budget.py, agent and judge nodes): when the loop stops,
+and what the agent sends to the model on a revision pass.
+"""
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("langchain_core")
+pytest.importorskip("pydantic_settings")
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from src.components.budget import recursion_limit, start_budget, stop_reason
+from src.components.nodes import agent_node as agent_module
+from src.components.nodes import judge_node as judge_module
+from src.components.nodes.agent_node import REVISION_REQUEST, agent_node
+from src.components.nodes.judge_node import judge_node, route_after_judge
+
+
+class ScriptedLLM:
+    """
+    Returns the given replies in order and records the messages of each call.
+    """
+    def __init__(self, *replies: str):
+        self.replies = list(replies)
+        self.calls = []
+
+    def invoke(self, messages):
+        self.calls.append(messages)
+        return AIMessage(content=self.replies.pop(0), usage_metadata={
+            "input_tokens": 10, "output_tokens": 5, "total_tokens": 15,
+        })
+
+
+def budget(**overrides):
+    return {**start_budget(max_iterations=3, token_budget=1000, deadline_seconds=60), **overrides}
+
+
+@pytest.mark.parametrize("overrides, expected", [
+    ({}, None),
+    ({"iteration": 3}, "max_iterations"),
+    ({"tokens_used": 1000}, "token_budget"),
+    ({"deadline": time.time() - 1}, "deadline"),
+    # The last pass took longer than the time left
+    ({"deadline": time.time() + 5, "loop_timings": [10.0]}, "deadline"),
+])
+def test_stop_reason(overrides, expected):
+    assert stop_reason(budget(**overrides)) == expected
+
+
+def test_recursion_limit_covers_every_iteration():
+    assert recursion_limit(10) >= 5 + 3 * 10
+    assert recursion_limit(None) == recursion_limit(start_budget()["max_iterations"])
+
+
+@pytest.mark.parametrize("verdict, state, needs_refinement, reason", [
+    ("VERDICT: PASS", {}, False, "approved"),
+    ("VERDICT: REVISE", {}, True, None),
+    ("VERDICT: REVISE", {"iteration": 2}, False, "max_iterations"),
+    ("VERDICT: REVISE", {"tokens_used": 990}, False, "token_budget"),
+    # No verdict line counts as approval
+    ("", {}, False, "approved"),
+])
+def test_judge_sets_stop_reason_and_route(monkeypatch, verdict, state, needs_refinement, reason):
+    monkeypatch.setattr(judge_module, "get_llm", lambda: ScriptedLLM(f"Final answer.\n{verdict}"))
+    state = budget(messages=[AIMessage(content="draft")], critique="too short", **state)
+    updates = judge_node(state)
+    assert updates["needs_refinement"] is needs_refinement
+    assert updates["stop_reason"] == reason
+    assert updates["final_answer"] == "Final answer."
+    assert updates["iteration"] == state["iteration"] + 1
+    assert route_after_judge({**state, **updates}) == ("agent" if needs_refinement else "end")
+
+
+def test_first_pass_appends_the_draft(monkeypatch):
+    llm = ScriptedLLM("draft 1")
+    monkeypatch.setattr(agent_module, "get_llm", lambda: llm)
+    request = HumanMessage(content="Explain recursion")
+    updates = agent_node(budget(messages=[request], context="ctx"))
+
+    [sent] = llm.calls
+    assert isinstance(sent[0], SystemMessage) and sent[1:] == [request]
+    assert [m.content for m in updates["messages"]] == ["Explain recursion", "draft 1"]
+    assert updates["tokens_used"] == 15
+
+
+def test_revision_sends_only_the_latest_draft_and_replaces_it(monkeypatch):
+    llm = ScriptedLLM("draft 2", "draft 3")
+    monkeypatch.setattr(agent_module, "get_llm", lambda: llm)
+    request = HumanMessage(content="Explain recursion")
+    state = budget(
+        messages=[request, AIMessage(content="draft 1")],
+        context="ctx",
+        critique="Add an example.",
+        needs_refinement=True,
+    )
+
+    state = {**state, **agent_node(state)}
+    system, original, draft, revise = llm.calls[0]
+    assert isinstance(system, SystemMessage)
+    assert "Context: ctx" in system.content and "Add an example." in system.content
+    assert original == request
+    assert isinstance(draft, AIMessage) and draft.content == "draft 1"
+    assert isinstance(revise, HumanMessage) and revise.content == REVISION_REQUEST
+    assert [m.content for m in state["messages"]] == ["Explain recursion", "draft 2"]
+
+    # The next pass still sends one draft, not the whole history
+    state["critique"] = "Shorter, please."
+    state = {**state, **agent_node(state)}
+    assert [m.content for m in llm.calls[1][1:]] == ["Explain recursion", "draft 2", REVISION_REQUEST]
+    assert "Add an example." not in llm.calls[1][0].content
+    assert [m.content for m in state["messages"]] == ["Explain recursion", "draft 3"]
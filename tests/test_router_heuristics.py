@@ -0,0 +1,48 @@
+"""
+Heuristic routing of the auto workflow (router_node.classify_heuristic).
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("loguru")
+
+from src.components.nodes.router_node import classify_heuristic
+from src.llm.config import settings
+
+
+@pytest.mark.parametrize("text", [
+    "What is the capital of France?",
+    "Translate 'good morning' into Spanish.",
+    "hi",
+    "Summarize this sentence in five words: the cat sat on the mat.",
+])
+def test_short_plain_requests_are_simple(text):
+    assert classify_heuristic(text) == "basic"
+
+
+@pytest.mark.parametrize("text", [
+    "Design a step-by-step migration plan for our database.",
+    "Compare Postgres and MySQL and design a migration strategy.",
+    "First load the data, then clean it, and finally analyze the results.",
+    "Plan the release:\n1. freeze the branch\n2. run the tests\n3. tag it",
+    "Why is it slow? What changed? How do we fix it?",
+    "word " * settings.ROUTER_MIN_COMPLEX_WORDS,
+])
+def test_planning_signals_or_long_requests_are_complex(text):
+    assert classify_heuristic(text) == "advanced"
+
+
+@pytest.mark.parametrize("text", [
+    # One signal only: needs the classifier (or the advanced fallback)
+    "Can you evaluate this sentence for grammar?",
+    "Do these:\n1. fetch the logs\n2. find the errors",
+    # No signals, but too long to be obviously simple
+    "word " * (settings.ROUTER_MAX_SIMPLE_WORDS + 1),
+])
+def test_ambiguous_requests_are_left_to_the_classifier(text):
+    assert classify_heuristic(text) is None
@@ -0,0 +1,134 @@
+"""
+Compact state encoding (src/components/serialization.py): API responses and
+checkpoints must round-trip messages, tool calls and tool statuses exactly.
+"""
+import os
+import sys
+from typing import List, Optional, TypedDict
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.components.serialization import (
+    COMPACT_TYPE,
+    CompactSerializer,
+    decode_state,
+    encode_state,
+    loads,
+    state_to_dict,
+)
+
+
+def conversation() -> List[BaseMessage]:
+    return [
+        SystemMessage(content="Be brief."),
+        HumanMessage(content="What is 6 * 7?", id="h1"),
+        AIMessage(
+            content="",
+            id="a1",
+            tool_calls=[{"name": "calculator", "args": {"expression": "6 * 7"}, "id": "call-1"}],
+            usage_metadata={"input_tokens": 12, "output_tokens": 8, "total_tokens": 20},
+        ),
+        ToolMessage(content="42", tool_call_id="call-1", name="calculator"),
+        ToolMessage(content="Division by zero", tool_call_id="call-2", status="error"),
+        AIMessage(content=[{"type": "text", "text": "42"}], response_metadata={"finish_reason": "stop"}),
+    ]
+
+
+def sample_state():
+    return {
+        "messages": conversation(),
+        "context": "arithmetic",
+        "plan": ["Compute the product"],
+        "step_results": {"1": "42"},
+        "final_answer": "42",
+        "iteration": 1,
+        "loop_timings": [0.25],
+        "needs_refinement": False,
+        "safety_metadata": None,
+    }
+
+
+def test_encode_decode_round_trip():
+    state = sample_state()
+    decoded = decode_state(encode_state(state))
+    assert decoded == state
+    assert [type(m) for m in decoded["messages"]] == [type(m) for m in state["messages"]]
+    assert decoded["messages"][2].tool_calls[0]["args"] == {"expression": "6 * 7"}
+    assert decoded["messages"][4].status == "error"
+
+
+def test_encoding_omits_empty_optional_fields():
+    [human, tool] = loads(encode_state({"messages": [
+        HumanMessage(content="hi"),
+        ToolMessage(content="ok", tool_call_id="c"),
+    ]}))["messages"]
+    assert human == {"type": "human", "content": "hi"}
+    # The default "success" status is left out too
+    assert tool == {"type": "tool", "content": "ok", "tool_call_id": "c"}
+
+
+def test_final_mode_keeps_only_the_answer_and_last_message():
+    result = state_to_dict(sample_state(), mode="final")
+    assert set(result) == {"final_answer", "last_message"}
+    assert result["final_answer"] == "42"
+    assert result["last_message"]["type"] == "ai"
+    assert result["last_message"]["response_metadata"] == {"finish_reason": "stop"}
+
+    # Without a judge answer, the last message is the answer
+    fallback = state_to_dict({"messages": [HumanMessage(content="q"), AIMessage(content="a")]}, mode="final")
+    assert fallback == {"final_answer": "a", "last_message": {"type": "ai", "content": "a"}}
+    assert state_to_dict({"messages": []}, mode="final") == {"final_answer": None, "last_message": None}
+
+
+def test_serializer_falls_back_for_values_json_cannot_represent():
+    pytest.importorskip("langgraph")
+    serializer = CompactSerializer()
+    for value in ({"a": (1, 2)}, {1: "int key"}, {"s": {1, 2}}):
+        type_, payload = serializer.dumps_typed(value)
+        assert (type_, payload) == serializer.fallback.dumps_typed(value)
+        assert serializer.loads_typed((type_, payload)) == serializer.fallback.loads_typed((type_, payload))
+
+    type_, payload = serializer.dumps_typed({"messages": conversation()})
+    assert type_ == COMPACT_TYPE
+    assert serializer.loads_typed((type_, payload)) == {"messages": conversation()}
+
+
+def test_checkpoint_round_trip_through_memory_saver():
+    pytest.importorskip("langgraph")
+    from langgraph.graph import END, StateGraph
+    from src.components.serialization import create_checkpointer
+
+    class State(TypedDict):
+        messages: List[BaseMessage]
+        final_answer: Optional[str]
+
+    def respond(state):
+        return {"messages": state["messages"] + conversation()[2:], "final_answer": "42"}
+
+    builder = StateGraph(State)
+    builder.add_node("respond", respond)
+    builder.set_entry_point("respond")
+    builder.add_edge("respond", END)
+    checkpointer = create_checkpointer()
+    graph = builder.compile(checkpointer=checkpointer)
+
+    config = {"configurable": {"thread_id": "t1"}}
+    initial = {"messages": conversation()[:2], "final_answer": None}
+    final_state = graph.invoke(initial, config)
+    restored = graph.get_state(config).values
+
+    assert restored == final_state
+    assert restored["messages"] == conversation()
+    tool_call_message, ok, failed = restored["messages"][2:5]
+    assert tool_call_message.tool_calls[0]["id"] == "call-1"
+    assert (ok.status, failed.status) == ("success", "error")
+
+    # The messages channel was written with the compact encoding
+    message_blobs = [typed for key, typed in checkpointer.blobs.items() if key[2] == "messages"]
+    assert message_blobs and all(type_ == COMPACT_TYPE for type_, _ in message_blobs)
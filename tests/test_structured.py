@@ -0,0 +1,129 @@
+"""
+Structured generation (src/llm/structured.py): streaming validation, field-level
+repair and the extract/classify shortcuts, driven by a scripted chat model.
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("langchain_core")
+pytest.importorskip("pydantic_settings")
+
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+
+from src.llm.structured import (
+    agenerate_structured,
+    classification_model,
+    classify,
+    extract,
+    generate_structured,
+    validate,
+)
+from src.utils.exceptions import LLMGenerationError
+
+CATEGORIES = ["spam", "ham"]
+
+
+class ScriptedLLM:
+    """
+    Returns the given replies in order: streamed in small chunks for the first
+    call, whole for the repair calls (like the JSON-mode ChatOpenAI client).
+    """
+    def __init__(self, *replies: str, chunk_size: int = 4):
+        self.replies = list(replies)
+        self.chunk_size = chunk_size
+        self.calls = []
+
+    def _next(self, messages) -> str:
+        self.calls.append(messages)
+        return self.replies.pop(0)
+
+    def stream(self, messages):
+        text = self._next(messages)
+        for i in range(0, len(text), self.chunk_size):
+            yield AIMessageChunk(content=text[i:i + self.chunk_size])
+
+    def invoke(self, messages):
+        return AIMessage(content=self._next(messages))
+
+    async def astream(self, messages):
+        for chunk in self.stream(messages):
+            yield chunk
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+
+def test_fields_stream_and_validate_in_one_call():
+    llm = ScriptedLLM('{"category": "spam", "confidence": 0.9}')
+    seen = []
+    result = generate_structured(
+        [HumanMessage(content="classify")], classification_model(CATEGORIES), llm=llm,
+        on_field=lambda name, value: seen.append((name, value)),
+    )
+    assert seen == [("category", "spam"), ("confidence", 0.9)]
+    assert result.value.category == "spam"
+    assert len(llm.calls) == 1 and result.repaired_fields == [] and result.error is None
+
+
+def test_truncated_output_is_repaired_without_a_second_call():
+    llm = ScriptedLLM('```json\n{"category": "ham", "confidence": 0.4')
+    result = generate_structured([HumanMessage(content="x")], classification_model(CATEGORIES), llm=llm)
+    assert result.value.category == "ham" and result.value.confidence == 0.4
+    assert len(llm.calls) == 1
+
+
+def test_only_invalid_fields_are_requested_again():
+    llm = ScriptedLLM('{"category": "eggs", "confidence": 0.7}', '{"category": "spam"}')
+    result = generate_structured([HumanMessage(content="x")], classification_model(CATEGORIES), llm=llm, max_repairs=1)
+    assert result.value.category == "spam"
+    # The valid field from the first response is kept
+    assert result.value.confidence == 0.7
+    assert result.repaired_fields == ["category"]
+    assert len(result.responses) == 2
+    repair_request = llm.calls[1][-1].content
+    assert "category" in repair_request and "confidence" not in repair_request
+
+
+def test_failed_repairs_raise_or_return_none():
+    model = classification_model(CATEGORIES)
+    with pytest.raises(LLMGenerationError):
+        generate_structured([HumanMessage(content="x")], model, llm=ScriptedLLM('{"category": 1}', '{}'), max_repairs=1)
+
+    result = generate_structured([HumanMessage(content="x")], model, llm=ScriptedLLM("not json"), max_repairs=0, strict=False)
+    assert result.value is None
+    assert "category" in result.error and result.raw == "not json"
+
+
+def test_validate_reports_failing_top_level_fields():
+    model = classification_model(CATEGORIES)
+    value, failing = validate(model, {"category": "spam", "confidence": "high"}, set())
+    assert value is None and failing == {"confidence"}
+    value, failing = validate(model, {"category": "ham"}, set())
+    assert value.category == "ham" and failing == set()
+
+
+def test_async_generation_awaits_field_callbacks():
+    seen = []
+
+    async def on_field(name, value):
+        seen.append(name)
+
+    llm = ScriptedLLM('{"category": "ham"}', chunk_size=2)
+    result = asyncio.run(agenerate_structured(
+        [HumanMessage(content="x")], classification_model(CATEGORIES), llm=llm, on_field=on_field
+    ))
+    assert result.value.category == "ham" and seen == ["category"]
+
+
+def test_shortcuts():
+    llm = ScriptedLLM('{"name": "Ada", "city": null}')
+    assert extract("Ada wrote programs.", ["name", "city"], llm=llm) == {"name": "Ada", "city": None}
+
+    failing = ScriptedLLM("[]", "[]")
+    assert extract("text", ["name"], llm=failing, strict=False) == {"name": None}
+    assert classify("text", CATEGORIES, llm=ScriptedLLM("{}", "{}"), strict=False) is None